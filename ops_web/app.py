@@ -65,6 +65,8 @@ import uuid
 import contextlib
 import time
 import logging
+from collections import deque
+from itertools import islice
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
@@ -78,100 +80,29 @@ from fastapi.responses import (
     JSONResponse,
     FileResponse,
     RedirectResponse,
+    Response,
 )
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 
+from ops_web.bus import BroadcastBus, EventFilter, Subscription
+from ops_web.event_store import EventStore
+from ops_web.history import EventHistory
+from ops_web.ipc_server import IpcServer
+from ops_web.log_index import LogDirIndex
+from ops_web.obs_rotation import ObsRotator
+from ops_web.state_store import StateStore
+from ops_web.tail_follow import TailFollower, find_last, iter_lines_reverse, tail_lines
+from ops_web.ws_protocol import negotiate
+
+# in-process guardrail push: available when the trading runtime (src/next_trade)
+# is importable, i.e. runs in this process
+try:
+    from next_trade.runtime.guardrail import add_guardrail_listener, remove_guardrail_listener
+except Exception:  # pragma: no cover
+    add_guardrail_listener = remove_guardrail_listener = None
 
-# --- Broadcast bus (safe subscribe/unsubscribe/shutdown) ---
-
-
-class BroadcastBus:
-    def __init__(self, queue_maxsize: int = 200):
-        self._subs: Set[asyncio.Queue] = set()
-        self._lock = asyncio.Lock()
-        self._closed = False
-        self._queue_maxsize = queue_maxsize
-        # backpressure metrics
-        self._drop_count = 0
-        self._last_drop_ts = 0.0
-
-    async def subscribe(self) -> asyncio.Queue:
-        q: asyncio.Queue = asyncio.Queue(maxsize=self._queue_maxsize)
-        async with self._lock:
-            if self._closed:
-                # already closed: push sentinel and return
-                try:
-                    q.put_nowait(None)
-                except Exception:
-                    pass
-                return q
-            self._subs.add(q)
-        return q
-
-    async def unsubscribe(self, q: asyncio.Queue) -> None:
-        async with self._lock:
-            if q in self._subs:
-                self._subs.remove(q)
-        try:
-            q.put_nowait(None)
-        except Exception:
-            pass
-
-    async def publish(self, event: Dict[str, Any]) -> None:
-        async with self._lock:
-            if self._closed:
-                return
-            subs = list(self._subs)
-
-        for q in subs:
-            try:
-                q.put_nowait(event)
-            except asyncio.QueueFull:
-                # backpressure: count and sample-log (do not spam)
-                try:
-                    self._drop_count += 1
-                    now = time.time()
-                    if now - self._last_drop_ts > 5:
-                        self._last_drop_ts = now
-                        # use logger; fall back to print
-                        try:
-                            logging.getLogger("ops_web").warning(
-                                f"Backpressure drop occurred. total_drop={self._drop_count}"
-                            )
-                        except Exception:
-                            print(f"[WARN] Backpressure drop occurred. total_drop={self._drop_count}")
-                        # append a sampled backpressure event to metrics file for observability
-                        try:
-                            mf = Path(__file__).resolve().parent.parent / "metrics" / "live_obs.jsonl"
-                            mf.parent.mkdir(parents=True, exist_ok=True)
-                            with mf.open("a", encoding="utf-8") as mfh:
-                                bp = {
-                                    "ts": datetime.utcnow().isoformat() + "Z",
-                                    "type": "backpressure-drop",
-                                    "drop_count": self._drop_count,
-                                }
-                                mfh.write(json.dumps(bp, ensure_ascii=False) + "\n")
-                        except Exception:
-                            pass
-                except Exception:
-                    pass
-                continue
-            except Exception:
-                continue
-
-    async def shutdown(self) -> None:
-        async with self._lock:
-            self._closed = True
-            subs = list(self._subs)
-            self._subs.clear()
-
-        for q in subs:
-            try:
-                q.put_nowait(None)
-            except Exception:
-                pass
 
 def _new_trace_id() -> str:
     return uuid.uuid4().hex
@@ -184,23 +115,91 @@ try:
     _qmax = int(os.environ.get("OPS_BUS_QMAX", "200"))
 except Exception:
     _qmax = 200
-bus = BroadcastBus(queue_maxsize=_qmax)
+
+
+def _on_bus_drop(total_drop: int) -> None:
+    """Sampled backpressure hook: log and record a metrics line."""
+    try:
+        logging.getLogger("ops_web").warning(f"Backpressure drop occurred. total_drop={total_drop}")
+    except Exception:
+        print(f"[WARN] Backpressure drop occurred. total_drop={total_drop}")
+    # append a sampled backpressure event to metrics file for observability
+    try:
+        _append_metrics_line({
+            "ts": datetime.utcnow().isoformat() + "Z",
+            "type": "backpressure-drop",
+            "drop_count": total_drop,
+        })
+    except Exception:
+        pass
+
+
+bus = BroadcastBus(queue_maxsize=_qmax, on_drop=_on_bus_drop)
 
 # For testing: keep references to intentionally-hung subscribers (do not consume)
-HUNG_SUBS: list[asyncio.Queue] = []
+HUNG_SUBS: list[Subscription] = []
 
 _file_publisher_task: Optional[asyncio.Task] = None
 _ops_hb_task: Optional[asyncio.Task] = None
+_history_task: Optional[asyncio.Task] = None
+_event_store_task: Optional[asyncio.Task] = None
+_obs_rotation_task: Optional[asyncio.Task] = None
+_guardrail_listener = None
+_ipc_server: Optional[IpcServer] = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global _file_publisher_task, _ops_hb_task
+    global _file_publisher_task, _ops_hb_task, _history_task, _event_store_task, _obs_rotation_task
+    global _guardrail_listener, _ipc_server
+    # startup: live_obs.jsonl segment manifest (rotation/compaction/retention)
+    try:
+        await asyncio.to_thread(obs_rotator.load)
+        if OPS_OBS_ROTATE:
+            _obs_rotation_task = asyncio.create_task(obs_rotator.run(), name="ops_obs_rotation")
+    except Exception:
+        _obs_rotation_task = None
+
+    # startup: seed guardrail state from the metrics file once
+    guardrail_cache.prime(METRICS_FILE)
+
+    # startup: index spilled history and continue its sequence numbering
+    try:
+        bus.set_base(await asyncio.to_thread(history.load))
+        if history.enabled:
+            _history_task = asyncio.create_task(history.run(), name="ops_history_spill")
+    except Exception:
+        _history_task = None
+
+    # startup: indexed event store (bus tap + kill_audit / run events backfill)
+    try:
+        if event_store.enabled:
+            _event_store_task = asyncio.create_task(event_store.run(), name="ops_event_store")
+    except Exception:
+        _event_store_task = None
+
     # startup: start optional metrics file tailer task
     try:
         _file_publisher_task = asyncio.create_task(_metrics_file_publisher())
     except Exception:
         _file_publisher_task = None
 
+    # startup: kill-switch transitions pushed by the in-process Guardrail
+    if add_guardrail_listener is not None:
+        try:
+            _guardrail_listener = _make_guardrail_listener(asyncio.get_running_loop())
+            add_guardrail_listener(_guardrail_listener)
+        except Exception:
+            _guardrail_listener = None
+
+    # startup: local IPC ingest from the trading runtime (OPS_IPC=0 disables)
+    if os.getenv("OPS_IPC", "1") == "1":
+        try:
+            _ipc_server = IpcServer(_ingest_runtime_event)
+            await _ipc_server.start()
+        except Exception as exc:
+            logging.getLogger("ops_web").warning("ipc: not listening (%s)", exc)
+            _ipc_server = None
+
     # DEV/LOCAL Heartbeat Publisher (OPS_EMIT_HEARTBEAT=1)
     emit = os.getenv("OPS_EMIT_HEARTBEAT", "0") == "1"
     interval = float(os.getenv("OPS_HEARTBEAT_SEC", "1.0"))
@@ -227,11 +226,44 @@ async def lifespan(app: FastAPI):
                     await _ops_hb_task
         except Exception:
             pass
+        try:
+            if _obs_rotation_task:
+                _obs_rotation_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await _obs_rotation_task
+        except Exception:
+            pass
+        log_index.close()
+        try:
+            if _ipc_server is not None:
+                await _ipc_server.close()
+                _ipc_server = None
+        except Exception:
+            pass
+        if _guardrail_listener is not None and remove_guardrail_listener is not None:
+            remove_guardrail_listener(_guardrail_listener)
+            _guardrail_listener = None
         # shutdown bus to wake subscribers
         try:
             await bus.shutdown()
         except Exception:
             pass
+        try:
+            if _history_task:
+                _history_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await _history_task
+            history.close()
+        except Exception:
+            pass
+        try:
+            if _event_store_task:
+                _event_store_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await _event_store_task
+            event_store.close()
+        except Exception:
+            pass
 
 
 app = FastAPI(lifespan=lifespan, title="NEXT-TRADE Ops Web")
@@ -267,26 +299,48 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 METRICS_FILE = BASE_DIR / "metrics" / "live_obs.jsonl"
 LOG_DIR = BASE_DIR / "logs"
 
+# live_obs.jsonl rotation by size/age + compressed segments (OPS_OBS_ROTATE=0 disables)
+OPS_OBS_ROTATE = os.getenv("OPS_OBS_ROTATE", "1") == "1"
+obs_rotator = ObsRotator(METRICS_FILE)
+
+# replayable event history: bus ring + on-disk spill (OPS_HISTORY_SPILL=0 disables)
+HISTORY_DIR = Path(os.getenv("OPS_HISTORY_DIR") or (BASE_DIR / "metrics" / "history"))
+history = EventHistory(bus, HISTORY_DIR if os.getenv("OPS_HISTORY_SPILL", "1") == "1" else None)
+bus.history = history
+bus.add_tap(history.record)
+
+# indexed event store for history/risks/alerts (OPS_EVENT_STORE=0 disables)
+EVENT_STORE_PATH = Path(os.getenv("OPS_EVENT_STORE_PATH") or (BASE_DIR / "metrics" / "ops_events.sqlite3"))
+event_store = EventStore(
+    EVENT_STORE_PATH if os.getenv("OPS_EVENT_STORE", "1") == "1" else None,
+    backfill_files=[METRICS_FILE.parent / "kill_audit.jsonl"],
+    backfill_globs=[(BASE_DIR / "runs", "*/events.jsonl")],
+)
+bus.add_tap(event_store.record)
+
+# latest engine / positions state for the polled state endpoints (bus tap)
+state_store = StateStore()
+bus.add_tap(state_store.record)
+
 TEMPLATES = Jinja2Templates(directory=str(Path(__file__).resolve().parent / "templates"))
 
 
+log_index = LogDirIndex(LOG_DIR)
+
+
 def _latest_log_file() -> Optional[Path]:
-    """Find latest log file (including rotated backups like live_obs_*.log.1, .log.2, etc.)"""
-    if not LOG_DIR.exists():
-        return None
-    candidates = sorted(
-        list(LOG_DIR.glob("live_obs_*")) + list(LOG_DIR.glob("live_obs_*.log*")),
-        key=lambda p: p.stat().st_mtime,
-        reverse=True,
-    )
-    return candidates[0] if candidates else None
+    """Find latest log file (including rotated backups like live_obs_*.log.1, .log.2, etc.)
+
+    Served from the cached log-directory index (no per-request glob/stat).
+    """
+    return log_index.latest()
 
 
 def _tail_lines(path: Path, n: int = 50) -> str:
+    """Last n lines via a reverse block read (cost ~ tail size, not file size)."""
     try:
-        with path.open("r", encoding="utf-8", errors="ignore") as f:
-            lines = f.readlines()
-        return "".join(lines[-n:])
+        lines = tail_lines(path, n)
+        return "".join(ln + "\n" for ln in lines)
     except Exception as exc:
         return f"[log-tail error] {exc}\n"
 
@@ -300,36 +354,31 @@ async def _publish(event: dict) -> None:
 
 
 async def _metrics_file_publisher() -> None:
-    """Optional: simple background task to tail file and publish new lines.
+    """Background task: tail-follow live_obs.jsonl and publish every new line.
 
-    Not started automatically; kept for compatibility.
+    Reads only appended bytes (TailFollower keeps the offset, handles
+    rotation/truncation and wakes on inotify where available), so
+    write-to-dashboard latency is milliseconds and cost does not grow with
+    file size. One guardrail_update follows each batch of lines.
     """
-    last_line = ""
+    follower = TailFollower(METRICS_FILE)
     try:
-        while True:
+        async for lines in follower.follow():
+            for current in lines:
+                try:
+                    payload = json.loads(current)
+                except Exception:
+                    payload = {"raw": current}
+                guardrail_cache.ingest(payload)
+                if current in _SELF_PUBLISHED_LINES:
+                    _SELF_PUBLISHED_LINES.remove(current)
+                    continue
+                await bus.publish(payload)
+            # Also emit guardrail_update each time metrics are published
             try:
-                if METRICS_FILE.exists():
-                    with METRICS_FILE.open("r", encoding="utf-8", errors="ignore") as f:
-                        lines = f.readlines()
-                    if lines:
-                        current = lines[-1].strip()
-                        if current and current != last_line:
-                            last_line = current
-                            try:
-                                payload = json.loads(current)
-                            except Exception:
-                                payload = {"raw": current}
-                            await bus.publish(payload)
-                            # Also emit guardrail_update each time metrics are published
-                            try:
-                                guard = _build_guardrail_update()
-                                await bus.publish(guard)
-                            except Exception:
-                                pass
+                await bus.publish(_build_guardrail_update())
             except Exception:
-                # ignore and continue
                 pass
-            await asyncio.sleep(2)
     except asyncio.CancelledError:
         return
 
@@ -342,10 +391,31 @@ async def index(request: Request) -> HTMLResponse:
     return TEMPLATES.TemplateResponse("index.html", {"request": request})
 
 
+def _parse_seq(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, "") else None
+    except Exception:
+        return None
+
+
 @app.get("/events")
-async def events() -> StreamingResponse:
-    """SSE endpoint using BroadcastBus.subscribe/unsubscribe."""
-    q: asyncio.Queue = await bus.subscribe()
+async def events(request: Request, policy: Optional[str] = None, conflate: int = 1) -> StreamingResponse:
+    """SSE endpoint using BroadcastBus.subscribe/unsubscribe.
+
+    `policy` picks the slow-consumer policy (drop_oldest, drop_newest,
+    coalesce_by_type, disconnect); losses arrive as `gap` events.
+    `conflate=0` opts out of latest-value conflation of state events.
+    `type` / `source` / `severity` / `trace_id` (comma-separated or
+    repeated) filter the stream server-side.
+    Each frame carries `id: <seq>`; a reconnect with `Last-Event-ID` (or
+    `?since=<seq>`) resumes right after that event.
+    """
+    q: Subscription = await bus.subscribe(
+        policy=policy,
+        conflate=conflate != 0,
+        event_filter=EventFilter.from_mapping(request.query_params),
+        since=_parse_seq(request.headers.get("last-event-id") or request.query_params.get("since")),
+    )
 
 
     log = logging.getLogger("ops_web")
@@ -361,7 +431,7 @@ async def events() -> StreamingResponse:
                     continue
                 if item is None:
                     break
-                yield f"data: {json.dumps(item, ensure_ascii=False)}\n\n"
+                yield item.sse_frame
         finally:
             try:
                 await bus.unsubscribe(q)
@@ -373,37 +443,74 @@ async def events() -> StreamingResponse:
 
 @app.websocket("/api/ws/events")
 async def ws_events(ws: WebSocket):
-    await ws.accept()
-    q: asyncio.Queue = await bus.subscribe()
+    """Event stream over WebSocket.
+
+    Protocol (encoding / micro-batching) is negotiated per connection, see
+    ops_web/ws_protocol.py; JSON text, one event per frame, is the default.
+    Filters come from query params (type/source/severity/trace_id) and can
+    be replaced at any time with a client message:
+        {"action": "subscribe", "filter": {"type": ["risk"], "severity": "warn"}}
+    Events carry `seq`; reconnect with `?since=<last seq>` to resume.
+    """
+    proto = negotiate(ws.scope.get("subprotocols") or [], ws.query_params)
+    await ws.accept(subprotocol=proto.subprotocol)
+    q: Subscription = await bus.subscribe(
+        policy=ws.query_params.get("policy"),
+        conflate=ws.query_params.get("conflate", "1") != "0",
+        event_filter=EventFilter.from_mapping(ws.query_params),
+        since=_parse_seq(ws.query_params.get("since")),
+    )
 
     log = logging.getLogger("ops_web")
     trace_id = _new_trace_id()
 
+    async def _client_messages():
+        # subscribe/filter updates; a client disconnect ends the stream
+        try:
+            while True:
+                msg = await ws.receive_text()
+                try:
+                    obj = json.loads(msg)
+                except Exception:
+                    continue
+                if isinstance(obj, dict) and (obj.get("action") or obj.get("type")) == "subscribe":
+                    q.filter = EventFilter.from_mapping(obj.get("filter") or {})
+        except Exception:
+            pass
+        finally:
+            with suppress(Exception):
+                await bus.unsubscribe(q)
+
+    reader = asyncio.create_task(_client_messages())
+
     try:
         while True:
             item = await q.get()
             if item is None:
                 break
 
+            items = [item]
+            if proto.batched:
+                # micro-batch: collect what arrives within the flush window
+                await asyncio.sleep(proto.batch_ms / 1000.0)
+                while len(items) < proto.batch_max:
+                    nxt = q.get_nowait()
+                    if nxt is None:
+                        break
+                    items.append(nxt)
+
             try:
-                # 1) item 송신 (trace_id/ts audit-native)
-                if isinstance(item, dict):
-                    item.setdefault("trace_id", trace_id)
-                    item.setdefault("ts", datetime.utcnow().isoformat() + "Z")
-                await ws.send_text(json.dumps(item, ensure_ascii=False))
-
-                # 2) guardrail_update 송신 (trace_id/ts audit-native)
-                guard = _build_guardrail_update()
-                if isinstance(guard, dict):
-                    guard.setdefault("trace_id", trace_id)
-                    guard.setdefault("ts", datetime.utcnow().isoformat() + "Z")
-
-                log.info("guardrail_update built trace_id=%s", trace_id)
-                await ws.send_text(json.dumps(guard, ensure_ascii=False))
-                log.info("guardrail_update sent trace_id=%s", trace_id)
+                # shared pre-encoded frames; trace_id/ts/seq stamped at publish.
+                # guardrail_update arrives as a bus event (conflated per key).
+                frames = [proto.encode(items)] if proto.batched else [proto.encode([e]) for e in items]
+                for frame in frames:
+                    if isinstance(frame, bytes):
+                        await ws.send_bytes(frame)
+                    else:
+                        await ws.send_text(frame)
 
             except Exception:
-                log.exception("guardrail_update send error trace_id=%s", trace_id)
+                log.exception("ws send error trace_id=%s", trace_id)
                 break
 
     except WebSocketDisconnect:
@@ -411,6 +518,7 @@ async def ws_events(ws: WebSocket):
     except asyncio.CancelledError:
         return
     finally:
+        reader.cancel()
         with suppress(Exception):
             await bus.unsubscribe(q)
         with suppress(Exception):
@@ -435,12 +543,7 @@ async def test_event(request: Request) -> JSONResponse:
     body.setdefault("type", "test-event")
 
     # Append to metrics file for compatibility (best-effort)
-    try:
-        METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with METRICS_FILE.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(body, ensure_ascii=False) + "\n")
-    except Exception:
-        pass
+    _append_metrics_line(body, published=True)
 
     # Publish to in-memory subscribers
     try:
@@ -463,6 +566,14 @@ async def ops_metrics() -> JSONResponse:
             subs = 0
         
         base = {"drop_count": drop, "subscribers": subs}
+        try:
+            base["bus"] = bus.stats()
+            base["obs_rotation"] = obs_rotator.stats()
+            if _ipc_server is not None:
+                base["ipc"] = _ipc_server.stats()
+            base["state"] = state_store.stats()
+        except Exception:
+            pass
         
         # Extend with live_obs data (if available)
         obs = _read_last_obs(METRICS_FILE)
@@ -490,29 +601,6 @@ async def ops_metrics() -> JSONResponse:
         return JSONResponse({"error": "metrics unavailable"}, status_code=500)
 
 
-def _read_last_obs(metrics_file: Path, max_tail_lines: int = 200) -> Optional[dict]:
-    """Read the last valid JSON object with metrics fields from live_obs.jsonl"""
-    if not metrics_file or not metrics_file.exists():
-        return None
-    try:
-        text = metrics_file.read_text(encoding="utf-8", errors="ignore")
-        lines = text.splitlines()
-        tail = lines[-max_tail_lines:] if len(lines) > max_tail_lines else lines
-        for ln in reversed(tail):
-            ln = ln.strip()
-            if not ln:
-                continue
-            try:
-                obj = json.loads(ln)
-                if isinstance(obj, dict) and "ws_messages_total" in obj:
-                    # This is an MVP producer line (has ws_messages_total field)
-                    return obj
-            except Exception:
-                continue
-    except Exception:
-        pass
-    return None
-
 # === MVP Metrics Producer (ops_web embedded) ==========================
 OPS_MVP_PRODUCER = os.getenv("OPS_MVP_PRODUCER", "0") == "1"
 OPS_MVP_INTERVAL_SEC = float(os.getenv("OPS_MVP_INTERVAL_SEC", "1.0"))
@@ -527,24 +615,21 @@ def _read_last_obs(metrics_file, max_tail_lines: int = 200):
     Priority:
     1) Lines containing 'ws_messages_total' (MVP producer / real runtime metrics)
     2) Fallback: any dict containing 'ts'
+
+    Walks the file backwards (at most max_tail_lines) and stops at the first
+    preferred line, so cost does not grow with file size.
     """
 
     if not metrics_file or not metrics_file.exists():
         return None
 
     try:
-        text = metrics_file.read_text(encoding="utf-8", errors="ignore")
-        lines = text.splitlines()
-        if not lines:
-            return None
-
-        tail = lines[-max_tail_lines:] if len(lines) > max_tail_lines else lines
-
         fallback = None
 
-        for ln in reversed(tail):
+        for ln in islice(iter_lines_reverse(metrics_file), max_tail_lines):
             ln = ln.strip()
-            if not ln:
+            # cheap substring test before parsing
+            if not ln or ("ws_messages_total" not in ln and fallback is not None):
                 continue
 
             try:
@@ -578,7 +663,7 @@ def _rollover_if_dirty_live_obs(path: Path):
     if not path.exists():
         return
     try:
-        tail = path.read_text(encoding="utf-8", errors="ignore").splitlines()[-5:]
+        tail = tail_lines(path, 5)
         ok = 0
         for ln in tail:
             try:
@@ -592,6 +677,9 @@ def _rollover_if_dirty_live_obs(path: Path):
     except Exception:
         pass
 
+    if path == obs_rotator.path:
+        obs_rotator.rotate("dirty")
+        return
     ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     bak = path.with_name(f"live_obs_{ts}.jsonl")
     try:
@@ -652,9 +740,7 @@ async def _mvp_metrics_producer_loop():
                 "ledger_worst_dd": 0.0,
             }
 
-            METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with METRICS_FILE.open("a", encoding="utf-8") as f:
-                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            _append_metrics_line(row)
 
         except Exception:
             logger.exception("[OPS_MVP_PRODUCER] loop error")
@@ -678,64 +764,128 @@ def _normalize_ts_ms(ts_val) -> Optional[int]:
         return None
 
 
-def _get_risk_snapshot_payload() -> dict:
-    """
-    Single source of truth for guardrail snapshot payload.
-    Must match /api/ops/risk-snapshot schema.
-    Used by both HTTP endpoint and WS guardrail_update events.
-    """
-    defaults = {
-        "ts": int(time.time() * 1000),
-        "risk_level": "OK",
-        "kill_switch": False,
-        "downgrade_level": 0,
-        "reason": "",
-        "trace_id": "no-trace",
-        "recovery_count": 0,
-    }
+_GUARDRAIL_DEFAULT_KEYS = ("ts", "risk_level", "kill_switch", "downgrade_level", "reason", "trace_id", "recovery_count")
 
-    payload = defaults.copy()
 
-    # Best-effort: try to read last metrics line for overrides (if any)
-    try:
-        if METRICS_FILE.exists():
-            with METRICS_FILE.open("r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
+class GuardrailStateCache:
+    """In-process guardrail state: the latest metrics line's overrides.
+
+    Same semantics as re-reading the last line of live_obs.jsonl, but every
+    writer (kill switch, test events, file publisher) feeds lines in as they
+    are written, so snapshot reads never touch disk.
+    """
+
+    def __init__(self) -> None:
+        self._overrides: Dict[str, Any] = {}
+        self._primed = False
+        self.version = 0
+
+    def ingest(self, obj: Any) -> None:
+        """Record a newly written/ingested metrics line (non-dicts reset overrides)."""
+        if isinstance(obj, dict):
+            self._overrides = {k: obj[k] for k in _GUARDRAIL_DEFAULT_KEYS if k in obj and obj[k] is not None}
+        else:
+            self._overrides = {}
+        self._primed = True
+        self.version += 1
+
+    def prime(self, path: Path) -> None:
+        """Seed from the file's last line once (startup / first read).
+
+        Right after a rotation the live file is empty, so the last line of
+        the newest archived segment carries the state over.
+        """
+        self._primed = True
+        try:
+            lines = []
+            if path.exists():
+                last = find_last(path, lambda ln: bool(ln.strip()))
+                lines = [last] if last else []
+            if not lines and path == obs_rotator.path:
+                last = obs_rotator.last_archived_line()
+                lines = [last] if last else []
             if lines:
                 try:
-                    last = json.loads(lines[-1])
-                    # allow last to override any keys if present and not None
-                    for k in list(defaults.keys()):
-                        if k in last and last[k] is not None:
-                            payload[k] = last[k]
+                    self.ingest(json.loads(lines[-1]))
                 except Exception:
                     # ignore malformed lines
                     pass
-    except Exception:
-        # ignore any IO errors and fall back to defaults
-        pass
+        except Exception:
+            # ignore any IO errors and fall back to defaults
+            pass
 
-    # Ensure types and no None values
-    try:
-        payload["ts"] = int(payload.get("ts") or defaults["ts"])
-    except Exception:
-        payload["ts"] = defaults["ts"]
+    def snapshot(self) -> dict:
+        if not self._primed:
+            self.prime(METRICS_FILE)
 
-    payload["risk_level"] = str(payload.get("risk_level") or defaults["risk_level"])
-    payload["kill_switch"] = bool(payload.get("kill_switch") is True)
-    try:
-        payload["downgrade_level"] = int(payload.get("downgrade_level") or 0)
-    except Exception:
-        payload["downgrade_level"] = 0
-    payload["reason"] = str(payload.get("reason") or "")
-    # Enforce non-empty trace_id per protocol: use "no-trace" when missing/empty
-    payload["trace_id"] = str(payload.get("trace_id") or "no-trace")
+        defaults = {
+            "ts": int(time.time() * 1000),
+            "risk_level": "OK",
+            "kill_switch": False,
+            "downgrade_level": 0,
+            "reason": "",
+            "trace_id": "no-trace",
+            "recovery_count": 0,
+        }
+        payload = defaults.copy()
+        payload.update(self._overrides)
+
+        # Ensure types and no None values
+        try:
+            payload["ts"] = int(payload.get("ts") or defaults["ts"])
+        except Exception:
+            payload["ts"] = defaults["ts"]
+
+        payload["risk_level"] = str(payload.get("risk_level") or defaults["risk_level"])
+        payload["kill_switch"] = bool(payload.get("kill_switch") is True)
+        try:
+            payload["downgrade_level"] = int(payload.get("downgrade_level") or 0)
+        except Exception:
+            payload["downgrade_level"] = 0
+        payload["reason"] = str(payload.get("reason") or "")
+        # Enforce non-empty trace_id per protocol: use "no-trace" when missing/empty
+        payload["trace_id"] = str(payload.get("trace_id") or "no-trace")
+        try:
+            payload["recovery_count"] = int(payload.get("recovery_count") or 0)
+        except Exception:
+            payload["recovery_count"] = 0
+
+        return payload
+
+
+guardrail_cache = GuardrailStateCache()
+
+
+# lines this process wrote and already published itself; the tailer skips them
+_SELF_PUBLISHED_LINES: "deque[str]" = deque(maxlen=1024)
+
+
+def _append_metrics_line(obj: dict, *, published: bool = False) -> None:
+    """Append one JSON line to live_obs.jsonl and feed it to the guardrail cache.
+
+    published=True: the caller already put `obj` on the bus, so the file
+    tailer must not publish the same line a second time.
+    """
+    line = json.dumps(obj, ensure_ascii=False)
     try:
-        payload["recovery_count"] = int(payload.get("recovery_count") or 0)
+        METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with METRICS_FILE.open("a", encoding="utf-8") as f:
+            f.write(line + "\n")
+        if published:
+            _SELF_PUBLISHED_LINES.append(line)
     except Exception:
-        payload["recovery_count"] = 0
+        pass
+    guardrail_cache.ingest(obj)
+
 
-    return payload
+def _get_risk_snapshot_payload() -> dict:
+    """
+    Single source of truth for guardrail snapshot payload.
+    Must match /api/ops/risk-snapshot schema.
+    Used by both HTTP endpoint and WS guardrail_update events.
+    Served from the in-process GuardrailStateCache (O(1), no file reads).
+    """
+    return guardrail_cache.snapshot()
 
 
 @app.get("/api/ops/health")
@@ -744,27 +894,107 @@ async def ops_health() -> JSONResponse:
     return JSONResponse({"status": "ok", "ts": int(time.time() * 1000)})
 
 
+def _state_response(request: Request, view: str) -> Response:
+    """Pre-rendered state view with ETag; If-None-Match hits get a bodiless 304."""
+    body, etag = state_store.render(view)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    inm = request.headers.get("if-none-match")
+    if inm:
+        tags = [t.strip().removeprefix("W/") for t in inm.split(",")]
+        if "*" in tags or etag in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/api/ops/evergreen/status")
-async def ops_evergreen_status() -> JSONResponse:
-    """Evergreen status endpoint - returns mock data when runner not active."""
-    return JSONResponse({
-        "status": "OK",
-        "uptime_sec": 0,
-        "last_heartbeat_ts": int(time.time() * 1000),
-        "mode": "DEV",
-    })
+async def ops_evergreen_status(request: Request) -> Response:
+    """Evergreen status from the state store (DEV defaults when no runner has reported)."""
+    return _state_response(request, "evergreen")
 
 
 @app.get("/api/ops/history")
-async def ops_history(hours: int = 24) -> JSONResponse:
-    """Historical events endpoint - returns empty array when no data."""
-    return JSONResponse({"events": [], "hours": hours})
+async def ops_history(
+    request: Request,
+    hours: int = 24,
+    limit: int = 1000,
+    since: Optional[int] = None,
+) -> JSONResponse:
+    """Historical events, oldest first.
+
+    Served from the indexed event store; `since` (seq) and trace_id
+    queries, or a disabled store, use the replay history (ring + spill).
+    Optional type/source/severity/trace_id filters.
+    """
+    now_ms = int(time.time() * 1000)
+    start_ms = now_ms - int(max(0.0, hours) * 3600 * 1000)
+    limit = max(1, min(limit, 10000))
+    flt = EventFilter.from_mapping(request.query_params)
+    try:
+        if event_store.enabled and since is None and not (flt and flt.trace_ids):
+            evs = await asyncio.to_thread(
+                event_store.history,
+                start_ms=start_ms,
+                end_ms=now_ms,
+                limit=limit,
+                types=sorted(flt.types) if flt else (),
+                sources=sorted(flt.sources) if flt else (),
+                severities=sorted(flt.severities) if flt else (),
+            )
+        else:
+            evs = await asyncio.to_thread(
+                history.query,
+                start_ms=start_ms,
+                end_ms=now_ms,
+                limit=limit,
+                event_filter=flt,
+                since_seq=since,
+            )
+    except Exception:
+        evs = []
+    return JSONResponse({"events": evs, "hours": hours, "head_seq": bus.head - 1})
 
 
 @app.get("/api/ops/alerts")
 async def ops_alerts(limit: int = 50) -> JSONResponse:
-    """Alerts endpoint - returns empty array when no active alerts."""
-    return JSONResponse({"alerts": [], "limit": limit})
+    """Alerts endpoint - newest warn/error/critical and risk events (event store)."""
+    try:
+        alerts = await asyncio.to_thread(event_store.alerts, max(1, min(limit, 1000)))
+    except Exception:
+        alerts = []
+    return JSONResponse({"alerts": alerts, "limit": limit})
+
+
+@app.get("/api/ops/obs/segments")
+async def ops_obs_segments() -> JSONResponse:
+    """live_obs.jsonl segment manifest (closed, compressed segments + live file)."""
+    return JSONResponse({**obs_rotator.manifest(), "stats": obs_rotator.stats()})
+
+
+def _obs_lines_in_range(start_ms: int, end_ms: int, limit: int) -> list:
+    out = []
+    for line in obs_rotator.lines_in_range(start_ms, end_ms, limit):
+        try:
+            out.append(json.loads(line))
+        except Exception:
+            continue
+    return out
+
+
+@app.get("/api/ops/obs/history")
+async def ops_obs_history(hours: float = 1.0, limit: int = 1000) -> JSONResponse:
+    """Raw live_obs lines in the last `hours`, oldest first (newest `limit`).
+
+    The live file is read backwards from its end and only the archived
+    segments the manifest places in the window are opened.
+    """
+    now_ms = int(time.time() * 1000)
+    start_ms = now_ms - int(max(0.0, hours) * 3600 * 1000)
+    limit = max(1, min(limit, 10000))
+    try:
+        lines = await asyncio.to_thread(_obs_lines_in_range, start_ms, now_ms, limit)
+    except Exception:
+        lines = []
+    return JSONResponse({"lines": lines, "hours": hours})
 
 
 @app.get("/api/ops/logs/stdout")
@@ -780,26 +1010,25 @@ async def ops_logs_stderr(limit: int = 200) -> JSONResponse:
 
 
 @app.get("/api/state/engine")
-async def state_engine() -> JSONResponse:
-    """Engine state endpoint - returns default state when runner not active."""
-    return JSONResponse({
-        "running": False,
-        "uptime_sec": 0,
-        "processed_events": 0,
-        "last_heartbeat_ts": None,
-    })
+async def state_engine(request: Request) -> Response:
+    """Engine state endpoint - latest engine_state / counters / kill flags (defaults when runner not active)."""
+    return _state_response(request, "engine")
 
 
 @app.get("/api/state/positions")
-async def state_positions() -> JSONResponse:
-    """Positions state endpoint - returns empty when no active positions."""
-    return JSONResponse({"positions": []})
+async def state_positions(request: Request) -> Response:
+    """Positions state endpoint - latest position per symbol (snapshots + fills)."""
+    return _state_response(request, "positions")
 
 
 @app.get("/api/history/risks")
 async def history_risks(limit: int = 20) -> JSONResponse:
-    """Risk history endpoint - returns empty when no risk events."""
-    return JSONResponse({"risks": [], "limit": limit})
+    """Risk history endpoint - newest risk events first (event store)."""
+    try:
+        risks = await asyncio.to_thread(event_store.risks, max(1, min(limit, 1000)))
+    except Exception:
+        risks = []
+    return JSONResponse({"risks": risks, "limit": limit})
 
 
 @app.get("/api/ops/risk-snapshot")
@@ -835,13 +1064,8 @@ async def ops_kill(payload: dict, x_ops_token: str = Header(default="")):
     snap["ts"] = int(time.time() * 1000)
     snap["trace_id"] = str(uuid.uuid4())
 
-    # append snapshot to metrics file (best-effort)
-    try:
-        METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with METRICS_FILE.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(snap, ensure_ascii=False) + "\n")
-    except Exception:
-        pass
+    # append snapshot to metrics file (best-effort) + update guardrail cache
+    _append_metrics_line(snap)
 
     # audit log
     try:
@@ -901,6 +1125,44 @@ def _build_guardrail_update() -> dict:
     }
 
 
+def _ingest_guardrail_transition(event: dict) -> None:
+    """Loop thread: apply a pushed kill-switch transition and broadcast it.
+
+    Also appended to live_obs.jsonl (marked published, so the tailer skips
+    it) to keep the state durable across restarts.
+    """
+    try:
+        _append_metrics_line(event, published=True)
+        bus.publish_nowait(event)
+        bus.publish_nowait(_build_guardrail_update())
+    except Exception:
+        logging.getLogger("ops_web").exception("guardrail transition ingest failed")
+
+
+def _ingest_runtime_event(event: dict, peer: dict) -> None:
+    """IPC ingest (loop thread): runtime events go straight onto the bus."""
+    if event.get("type") == "kill_switch_transition":
+        if _guardrail_listener is not None and peer.get("pid") == os.getpid():
+            # same process: already delivered by the in-process listener
+            return
+        _ingest_guardrail_transition(event)
+        return
+    bus.publish_nowait(event)
+
+
+def _make_guardrail_listener(loop: asyncio.AbstractEventLoop):
+    """Guardrail listener: called on whichever thread flipped the kill switch."""
+
+    def _on_transition(event: dict) -> None:
+        try:
+            loop.call_soon_threadsafe(_ingest_guardrail_transition, dict(event))
+        except RuntimeError:
+            # loop already closed (shutdown)
+            pass
+
+    return _on_transition
+
+
 @app.get("/log-tail")
 async def log_tail(lines: int = 50) -> PlainTextResponse:
     log_path = _latest_log_file()
@@ -909,6 +1171,19 @@ async def log_tail(lines: int = 50) -> PlainTextResponse:
     return PlainTextResponse(_tail_lines(log_path, n=max(1, min(lines, 500))))
 
 
+@app.get("/log-tail/pages")
+async def log_tail_pages(cursor: Optional[str] = None, lines: int = 200) -> JSONResponse:
+    """Merged newest-first view across live_obs_* log segments.
+
+    Pass `next_cursor` back as `cursor` to page into older lines.
+    """
+    try:
+        page = log_index.read_page(cursor, max(1, min(lines, 2000)))
+    except Exception as exc:
+        return JSONResponse({"error": f"log-tail error: {exc}"}, status_code=500)
+    return JSONResponse(page)
+
+
 @app.get("/health")
 async def health() -> JSONResponse:
     return JSONResponse({"status": "ok"})
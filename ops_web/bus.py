@@ -0,0 +1,707 @@
+"""
+Broadcast bus for ops_web streams (SSE /events, WS /api/ws/events).
+
+- One shared, sequence-numbered ring of EventEnvelopes; publish is O(1)
+  whatever the number of subscribers (no per-subscriber queues or copies)
+- Each subscriber keeps its own cursor and a backlog limit (`max_lag`)
+- When a subscriber falls behind, its policy decides what it loses:
+    drop_oldest       skip ahead, keep the newest `max_lag` events
+    drop_newest       finish the backlog it had, then jump to the head
+    coalesce_by_type  keep only the latest event per type from the backlog
+    disconnect        close the slow consumer
+  Any loss is reported to the subscriber as an explicit `gap` event.
+
+Conflation: for keyed state types (OPS_BUS_CONFLATE, default
+`guardrail_update,position_snapshot:symbol,engine_state`) a subscriber
+only ever receives the latest value per key. An event superseded in the
+ring before the subscriber reaches it is skipped (with a filter, only when
+the newest value for the key passes that filter), and per key delivery
+is capped at OPS_BUS_CONFLATE_MAX_HZ (the newest value is held and sent
+when the interval allows). These skips are not data loss and do not
+produce gap events.
+
+Filtering: a subscription may carry an EventFilter (type / source /
+severity / trace_id); non-matching events are skipped by the cursor
+before anything is encoded for that client.
+
+Sequence ids / resume: every published event gets a monotonically
+increasing `seq` (also injected into the JSON payload and used as the SSE
+`id:`). subscribe(since=N) starts right after N: from the ring when it is
+still there, otherwise from a history source (see ops_web/history.py).
+Unknown ids (e.g. from a server without persisted history) produce a
+`resync` event so the client knows to reload over REST.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Callable, Deque, Dict, FrozenSet, List, Optional, Set
+
+try:  # optional: binary WS encoding
+    import msgpack  # type: ignore
+except Exception:  # pragma: no cover
+    msgpack = None
+
+POLICIES = ("drop_oldest", "drop_newest", "coalesce_by_type", "disconnect")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except Exception:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)))
+    except Exception:
+        return default
+
+
+DEFAULT_CONFLATE = "guardrail_update,position_snapshot:symbol,engine_state"
+
+
+def parse_conflate_spec(spec: str) -> Dict[str, Optional[str]]:
+    """'type[:key_field],...' -> {type: key_field or None}."""
+    out: Dict[str, Optional[str]] = {}
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        typ, _, field = part.partition(":")
+        out[typ.strip()] = field.strip() or None
+    return out
+
+
+class EventEnvelope:
+    """Immutable published event; wire encodings are built once and shared.
+
+    The bus wraps each event exactly once, so N subscribers cost one
+    json.dumps instead of N. `trace_id`/`ts` defaults are stamped here
+    rather than by each stream handler mutating the shared dict.
+    """
+
+    __slots__ = ("_data", "_text", "_sse", "_mp", "seq", "ckey", "recv_ms")
+
+    def __init__(self, event: Any) -> None:
+        if isinstance(event, dict):
+            data = dict(event)
+            data.setdefault("trace_id", uuid.uuid4().hex)
+            data.setdefault("ts", datetime.utcnow().isoformat() + "Z")
+        else:
+            data = event
+        self._data = data
+        self._text: Optional[str] = None
+        self._sse: Optional[bytes] = None
+        self._mp: Optional[bytes] = None
+        self.seq = -1  # assigned by the bus on publish
+        self.ckey: Any = None  # conflation key, assigned by the bus
+        self.recv_ms = 0  # bus publish time (epoch ms)
+
+    @classmethod
+    def restored(cls, data: Any, seq: int, recv_ms: int) -> "EventEnvelope":
+        """Rebuild a published envelope (e.g. from the history spill)."""
+        env = cls.__new__(cls)
+        env._data, env._text, env._sse, env._mp = data, None, None, None
+        env.seq, env.ckey, env.recv_ms = int(seq), None, int(recv_ms)
+        return env
+
+    def _assign_seq(self, seq: int, recv_ms: int) -> "EventEnvelope":
+        """Published copy stamped with seq/time; payload gets `seq` (one dict copy).
+
+        The caller's envelope is left untouched, so a cached envelope can be
+        published repeatedly and never carries a seq of its own that could be
+        mistaken for a resume position.
+        """
+        env = EventEnvelope.__new__(EventEnvelope)
+        env._data = {**self._data, "seq": seq} if isinstance(self._data, dict) else self._data
+        env._text = env._sse = env._mp = None
+        env.seq = seq
+        env.recv_ms = recv_ms
+        env.ckey = None
+        return env
+
+    @property
+    def event(self) -> Any:
+        """Read-only view of the payload."""
+        if isinstance(self._data, dict):
+            return MappingProxyType(self._data)
+        return self._data
+
+    @property
+    def event_type(self) -> Optional[str]:
+        if isinstance(self._data, dict):
+            return self._data.get("type") or self._data.get("event_type")
+        return None
+
+    @property
+    def text(self) -> str:
+        """JSON text (WebSocket text frame)."""
+        if self._text is None:
+            self._text = json.dumps(self._data, ensure_ascii=False)
+        return self._text
+
+    @property
+    def sse_frame(self) -> bytes:
+        """Complete SSE frame (`id:` = seq for Last-Event-ID resume)."""
+        if self._sse is None:
+            head = b"id: %d\n" % self.seq if self.seq >= 0 else b""
+            self._sse = head + b"data: " + self.text.encode("utf-8") + b"\n\n"
+        return self._sse
+
+    @property
+    def msgpack_bytes(self) -> bytes:
+        """MessagePack encoding (requires the optional msgpack package)."""
+        if self._mp is None:
+            if msgpack is None:
+                raise RuntimeError("msgpack is not installed")
+            self._mp = msgpack.packb(self._data, use_bin_type=True, default=str)
+        return self._mp
+
+
+def _as_set(value: Any) -> FrozenSet[str]:
+    if value is None:
+        return frozenset()
+    if isinstance(value, str):
+        value = [value]
+    out = set()
+    for v in value:
+        for part in str(v).split(","):
+            part = part.strip()
+            if part:
+                out.add(part)
+    return frozenset(out)
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    """Server-side subscription filter; an empty field matches everything."""
+
+    types: FrozenSet[str] = frozenset()
+    sources: FrozenSet[str] = frozenset()
+    severities: FrozenSet[str] = frozenset()
+    trace_ids: FrozenSet[str] = frozenset()
+
+    @property
+    def empty(self) -> bool:
+        return not (self.types or self.sources or self.severities or self.trace_ids)
+
+    @classmethod
+    def from_mapping(cls, m: Any) -> Optional["EventFilter"]:
+        """From query params (comma-separated or repeated) or a subscribe message dict.
+
+        Returns None when no filter field is present.
+        """
+        if not m:
+            return None
+
+        def _get(key: str) -> Any:
+            getlist = getattr(m, "getlist", None)
+            if getlist is not None:
+                return getlist(key) or None
+            return m.get(key)
+
+        f = cls(
+            types=_as_set(_get("type")),
+            sources=_as_set(_get("source")),
+            severities=frozenset(x.lower() for x in _as_set(_get("severity"))),
+            trace_ids=_as_set(_get("trace_id")),
+        )
+        return None if f.empty else f
+
+    def matches(self, env: "EventEnvelope") -> bool:
+        ev = env._data
+        if not isinstance(ev, dict):
+            return False
+        if self.types and env.event_type not in self.types:
+            return False
+        if self.sources and ev.get("source") not in self.sources:
+            return False
+        if self.severities and str(ev.get("severity") or ev.get("level") or "").lower() not in self.severities:
+            return False
+        if self.trace_ids and ev.get("trace_id") not in self.trace_ids:
+            return False
+        return True
+
+
+def _gap_envelope(from_seq: int, to_seq: int, dropped: int, policy: str, reason: str) -> EventEnvelope:
+    return EventEnvelope({
+        "type": "gap",
+        "source": "ops_web",
+        "severity": "warn",
+        "message": f"{dropped} event(s) dropped ({reason})",
+        "data": {
+            "from_seq": from_seq,
+            "to_seq": to_seq,
+            "dropped": dropped,
+            "policy": policy,
+            "reason": reason,
+        },
+    })
+
+
+class Subscription:
+    """A cursor into the bus ring. get() returns None once closed."""
+
+    def __init__(
+        self,
+        bus: "BroadcastBus",
+        policy: str,
+        max_lag: int,
+        conflate: bool = True,
+        event_filter: Optional[EventFilter] = None,
+    ) -> None:
+        self.bus = bus
+        self.filter = event_filter
+        self.policy = policy
+        self.max_lag = max(1, int(max_lag))
+        self.conflate = bool(conflate)
+        self.conflated = 0
+        self._last_sent: Dict[Any, float] = {}
+        self._held: Dict[Any, EventEnvelope] = {}
+        self.cursor = bus.head
+        self._replay_until = -1  # resume: lag policy off until caught up to here
+        self.dropped = 0
+        self.gaps = 0
+        self.closed = False
+        self._keep_until: Optional[int] = None
+        # wanted (filter-passing) events in [cursor, _lag_to), for the lag policy
+        self._lag_filter: Optional[EventFilter] = None
+        self._lag_to = -1
+        self._lag_n = 0
+        self._pending: Deque[EventEnvelope] = deque()
+
+    @property
+    def lag(self) -> int:
+        return self.bus.head - self.cursor
+
+    @property
+    def overflow(self) -> int:
+        """Backlog beyond max_lag (0 while replaying a resume)."""
+        if self.cursor < self._replay_until:
+            return 0
+        return max(0, self.lag - self.max_lag)
+
+    def _gap(
+        self, from_seq: int, to_seq: int, reason: str, count_drop: bool = True, dropped: Optional[int] = None,
+    ) -> None:
+        """Report a loss in [from_seq, to_seq); `dropped` when not every seq in it was lost."""
+        n = to_seq - from_seq if dropped is None else dropped
+        if n <= 0:
+            return
+        self.gaps += 1
+        if count_drop:
+            self.dropped += n
+            self.bus._note_drop(n)
+        self._pending.append(_gap_envelope(from_seq, to_seq, n, self.policy, reason))
+
+    def _wanted(self, seq: int) -> bool:
+        return self.filter is None or self.filter.matches(self.bus._ring[seq % self.bus.ring_size])
+
+    def _count_wanted(self, lo: int, hi: int) -> int:
+        """Events in [lo, hi) that pass this subscriber's filter."""
+        if self.filter is None:
+            return max(0, hi - lo)
+        return sum(1 for seq in range(max(lo, self.bus.oldest), hi) if self._wanted(seq))
+
+    def _wanted_lag(self, head: int) -> int:
+        """Backlog in events this subscriber would receive (counted incrementally)."""
+        if self.filter is None:
+            return head - self.cursor
+        if self._lag_filter is not self.filter or self._lag_to < self.cursor:
+            self._lag_filter, self._lag_to, self._lag_n = self.filter, self.cursor, 0
+        self._lag_n += self._count_wanted(self._lag_to, head)
+        self._lag_to = head
+        return self._lag_n
+
+    def _catch_up(self, head: int) -> None:
+        cursor0 = self.cursor
+        self._apply_policy(head)
+        if self.cursor != cursor0:
+            self._lag_to = -1  # cursor jumped: recount the wanted backlog
+
+    def _apply_policy(self, head: int) -> None:
+        oldest = self.bus.oldest
+        if self.cursor < oldest:
+            # ring wrapped past us whatever the policy (what was lost cannot be filtered)
+            self._keep_until = None
+            self._gap(self.cursor, oldest, "ring_overrun")
+            self.cursor = oldest
+        if self.cursor < self._replay_until:
+            return
+        if self._keep_until is not None:
+            if self.cursor < self._keep_until:
+                return
+            self._keep_until = None
+            self._gap(self.cursor, head, "backlog_full", dropped=self._count_wanted(self.cursor, head))
+            self.cursor = head
+            return
+        if head - self.cursor <= self.max_lag:
+            return
+        # filtered subscribers: lag and losses count only events they would receive
+        lag = self._wanted_lag(head)
+        if lag <= self.max_lag:
+            return
+        if self.policy == "disconnect":
+            self._gap(self.cursor, head, "slow_consumer_disconnected", dropped=lag)
+            self.cursor = head
+            self.bus._disconnects += 1
+            self.bus._subs.discard(self)
+            self.closed = True
+        elif self.policy == "drop_newest":
+            # keep the next max_lag wanted events
+            seq, n = self.cursor, 0
+            while n < self.max_lag:
+                n += self._wanted(seq)
+                seq += 1
+            self._keep_until = seq
+        elif self.policy == "coalesce_by_type":
+            latest: Dict[Any, EventEnvelope] = {}
+            for seq in range(self.cursor, head):
+                if not self._wanted(seq):
+                    continue
+                env = self.bus._ring[seq % self.bus.ring_size]
+                key = env.event_type
+                latest[key if key is not None else ("seq", seq)] = env
+            kept = sorted(latest.values(), key=lambda e: e.seq)
+            start = self.cursor
+            self.cursor = head
+            # the dropped events are interleaved with the kept ones: report
+            # the whole range they came from, not a contiguous prefix
+            self._gap(start, head, "coalesced", dropped=lag - len(kept))
+            self._pending.extend(kept)
+        else:  # drop_oldest: keep the newest max_lag wanted events
+            seq, n = head, 0
+            while n < self.max_lag:
+                seq -= 1
+                n += self._wanted(seq)
+            self._gap(self.cursor, seq, "backlog_full", dropped=lag - self.max_lag)
+            self.cursor = seq
+
+    def _superseded(self, key: Any, seq: int) -> bool:
+        """A newer value for `key` that this subscriber will receive is in the ring."""
+        bus = self.bus
+        latest = bus._latest_seq.get(key, -1)
+        if latest <= seq:
+            return False
+        if self.filter is None:
+            return True
+        # filtered: only a newer value that passes the filter replaces this one
+        return latest >= bus.oldest and self.filter.matches(bus._ring[latest % bus.ring_size])
+
+    def _admit(self, env: EventEnvelope, now: float) -> bool:
+        """Conflation gate for keyed state events; False = skip/hold."""
+        key = env.ckey
+        if self._superseded(key, env.seq):
+            # a newer value for this key is already in the ring
+            self.conflated += 1
+            return False
+        if now - self._last_sent.get(key, -1e9) < self.bus.conflate_min_interval_s:
+            if key in self._held:
+                self.conflated += 1
+            self._held[key] = env
+            return False
+        self._held.pop(key, None)
+        self._last_sent[key] = now
+        return True
+
+    def _release_held(self, now: float) -> Optional[EventEnvelope]:
+        interval = self.bus.conflate_min_interval_s
+        for key, env in list(self._held.items()):
+            if self._superseded(key, env.seq) and self.cursor <= self.bus._latest_seq[key]:
+                # newer value not read yet: it replaces the held one
+                del self._held[key]
+                self.conflated += 1
+                continue
+            if now - self._last_sent.get(key, -1e9) >= interval:
+                del self._held[key]
+                self._last_sent[key] = now
+                return env
+        return None
+
+    def _next_due(self, now: float) -> Optional[float]:
+        if not self._held:
+            return None
+        interval = self.bus.conflate_min_interval_s
+        return max(0.0, min(self._last_sent.get(k, -1e9) + interval - now for k in self._held))
+
+    def wants(self, env: EventEnvelope) -> bool:
+        """Filter check; gap markers always pass."""
+        return self.filter is None or env.event_type == "gap" or self.filter.matches(env)
+
+    def get_nowait(self) -> Optional[EventEnvelope]:
+        """Next envelope, or None if nothing is ready / closed."""
+        while True:
+            if self._pending:
+                env = self._pending.popleft()
+                if not self.wants(env):
+                    continue
+                return env
+            if self.closed:
+                return None
+            now = time.monotonic()
+            if self._held:
+                env = self._release_held(now)
+                if env is not None:
+                    return env
+            head = self.bus.head
+            if self.cursor >= head:
+                return None
+            self._catch_up(head)
+            if self._pending or self.closed:
+                continue
+            if self.cursor >= head:
+                return None
+            env = self.bus._ring[self.cursor % self.bus.ring_size]
+            self.cursor += 1
+            if self.filter is not None:
+                if not self.filter.matches(env):
+                    continue
+                if env.seq < self._lag_to:
+                    self._lag_n -= 1
+            if self.conflate and env.ckey is not None and not self._admit(env, now):
+                continue
+            return env
+
+    async def get(self) -> Optional[EventEnvelope]:
+        while True:
+            env = self.get_nowait()
+            if env is not None:
+                return env
+            if self.closed:
+                return None
+            due = self._next_due(time.monotonic())
+            if due is None:
+                await self.bus._wake.wait()
+            else:
+                try:
+                    await asyncio.wait_for(self.bus._wake.wait(), timeout=due)
+                except asyncio.TimeoutError:
+                    pass
+
+    def close(self) -> None:
+        self.closed = True
+        self._pending.clear()
+
+
+class BroadcastBus:
+    def __init__(
+        self,
+        queue_maxsize: int = 200,
+        *,
+        ring_size: Optional[int] = None,
+        default_policy: Optional[str] = None,
+        on_drop: Optional[Callable[[int], None]] = None,
+        conflate: Optional[Dict[str, Optional[str]]] = None,
+        conflate_max_hz: Optional[float] = None,
+    ):
+        # queue_maxsize: per-subscriber backlog limit (kept name for compatibility)
+        self._queue_maxsize = max(1, int(queue_maxsize))
+        self.ring_size = max(self._queue_maxsize, int(ring_size or _env_int("OPS_BUS_RING", 4096)))
+        policy = default_policy or os.environ.get("OPS_BUS_POLICY", "drop_oldest")
+        self.default_policy = policy if policy in POLICIES else "drop_oldest"
+        self._ring: List[Optional[EventEnvelope]] = [None] * self.ring_size
+        self._base = 0
+        self._seq = 0
+        self._taps: List[Callable[[EventEnvelope], None]] = []
+        self.history: Any = None  # optional: .replay(from_seq, to_seq) for older events
+        self.replay_max = max(1, _env_int("OPS_HISTORY_REPLAY_MAX", 5000))
+        self._wake = asyncio.Event()
+        self._subs: Set[Subscription] = set()
+        self._closed = False
+        self._on_drop = on_drop
+        # backpressure metrics
+        self._dropped_total = 0
+        self._disconnects = 0
+        self._last_drop_ts = 0.0
+        self._last_sweep = time.monotonic()
+        # conflation of keyed state events
+        self.conflate_types = conflate if conflate is not None else parse_conflate_spec(
+            os.environ.get("OPS_BUS_CONFLATE", DEFAULT_CONFLATE))
+        hz = float(conflate_max_hz if conflate_max_hz is not None else _env_float("OPS_BUS_CONFLATE_MAX_HZ", 5.0))
+        self.conflate_min_interval_s = (1.0 / hz) if hz > 0 else 0.0
+        self._latest_seq: Dict[Any, int] = {}
+
+    @property
+    def head(self) -> int:
+        """Sequence number the next published event will get."""
+        return self._seq
+
+    @property
+    def oldest(self) -> int:
+        """Oldest sequence number still in the ring."""
+        return max(self._base, self._seq - self.ring_size)
+
+    def set_base(self, seq: int) -> None:
+        """Continue numbering at `seq` (persisted history). Before first publish only."""
+        if self._seq == self._base and seq > self._seq:
+            self._base = self._seq = int(seq)
+
+    def add_tap(self, fn: Callable[[EventEnvelope], None]) -> None:
+        """Call fn(env) synchronously for every published envelope (keep it O(1))."""
+        self._taps.append(fn)
+
+    def ring_slice(self, from_seq: int, to_seq: int) -> List[EventEnvelope]:
+        lo = max(from_seq, self.oldest)
+        hi = min(to_seq, self._seq)
+        return [self._ring[s % self.ring_size] for s in range(lo, hi)]
+
+    @property
+    def _drop_count(self) -> int:
+        # realized drops + backlog overflow not yet observed by idle subscribers
+        pending = 0
+        for s in self._subs:
+            pending += s.overflow
+        return self._dropped_total + pending
+
+    def _note_drop(self, n: int) -> None:
+        self._dropped_total += n
+        now = time.time()
+        if now - self._last_drop_ts > 5:
+            # sampled: do not spam
+            self._last_drop_ts = now
+            if self._on_drop is not None:
+                try:
+                    self._on_drop(self._drop_count)
+                except Exception:
+                    pass
+
+    def _conflate_key(self, env: EventEnvelope) -> Any:
+        typ = env.event_type
+        if typ is None or typ not in self.conflate_types:
+            return None
+        field = self.conflate_types[typ]
+        if field is None:
+            return (typ,)
+        ev = env._data
+        val = ev.get(field)
+        if val is None and isinstance(ev.get("data"), dict):
+            val = ev["data"].get(field)
+        return (typ, val)
+
+    def _kick(self) -> None:
+        ev = self._wake
+        self._wake = asyncio.Event()
+        ev.set()
+
+    def _sweep(self) -> None:
+        """Periodic pass for subscribers that stopped reading entirely."""
+        overflow = 0
+        for s in list(self._subs):
+            over = s.overflow
+            if over <= 0:
+                continue
+            overflow += over
+            if s.policy == "disconnect":
+                s._catch_up(self._seq)
+        if overflow:
+            self._note_drop(0)
+
+    async def subscribe(
+        self,
+        *,
+        policy: Optional[str] = None,
+        max_lag: Optional[int] = None,
+        conflate: bool = True,
+        event_filter: Optional[EventFilter] = None,
+        since: Optional[int] = None,
+    ) -> Subscription:
+        pol = policy if policy in POLICIES else self.default_policy
+        sub = Subscription(self, pol, max_lag or self._queue_maxsize, conflate, event_filter)
+        if self._closed:
+            # already closed: get() returns None right away
+            sub.close()
+            return sub
+        if since is not None:
+            await self._resume(sub, int(since) + 1)
+        self._subs.add(sub)
+        return sub
+
+    async def _resume(self, sub: Subscription, want: int) -> None:
+        head = self._seq
+        if want > head or want < 0:
+            sub._pending.append(EventEnvelope({
+                "type": "resync",
+                "source": "ops_web",
+                "severity": "warn",
+                "message": "unknown resume position; reload state",
+                "data": {"since": want - 1, "head": head},
+            }))
+            return
+        start = want
+        if head - start > self.replay_max:
+            sub._gap(start, head - self.replay_max, "replay_limit", count_drop=False)
+            start = head - self.replay_max
+        oldest = self.oldest
+        if start < oldest:
+            older: List[EventEnvelope] = []
+            if self.history is not None:
+                try:
+                    older = await asyncio.to_thread(self.history.replay, start, oldest)
+                except Exception:
+                    older = []
+            got_from = older[0].seq if older else oldest
+            sub._gap(start, got_from, "history_expired", count_drop=False)
+            sub._pending.extend(older)
+            start = oldest
+        sub.cursor = start
+        sub._replay_until = head
+
+    async def unsubscribe(self, sub: Subscription) -> None:
+        self._subs.discard(sub)
+        sub.close()
+        self._kick()
+
+    def publish_nowait(self, event: Any) -> Optional[EventEnvelope]:
+        """O(1): write into the ring and wake readers. Loop thread only."""
+        if self._closed:
+            return None
+        env = event if isinstance(event, EventEnvelope) else EventEnvelope(event)
+        env = env._assign_seq(self._seq, int(time.time() * 1000))
+        env.ckey = self._conflate_key(env)
+        if env.ckey is not None:
+            self._latest_seq[env.ckey] = env.seq
+        self._ring[self._seq % self.ring_size] = env
+        self._seq += 1
+        for tap in self._taps:
+            try:
+                tap(env)
+            except Exception:
+                pass
+        self._kick()
+        now = time.monotonic()
+        if now - self._last_sweep >= 1.0:
+            self._last_sweep = now
+            self._sweep()
+        return env
+
+    async def publish(self, event: Any) -> None:
+        self.publish_nowait(event)
+
+    async def shutdown(self) -> None:
+        self._closed = True
+        subs = list(self._subs)
+        self._subs.clear()
+        for s in subs:
+            s.close()
+        self._kick()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "seq": self._seq,
+            "ring_size": self.ring_size,
+            "default_policy": self.default_policy,
+            "disconnects": self._disconnects,
+            "max_lag_seen": max((s.lag for s in self._subs), default=0),
+            "conflate_types": sorted(self.conflate_types),
+            "conflated": sum(s.conflated for s in self._subs),
+        }
@@ -0,0 +1,503 @@
+"""
+Indexed local event store behind /api/ops/history, /api/history/risks and
+/api/ops/alerts (stdlib sqlite3, WAL).
+
+Rows are partitioned by hour (`hour` = ts_ms // 3_600_000) with indexes on
+(hour, ts_ms), (type, ts_ms), (is_risk, ts_ms) and (is_alert, ts_ms), so
+time-range and top-N queries never scan raw JSONL. Retention drops whole
+hours.
+
+Ingest:
+- bus tap: every published envelope (minus OPS_EVENT_STORE_EXCLUDE types)
+  is buffered and written in one transaction per flush by a worker thread;
+  IPC run_events flagged `file_sink` are left to the backfill below, which
+  reads the same event from events.jsonl
+- file backfill: kill_audit.jsonl and runs/<run_id>/events.jsonl are read
+  incrementally; byte offsets (and inode, for rotation) persist in the
+  `sources` table so restarts never re-import or skip lines. When the
+  journal has rotated, the old inode's unread tail is finished from its
+  events.N.jsonl segment before the new file is read
+
+One action can reach the store twice (a /api/ops/kill is both a kill_audit
+line and a bus guardrail_update, with the same trace_id): only the first
+row per trace_id is flagged as a risk (and alert), later ones stay plain
+history.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ops_web.bus import EventEnvelope
+
+log = logging.getLogger("ops_web")
+
+HOUR_MS = 3_600_000
+SCAN_BLOCK = 1 << 20  # backfill read size
+ALERT_SEVERITIES = ("warn", "warning", "error", "critical", "fatal")
+RISK_MARKERS = ("risk", "kill", "guardrail", "downgrade")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id        INTEGER PRIMARY KEY,
+    ts_ms     INTEGER NOT NULL,
+    hour      INTEGER NOT NULL,
+    type      TEXT,
+    source    TEXT,
+    severity  TEXT,
+    trace_id  TEXT,
+    seq       INTEGER,
+    origin    TEXT NOT NULL,
+    is_risk   INTEGER NOT NULL DEFAULT 0,
+    is_alert  INTEGER NOT NULL DEFAULT 0,
+    body      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_events_hour_ts ON events(hour, ts_ms);
+CREATE INDEX IF NOT EXISTS ix_events_type_ts ON events(type, ts_ms);
+CREATE INDEX IF NOT EXISTS ix_events_risk_ts ON events(is_risk, ts_ms);
+CREATE INDEX IF NOT EXISTS ix_events_alert_ts ON events(is_alert, ts_ms);
+CREATE INDEX IF NOT EXISTS ix_events_trace ON events(trace_id);
+CREATE TABLE IF NOT EXISTS sources (
+    path    TEXT PRIMARY KEY,
+    ino     INTEGER,
+    offset  INTEGER NOT NULL
+);
+"""
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)))
+    except Exception:
+        return default
+
+
+def to_ms(val: Any) -> Optional[int]:
+    """Epoch sec/ms number or ISO-8601 string -> epoch ms."""
+    if val is None or val == "":
+        return None
+    try:
+        ts = float(val)
+        return int(ts * 1000.0) if ts < 10_000_000_000 else int(ts)
+    except Exception:
+        pass
+    try:
+        s = str(val).strip()
+        if s.endswith("Z"):
+            s = s[:-1] + "+00:00"
+        dt = datetime.fromisoformat(s)
+        if dt.tzinfo is None:
+            # naive timestamps in this repo are UTC (datetime.utcnow())
+            return int((dt - datetime(1970, 1, 1)).total_seconds() * 1000)
+        return int(dt.timestamp() * 1000)
+    except Exception:
+        return None
+
+
+def _guard_state(ev: Dict[str, Any]) -> Tuple:
+    data = ev.get("data") if isinstance(ev.get("data"), dict) else ev
+    return (
+        str(data.get("risk_level") or "OK").upper(),
+        data.get("kill_switch") is True,
+        int(data.get("downgrade_level") or 0),
+    )
+
+
+def _row_for(ev: Dict[str, Any], ts_ms: int, origin: str, body: str, seq: Optional[int] = None) -> Tuple:
+    typ = ev.get("type") or ev.get("event_type") or ev.get("event") or ev.get("action")
+    typ = str(typ) if typ is not None else None
+    data = ev.get("data") if isinstance(ev.get("data"), dict) else {}
+    severity = ev.get("severity") or ev.get("level")
+    severity = str(severity).lower() if severity else None
+    low = (typ or "").lower()
+    # guardrail_update rows are only stored on state transitions (see _write_envelopes)
+    is_risk = (
+        origin == "kill_audit"
+        or typ == "guardrail_update"
+        or any(m in low for m in RISK_MARKERS)
+    )
+    is_alert = is_risk or (severity in ALERT_SEVERITIES)
+    return (
+        ts_ms, ts_ms // HOUR_MS, typ, ev.get("source"), severity, ev.get("trace_id"),
+        seq, origin, int(bool(is_risk)), int(bool(is_alert)), body,
+    )
+
+
+class EventStore:
+    def __init__(
+        self,
+        path: Optional[Path],
+        *,
+        backfill_files: Sequence[Path] = (),
+        backfill_globs: Sequence[Tuple[Path, str]] = (),
+        retention_hours: Optional[float] = None,
+        flush_interval_s: float = 0.5,
+        scan_interval_s: Optional[float] = None,
+        exclude_types: Optional[Iterable[str]] = None,
+    ) -> None:
+        self.path = Path(path) if path else None
+        self.backfill_files = list(backfill_files)
+        self.backfill_globs = list(backfill_globs)
+        self.retention_hours = float(retention_hours if retention_hours is not None
+                                     else _env_float("OPS_EVENT_STORE_RETENTION_H", 24 * 14))
+        self.flush_interval_s = float(flush_interval_s)
+        self.scan_interval_s = float(scan_interval_s if scan_interval_s is not None
+                                     else _env_float("OPS_EVENT_STORE_SCAN_SEC", 5.0))
+        if exclude_types is None:
+            exclude_types = os.environ.get("OPS_EVENT_STORE_EXCLUDE", "ws_heartbeat,gap,resync").split(",")
+        self.exclude_types = {t.strip() for t in exclude_types if t.strip()}
+        self._buf: List[EventEnvelope] = []
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._last_retention = 0.0
+        self._last_guard: Optional[Tuple] = None
+        self._ready = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    # --- connections ---------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def open(self) -> None:
+        """Create the schema (blocking)."""
+        if not self.enabled:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._write_lock:
+            conn = self._conn()
+            conn.executescript(_SCHEMA)
+            conn.commit()
+        self._ready = True
+
+    # --- ingest ----------------------------------------------------------------
+
+    def record(self, env: EventEnvelope) -> None:
+        """Bus tap (loop thread, O(1))."""
+        if not self._ready or env.event_type in self.exclude_types:
+            return
+        if env.event_type == "run_event" and isinstance(env._data, dict) and env._data.get("file_sink"):
+            # also in runs/<run_id>/events.jsonl: stored once, by the backfill
+            return
+        self._buf.append(env)
+
+    def _take(self) -> List[EventEnvelope]:
+        batch, self._buf = self._buf, []
+        return batch
+
+    def _write_envelopes(self, batch: List[EventEnvelope]) -> None:
+        rows = []
+        for env in batch:
+            ev = env._data if isinstance(env._data, dict) else {"value": env._data}
+            if env.event_type == "guardrail_update":
+                # periodic re-broadcasts of an unchanged state are not history
+                state = _guard_state(ev)
+                first = self._last_guard is None
+                if state == self._last_guard or (first and state == ("OK", False, 0)):
+                    self._last_guard = state
+                    continue
+                self._last_guard = state
+            rows.append(_row_for(ev, env.recv_ms or int(time.time() * 1000), "bus", env.text, env.seq))
+        self._insert(rows)
+
+    @staticmethod
+    def _dedupe_risks(conn: sqlite3.Connection, rows: List[Tuple]) -> List[Tuple]:
+        """Demote rows whose trace_id already has a risk row (write lock held).
+
+        The duplicate stays an alert only on its own severity.
+        """
+        traces = {r[5] for r in rows if r[8] and r[5] and r[5] != "no-trace"}
+        if not traces:
+            return rows
+        seen = {t for (t,) in conn.execute(
+            f"SELECT DISTINCT trace_id FROM events WHERE is_risk = 1 AND trace_id IN ({','.join('?' * len(traces))})",
+            list(traces),
+        )}
+        out = []
+        for r in rows:
+            if r[8] and r[5] in traces:
+                if r[5] in seen:
+                    r = (*r[:8], 0, int(r[4] in ALERT_SEVERITIES), r[10])
+                else:
+                    seen.add(r[5])
+            out.append(r)
+        return out
+
+    def _insert(self, rows: List[Tuple]) -> None:
+        if not rows:
+            return
+        with self._write_lock:
+            conn = self._conn()
+            rows = self._dedupe_risks(conn, rows)
+            conn.executemany(
+                "INSERT INTO events(ts_ms, hour, type, source, severity, trace_id, seq, origin, is_risk, is_alert, body)"
+                " VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+                rows,
+            )
+            conn.commit()
+
+    def _backfill_paths(self) -> List[Path]:
+        paths = [p for p in self.backfill_files]
+        for base, pattern in self.backfill_globs:
+            try:
+                paths.extend(sorted(base.glob(pattern)))
+            except Exception:
+                continue
+        return paths
+
+    def scan_files(self) -> int:
+        """Import lines appended to backfill files since the last scan (blocking)."""
+        if not self._ready:
+            return 0
+        total = 0
+        for p in self._backfill_paths():
+            try:
+                total += self._scan_file(p)
+            except Exception:
+                log.exception("event_store: backfill failed %s", p)
+        return total
+
+    def _scan_file(self, p: Path) -> int:
+        try:
+            st = p.stat()
+        except OSError:
+            return 0
+        key = str(p.resolve())
+        conn = self._conn()
+        row = conn.execute("SELECT ino, offset FROM sources WHERE path=?", (key,)).fetchone()
+        offset = 0
+        total = 0
+        if row is not None and row[0] == st.st_ino and row[1] <= st.st_size:
+            offset = int(row[1])
+        elif row is not None and row[0] != st.st_ino:
+            total += self._finish_rotated(p, key, int(row[0]), int(row[1]))
+        if offset >= st.st_size and row is not None:
+            return total
+        return total + self._import(p, key, st.st_ino, offset, st.st_mtime)
+
+    def _finish_rotated(self, p: Path, key: str, ino: int, offset: int) -> int:
+        """Drain a file that was rotated away since the last scan.
+
+        EventJournal renames events.jsonl to events.1.jsonl (shifting older
+        segments up), so the old inode's unread tail and any segment rotated
+        after it live under events.N.jsonl. Import them oldest first; the
+        caller then reads the new file from the start.
+        """
+        segs = []
+        n = 1
+        while True:
+            seg = p.with_name(f"{p.stem}.{n}{p.suffix}")
+            try:
+                segs.append((seg, seg.stat()))
+            except OSError:
+                break
+            n += 1
+        idx = next((i for i, (_, sst) in enumerate(segs) if sst.st_ino == ino), None)
+        if idx is None:
+            return 0  # rotated out of retention (or never a journal): nothing to recover
+        total = 0
+        for i in range(idx, -1, -1):
+            seg, sst = segs[i]
+            start = offset if i == idx else 0
+            if start < sst.st_size:
+                total += self._import(seg, key, sst.st_ino, start, sst.st_mtime)
+        return total
+
+    def _import(self, p: Path, key: str, ino: int, offset: int, mtime: float) -> int:
+        """Import complete lines of `p` from `offset`, SCAN_BLOCK bytes at a time.
+
+        Rows and the new offset are committed per block, so a large backlog
+        (first start, 64 MB journal segments) never sits in memory at once
+        and an interrupted scan resumes where it stopped.
+        """
+        origin = "kill_audit" if p.name.startswith("kill_audit") else "run_events"
+        run_id = p.parent.name if origin == "run_events" else None
+        conn = self._conn()
+        total = 0
+        carry = b""
+        with p.open("rb") as f:
+            f.seek(offset)
+            while True:
+                block = f.read(SCAN_BLOCK)
+                if not block:
+                    break
+                data = carry + block
+                end = data.rfind(b"\n") + 1  # only complete lines
+                carry = data[end:]
+                if not end:
+                    continue
+                rows = self._rows_from(data[:end], origin, run_id, mtime)
+                offset += end
+                with self._write_lock:
+                    rows = self._dedupe_risks(conn, rows)
+                    conn.executemany(
+                        "INSERT INTO events(ts_ms, hour, type, source, severity, trace_id, seq, origin, is_risk, is_alert, body)"
+                        " VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+                        rows,
+                    )
+                    conn.execute(
+                        "INSERT INTO sources(path, ino, offset) VALUES (?,?,?)"
+                        " ON CONFLICT(path) DO UPDATE SET ino=excluded.ino, offset=excluded.offset",
+                        (key, ino, offset),
+                    )
+                    conn.commit()
+                total += len(rows)
+        return total
+
+    @staticmethod
+    def _rows_from(data: bytes, origin: str, run_id: Optional[str], mtime: float) -> List[Tuple]:
+        rows = []
+        for raw in data.splitlines():
+            line = raw.decode("utf-8", errors="ignore").strip()
+            if not line:
+                continue
+            try:
+                ev = json.loads(line)
+            except Exception:
+                continue
+            if not isinstance(ev, dict):
+                continue
+            if run_id and "run_id" not in ev:
+                ev["run_id"] = run_id
+                line = json.dumps(ev, ensure_ascii=False)
+            ts_ms = None
+            for k in ("ts_ms", "ts", "timestamp", "recovered_at", "activated_at"):
+                ts_ms = to_ms(ev.get(k))
+                if ts_ms is not None:
+                    break
+            if ts_ms is None:
+                ts_ms = int(mtime * 1000)
+            rows.append(_row_for(ev, ts_ms, origin, line))
+        return rows
+
+    def apply_retention(self) -> int:
+        if not self._ready or self.retention_hours <= 0:
+            return 0
+        cutoff_hour = int(time.time() * 1000 - self.retention_hours * HOUR_MS) // HOUR_MS
+        with self._write_lock:
+            conn = self._conn()
+            cur = conn.execute("DELETE FROM events WHERE hour < ?", (cutoff_hour,))
+            conn.commit()
+            return cur.rowcount or 0
+
+    def _tick(self, batch: List[EventEnvelope], scan: bool) -> None:
+        try:
+            self._write_envelopes(batch)
+        except Exception:
+            log.exception("event_store: write failed")
+        if scan:
+            self.scan_files()
+        now = time.time()
+        if now - self._last_retention > 3600:
+            self._last_retention = now
+            try:
+                self.apply_retention()
+            except Exception:
+                log.exception("event_store: retention failed")
+
+    async def run(self) -> None:
+        """Background ingest loop: bus buffer every flush interval, files every scan interval."""
+        if not self.enabled:
+            return
+        try:
+            await asyncio.to_thread(self.open)
+        except Exception:
+            log.exception("event_store: cannot open %s", self.path)
+            return
+        last_scan = 0.0
+        try:
+            while True:
+                now = time.monotonic()
+                scan = now - last_scan >= self.scan_interval_s
+                if scan:
+                    last_scan = now
+                if self._buf or scan:
+                    await asyncio.to_thread(self._tick, self._take(), scan)
+                await asyncio.sleep(self.flush_interval_s)
+        except asyncio.CancelledError:
+            return
+
+    def close(self) -> None:
+        if not self._ready:
+            return
+        try:
+            self._write_envelopes(self._take())
+        except Exception:
+            pass
+
+    # --- queries ---------------------------------------------------------------
+
+    def _select(self, where: str, params: List[Any], limit: int) -> List[Dict[str, Any]]:
+        conn = self._conn()
+        rows = conn.execute(
+            f"SELECT ts_ms, origin, seq, body FROM events WHERE {where} ORDER BY ts_ms DESC, id DESC LIMIT ?",
+            (*params, max(1, int(limit))),
+        ).fetchall()
+        out = []
+        for ts_ms, origin, seq, body in rows:
+            try:
+                ev = json.loads(body)
+            except Exception:
+                ev = {"raw": body}
+            if not isinstance(ev, dict):
+                ev = {"value": ev}
+            ev.setdefault("ts_ms", ts_ms)
+            ev.setdefault("origin", origin)
+            out.append(ev)
+        return out
+
+    def history(
+        self,
+        *,
+        start_ms: int,
+        end_ms: int,
+        limit: int = 1000,
+        types: Sequence[str] = (),
+        sources: Sequence[str] = (),
+        severities: Sequence[str] = (),
+    ) -> List[Dict[str, Any]]:
+        """Events in [start_ms, end_ms]; the newest `limit`, oldest first."""
+        if not self._ready:
+            return []
+        where = ["hour BETWEEN ? AND ?", "ts_ms BETWEEN ? AND ?"]
+        params: List[Any] = [start_ms // HOUR_MS, end_ms // HOUR_MS, start_ms, end_ms]
+        for col, vals in (("type", types), ("source", sources), ("severity", severities)):
+            vals = list(vals)
+            if vals:
+                where.append(f"{col} IN ({','.join('?' * len(vals))})")
+                params.extend(vals)
+        return list(reversed(self._select(" AND ".join(where), params, limit)))
+
+    def risks(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Newest risk events first (kill switch, guardrail escalations, risk types)."""
+        return self._select("is_risk = 1", [], limit) if self._ready else []
+
+    def alerts(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Newest warn/error/critical or risk events first."""
+        return self._select("is_alert = 1", [], limit) if self._ready else []
+
+    def stats(self) -> Dict[str, Any]:
+        if not self._ready:
+            return {"enabled": self.enabled, "ready": False}
+        conn = self._conn()
+        n, lo, hi = conn.execute("SELECT COUNT(*), MIN(ts_ms), MAX(ts_ms) FROM events").fetchone()
+        return {"enabled": True, "ready": True, "events": n, "oldest_ts_ms": lo, "newest_ts_ms": hi,
+                "buffered": len(self._buf)}
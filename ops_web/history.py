@@ -0,0 +1,286 @@
+"""
+Replayable event history for the ops_web bus.
+
+The bus ring is the in-memory history; this module adds an optional
+on-disk spill so reconnecting clients can resume from older sequence ids
+and sequence numbering survives a restart:
+
+- bus tap buffers every published envelope; a background task appends
+  them to segment files `events_<first_seq>.jsonl` off the event loop
+- each line: {"seq": N, "recv_ms": T, "event": {...}}
+- segments rotate every `segment_events` lines; only `max_segments` are kept
+- an in-memory index (seq / time range per segment) narrows replay and
+  time-range queries to the segments that can match
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from ops_web.bus import BroadcastBus, EventEnvelope, EventFilter
+
+log = logging.getLogger("ops_web")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except Exception:
+        return default
+
+
+@dataclass
+class _Segment:
+    path: Path
+    first_seq: int
+    last_seq: int = -1
+    first_ms: int = 0
+    last_ms: int = 0
+    count: int = 0
+
+
+def _parse_line(line: str) -> Optional[Dict[str, Any]]:
+    try:
+        obj = json.loads(line)
+    except Exception:
+        return None
+    if not isinstance(obj, dict) or "seq" not in obj:
+        return None
+    return obj
+
+
+def _last_line(path: Path, block: int = 64 * 1024) -> Optional[str]:
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - block))
+        lines = f.read().splitlines()
+    for raw in reversed(lines):
+        if raw.strip():
+            return raw.decode("utf-8", errors="ignore")
+    return None
+
+
+class EventHistory:
+    def __init__(
+        self,
+        bus: BroadcastBus,
+        directory: Optional[Path],
+        *,
+        segment_events: Optional[int] = None,
+        max_segments: Optional[int] = None,
+        flush_interval_s: float = 0.25,
+    ) -> None:
+        self.bus = bus
+        self.directory = Path(directory) if directory else None
+        self.segment_events = max(1, int(segment_events or _env_int("OPS_HISTORY_SEGMENT_EVENTS", 50_000)))
+        self.max_segments = max(1, int(max_segments or _env_int("OPS_HISTORY_MAX_SEGMENTS", 20)))
+        self.flush_interval_s = float(flush_interval_s)
+        self._buf: List[EventEnvelope] = []
+        self._segments: List[_Segment] = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    # --- spill ---------------------------------------------------------------
+
+    def load(self) -> int:
+        """Index existing segments; returns the next sequence id to use."""
+        if not self.enabled:
+            return 0
+        segs: List[_Segment] = []
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for p in sorted(self.directory.glob("events_*.jsonl")):
+                try:
+                    first = int(p.stem.split("_", 1)[1])
+                except Exception:
+                    continue
+                seg = _Segment(p, first)
+                with p.open("r", encoding="utf-8", errors="ignore") as f:
+                    head = _parse_line(f.readline())
+                    seg.count = 1 + sum(1 for _ in f) if head else 0
+                tail = _parse_line(_last_line(p) or "")
+                if not head or not tail:
+                    continue
+                seg.first_ms = int(head.get("recv_ms") or 0)
+                seg.last_seq = int(tail["seq"])
+                seg.last_ms = int(tail.get("recv_ms") or 0)
+                segs.append(seg)
+        except Exception:
+            log.exception("history: failed to index %s", self.directory)
+        segs.sort(key=lambda s: s.first_seq)
+        with self._lock:
+            self._segments = segs
+        return (segs[-1].last_seq + 1) if segs else 0
+
+    def record(self, env: EventEnvelope) -> None:
+        """Bus tap (loop thread, O(1))."""
+        if self.enabled:
+            self._buf.append(env)
+
+    def _take(self) -> List[EventEnvelope]:
+        # loop thread: swap the buffer before handing it to a worker thread
+        batch, self._buf = self._buf, []
+        return batch
+
+    def flush(self) -> None:
+        """Write everything buffered so far (blocking; loop thread)."""
+        self._write(self._take())
+
+    def _write(self, batch: List[EventEnvelope]) -> None:
+        if not batch:
+            return
+        with self._lock:
+            i = 0
+            while i < len(batch):
+                seg = self._segments[-1] if self._segments else None
+                if seg is None or seg.count >= self.segment_events:
+                    seg = _Segment(self.directory / f"events_{batch[i].seq:012d}.jsonl", batch[i].seq)
+                    self._segments.append(seg)
+                    self._apply_retention()
+                take = batch[i: i + (self.segment_events - seg.count)]
+                i += len(take)
+                lines = [
+                    f'{{"seq":{e.seq},"recv_ms":{e.recv_ms},"event":{e.text}}}\n'
+                    for e in take
+                ]
+                try:
+                    with seg.path.open("a", encoding="utf-8") as f:
+                        f.write("".join(lines))
+                except Exception:
+                    log.exception("history: write failed %s", seg.path)
+                    continue
+                if seg.count == 0:
+                    seg.first_ms = take[0].recv_ms
+                seg.count += len(take)
+                seg.last_seq = take[-1].seq
+                seg.last_ms = take[-1].recv_ms
+
+    def _apply_retention(self) -> None:
+        while len(self._segments) > self.max_segments:
+            old = self._segments.pop(0)
+            try:
+                old.path.unlink()
+            except Exception:
+                pass
+
+    async def run(self) -> None:
+        """Background flush loop."""
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval_s)
+                if self._buf:
+                    await asyncio.to_thread(self._write, self._take())
+        except asyncio.CancelledError:
+            return
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    # --- reads ---------------------------------------------------------------
+
+    def _segments_snapshot(self) -> List[_Segment]:
+        with self._lock:
+            return list(self._segments)
+
+    def _iter_disk(self, segs: List[_Segment]) -> Iterator[Dict[str, Any]]:
+        for seg in segs:
+            try:
+                with seg.path.open("r", encoding="utf-8", errors="ignore") as f:
+                    for line in f:
+                        obj = _parse_line(line)
+                        if obj is not None:
+                            yield obj
+            except FileNotFoundError:
+                continue
+
+    def replay(self, from_seq: int, to_seq: int) -> List[EventEnvelope]:
+        """Spilled envelopes with from_seq <= seq < to_seq, in order."""
+        if not self.enabled or from_seq >= to_seq:
+            return []
+        segs = [s for s in self._segments_snapshot() if s.last_seq >= from_seq and s.first_seq < to_seq]
+        out: List[EventEnvelope] = []
+        for obj in self._iter_disk(segs):
+            seq = int(obj["seq"])
+            if seq < from_seq:
+                continue
+            if seq >= to_seq:
+                break
+            out.append(EventEnvelope.restored(obj.get("event"), seq, int(obj.get("recv_ms") or 0)))
+        return out
+
+    def query(
+        self,
+        *,
+        start_ms: int,
+        end_ms: Optional[int] = None,
+        limit: int = 1000,
+        event_filter: Optional[EventFilter] = None,
+        since_seq: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Events published in [start_ms, end_ms]; the newest `limit`, oldest first."""
+        end_ms = int(end_ms if end_ms is not None else time.time() * 1000)
+        min_seq = (since_seq + 1) if since_seq is not None else None
+        picked: List[EventEnvelope] = []
+
+        # 1) in-memory ring (binary search on publish time)
+        ring = self.bus.ring_slice(self.bus.oldest, self.bus.head)
+        lo = bisect_left([e.recv_ms for e in ring], start_ms)
+        for env in ring[lo:]:
+            if env.recv_ms > end_ms:
+                break
+            if min_seq is not None and env.seq < min_seq:
+                continue
+            if event_filter is not None and not event_filter.matches(env):
+                continue
+            picked.append(env)
+
+        # 2) older events from the spill, when the ring does not reach back far enough
+        ring_first_ms = ring[0].recv_ms if ring else end_ms + 1
+        ring_first_seq = ring[0].seq if ring else self.bus.head
+        if self.enabled and len(picked) < limit and start_ms < ring_first_ms:
+            segs = [
+                s for s in self._segments_snapshot()
+                if s.last_ms >= start_ms and s.first_ms <= end_ms and s.first_seq < ring_first_seq
+            ]
+            older: List[EventEnvelope] = []
+            for obj in self._iter_disk(segs):
+                seq = int(obj["seq"])
+                if seq >= ring_first_seq:
+                    break
+                ms = int(obj.get("recv_ms") or 0)
+                if ms < start_ms or ms > end_ms or (min_seq is not None and seq < min_seq):
+                    continue
+                env = EventEnvelope.restored(obj.get("event"), seq, ms)
+                if event_filter is not None and not event_filter.matches(env):
+                    continue
+                older.append(env)
+            picked = older + picked
+
+        picked = picked[-max(1, int(limit)):]
+        return [dict(e.event) if isinstance(e._data, dict) else {"seq": e.seq, "value": e._data} for e in picked]
+
+    def stats(self) -> Dict[str, Any]:
+        segs = self._segments_snapshot()
+        return {
+            "enabled": self.enabled,
+            "segments": len(segs),
+            "spilled_events": sum(s.count for s in segs),
+            "oldest_seq": segs[0].first_seq if segs else None,
+            "buffered": len(self._buf),
+        }
@@ -0,0 +1,156 @@
+"""
+Local IPC ingest: the trading runtime's events straight onto the bus.
+
+Counterpart of next_trade/runtime/ops_channel.py. The runtime connects to
+NEXT_TRADE_IPC_ADDR (unix:/path.sock, or tcp:127.0.0.1:PORT; same default
+as the runtime) and streams newline-delimited JSON objects; each one is
+handed to `ingest` on the event loop thread as soon as it is read.
+
+- the first line of a connection is {"type": "ipc_hello", "pid": ...};
+  it is not ingested
+- TCP is bound to loopback only; the Unix socket is created 0600 and a
+  stale socket file from a previous run is replaced
+- malformed lines are counted and skipped; they never close the connection
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import tempfile
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+log = logging.getLogger("ops_web")
+
+MAX_LINE_BYTES = 1 << 20
+
+# Address helpers mirror next_trade/runtime/ops_channel.py (keep the two in
+# sync). ops_web does not import them from there: it runs without the
+# trading runtime on its path (the next_trade import in app.py is optional),
+# and the runtime must not depend on ops_web either.
+DEFAULT_TCP_PORT = 8790
+
+
+def default_ipc_addr() -> str:
+    if os.name == "nt" or not hasattr(socket, "AF_UNIX"):
+        return f"tcp:127.0.0.1:{DEFAULT_TCP_PORT}"
+    return "unix:" + os.path.join(tempfile.gettempdir(), "next_trade_ops.sock")
+
+
+def parse_ipc_addr(addr: Optional[str]) -> Tuple[str, Any]:
+    addr = (addr or os.getenv("NEXT_TRADE_IPC_ADDR") or default_ipc_addr()).strip()
+    kind, _, rest = addr.partition(":")
+    if kind == "unix" and rest:
+        return "unix", rest
+    if kind == "tcp":
+        host, _, port = rest.rpartition(":")
+        return "tcp", (host or "127.0.0.1", int(port or DEFAULT_TCP_PORT))
+    raise ValueError(f"invalid IPC address: {addr!r}")
+
+
+class IpcServer:
+    def __init__(
+        self,
+        ingest: Callable[[Dict[str, Any], Dict[str, Any]], None],
+        addr: Optional[str] = None,
+    ) -> None:
+        """`ingest(event, peer)`: peer is the connection's hello (pid, ...)."""
+        self.ingest = ingest
+        self.kind, self.target = parse_ipc_addr(addr)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._conns: Set[asyncio.Task] = set()
+        self.received = 0
+        self.malformed = 0
+        self.connections = 0
+
+    async def start(self) -> None:
+        if self.kind == "unix":
+            path = self.target
+            try:
+                if os.path.exists(path):
+                    os.unlink(path)
+            except OSError:
+                pass
+            self._server = await asyncio.start_unix_server(self._handle, path=path, limit=MAX_LINE_BYTES)
+            try:
+                os.chmod(path, 0o600)
+            except OSError:
+                pass
+        else:
+            host, port = self.target
+            if host not in ("127.0.0.1", "localhost", "::1"):
+                raise ValueError(f"IPC TCP address must be loopback, got {host}")
+            self._server = await asyncio.start_server(self._handle, host=host, port=port, limit=MAX_LINE_BYTES)
+        log.info("ipc: listening on %s:%s", self.kind, self.target)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._conns.add(task)
+        self.connections += 1
+        peer: Dict[str, Any] = {}
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # over MAX_LINE_BYTES: the reader already discarded it
+                    self.malformed += 1
+                    continue
+                if not line:
+                    break
+                try:
+                    obj = json.loads(line)
+                except Exception:
+                    if line.strip():
+                        self.malformed += 1
+                    continue
+                if not isinstance(obj, dict):
+                    self.malformed += 1
+                    continue
+                if obj.get("type") == "ipc_hello":
+                    peer = obj
+                    continue
+                self.received += 1
+                try:
+                    self.ingest(obj, peer)
+                except Exception:
+                    log.exception("ipc: ingest failed")
+        except (asyncio.CancelledError, ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            self.connections -= 1
+            if task is not None:
+                self._conns.discard(task)
+            try:
+                writer.close()
+            except Exception:
+                pass
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for t in list(self._conns):
+                t.cancel()
+            try:
+                await self._server.wait_closed()
+            except Exception:
+                pass
+            self._server = None
+        if self.kind == "unix":
+            try:
+                os.unlink(self.target)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "addr": f"{self.kind}:{self.target if self.kind == 'unix' else '%s:%s' % self.target}",
+            "listening": self._server is not None,
+            "connections": self.connections,
+            "received": self.received,
+            "malformed": self.malformed,
+        }
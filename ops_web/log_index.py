@@ -0,0 +1,201 @@
+"""
+Cached index of the rotated log files in logs/ (live_obs_*).
+
+Replaces a glob + stat() of every file per /log-tail request:
+
+- one scandir pass builds {name: (mtime_ns, size)} plus a list kept sorted
+  by mtime, so the newest file is O(1) and ordering never re-sorts
+- Linux: an inotify watch on the directory reports the touched names and
+  only those are re-stat()ed (a queue overflow triggers a full rescan)
+- elsewhere (or without inotify): rescan at most every OPS_LOG_INDEX_POLL_SEC
+
+`read_page` serves a merged newest-first view across all segments, resumable
+with an opaque cursor ("<file>:<byte offset>"), reading backwards from the
+cursor only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+import logging
+import os
+import stat
+import threading
+import time
+from bisect import bisect_left, insort
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ops_web.tail_follow import _DirWatch, iter_lines_reverse_at
+
+log = logging.getLogger("ops_web")
+
+
+class LogDirIndex:
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        pattern: str = "live_obs_*",
+        poll_interval_s: Optional[float] = None,
+        use_inotify: Optional[bool] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.pattern = pattern
+        if poll_interval_s is None:
+            try:
+                poll_interval_s = float(os.getenv("OPS_LOG_INDEX_POLL_SEC", "2.0"))
+            except Exception:
+                poll_interval_s = 2.0
+        self.poll_interval_s = max(0.0, float(poll_interval_s))
+        if use_inotify is None:
+            use_inotify = os.getenv("OPS_LOG_INDEX_INOTIFY", "1") == "1"
+        self.use_inotify = bool(use_inotify) and os.name == "posix"
+
+        self._files: Dict[str, Tuple[int, int]] = {}
+        self._order: List[Tuple[int, str]] = []  # (mtime_ns, name), oldest first
+        self._lock = threading.Lock()
+        self._scanned_at = 0.0
+        self._watch: Optional[_DirWatch] = None
+        self._watch_failed = False
+        self.rescans = 0
+
+    # --- maintenance -----------------------------------------------------------
+
+    def _matches(self, name: str) -> bool:
+        return fnmatch.fnmatchcase(name, self.pattern)
+
+    def rescan(self) -> None:
+        files: Dict[str, Tuple[int, int]] = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not self._matches(entry.name):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    files[entry.name] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            pass
+        except Exception:
+            log.exception("log_index: scan failed %s", self.directory)
+        with self._lock:
+            self._files = files
+            self._order = sorted((m, n) for n, (m, _s) in files.items())
+        self._scanned_at = time.monotonic()
+        self.rescans += 1
+
+    def _update(self, name: str) -> None:
+        try:
+            st = os.stat(self.directory / name)
+            cur = (st.st_mtime_ns, st.st_size) if stat.S_ISREG(st.st_mode) else None
+        except OSError:
+            cur = None
+        with self._lock:
+            old = self._files.pop(name, None)
+            if old is not None:
+                i = bisect_left(self._order, (old[0], name))
+                if i < len(self._order) and self._order[i] == (old[0], name):
+                    del self._order[i]
+            if cur is not None:
+                self._files[name] = cur
+                insort(self._order, (cur[0], name))
+
+    def _ensure_watch(self) -> None:
+        if self._watch is not None or self._watch_failed or not self.use_inotify:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if not self.directory.exists():
+            return
+        try:
+            self._watch = _DirWatch(self.directory, None)
+        except Exception as exc:
+            self._watch_failed = True
+            log.info("log_index: inotify unavailable (%s); rescanning every %.1fs", exc, self.poll_interval_s)
+            return
+        # events before the watch existed are unknown
+        self.rescan()
+
+    def refresh(self) -> None:
+        """Bring the index up to date (cheap when nothing changed)."""
+        self._ensure_watch()
+        w = self._watch
+        if w is None:
+            if not self._scanned_at or time.monotonic() - self._scanned_at >= self.poll_interval_s:
+                self.rescan()
+            return
+        if w.overflowed:
+            w.overflowed = False
+            w.changed.clear()
+            self.rescan()
+        elif w.changed:
+            names, w.changed = w.changed, set()
+            for name in names:
+                if self._matches(name):
+                    self._update(name)
+        w.event.clear()
+
+    def close(self) -> None:
+        if self._watch is not None:
+            self._watch.close()
+            self._watch = None
+
+    # --- reads -----------------------------------------------------------------
+
+    def files(self) -> List[Path]:
+        """Indexed files, newest mtime first."""
+        self.refresh()
+        with self._lock:
+            return [self.directory / n for _m, n in reversed(self._order)]
+
+    def latest(self) -> Optional[Path]:
+        self.refresh()
+        with self._lock:
+            return self.directory / self._order[-1][1] if self._order else None
+
+    def read_page(self, cursor: Optional[str] = None, limit: int = 200) -> Dict[str, Any]:
+        """Up to `limit` lines newest-first across segments (newest file first).
+
+        Returns {"lines": [{"file", "offset", "text"}], "next_cursor"}; pass
+        next_cursor back to continue into older lines (None when exhausted).
+        """
+        self.refresh()
+        with self._lock:
+            names = [n for _m, n in reversed(self._order)]
+        idx, end = 0, None
+        if cursor:
+            name, _, off = cursor.rpartition(":")
+            try:
+                idx, end = names.index(name), (int(off) if off else None)
+            except ValueError:
+                return {"lines": [], "next_cursor": None}
+        limit = max(1, int(limit))
+        out: List[Dict[str, Any]] = []
+        while idx < len(names) and len(out) < limit:
+            name = names[idx]
+            start = 0
+            try:
+                for start, text in iter_lines_reverse_at(self.directory / name, end):
+                    out.append({"file": name, "offset": start, "text": text})
+                    if len(out) >= limit:
+                        break
+            except FileNotFoundError:
+                start = 0
+            if len(out) >= limit and start > 0:
+                return {"lines": out, "next_cursor": f"{name}:{start}"}
+            idx, end = idx + 1, None
+        next_cursor = f"{names[idx]}:" if idx < len(names) else None
+        return {"lines": out, "next_cursor": next_cursor}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            n = len(self._order)
+        return {"files": n, "rescans": self.rescans, "inotify": self._watch is not None}
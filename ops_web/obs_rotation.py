@@ -0,0 +1,469 @@
+"""
+Managed rotation and compaction for metrics/live_obs.jsonl.
+
+The live file is rolled over when it reaches OPS_OBS_ROTATE_MB or when its
+first line is older than OPS_OBS_ROTATE_SEC:
+
+- rotate: atomic rename into the archive directory
+  (`live_obs_<YYYYmmdd_HHMMSS>.jsonl`); appenders simply reopen the live
+  path, and TailFollower sees the inode change and drains the old file
+- compact: once a closed segment has been quiet for `grace_s` (late writes
+  through handles opened before the rename), it is compressed
+  (gzip, or zstd when OPS_OBS_COMPRESS=zstd and `zstandard` is installed)
+  in a worker thread
+- retention: keep at most OPS_OBS_KEEP_SEGMENTS segments and nothing
+  closed more than OPS_OBS_KEEP_DAYS ago
+
+`live_obs.manifest.json` (written atomically) lists every closed segment
+with its codec, line count, sizes, first/last ts and last line, so readers
+can pick the segments overlapping a time range without opening the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import io
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+from ops_web.event_store import to_ms
+from ops_web.tail_follow import find_last, iter_lines_reverse
+
+try:  # optional: zstd compression of closed segments
+    import zstandard  # type: ignore
+except Exception:  # pragma: no cover
+    zstandard = None
+
+log = logging.getLogger("ops_web")
+
+MANIFEST_VERSION = 1
+_SUFFIX = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)))
+    except Exception:
+        return default
+
+
+def _line_ts_ms(line: str) -> Optional[int]:
+    try:
+        obj = json.loads(line)
+    except Exception:
+        return None
+    return to_ms(obj.get("ts")) if isinstance(obj, dict) else None
+
+
+def _codec_of(name: str) -> str:
+    if name.endswith(".gz"):
+        return "gzip"
+    if name.endswith(".zst"):
+        return "zstd"
+    return "none"
+
+
+def open_segment(path: Path) -> TextIO:
+    """Open a (possibly compressed) segment for text reading."""
+    codec = _codec_of(path.name)
+    if codec == "gzip":
+        return gzip.open(path, "rt", encoding="utf-8", errors="ignore")
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed")
+        raw = zstandard.ZstdDecompressor().stream_reader(path.open("rb"), closefd=True)
+        return io.TextIOWrapper(raw, encoding="utf-8", errors="ignore")
+    return path.open("r", encoding="utf-8", errors="ignore")
+
+
+class ObsRotator:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        archive_dir: Optional[Path] = None,
+        max_bytes: Optional[int] = None,
+        max_age_s: Optional[float] = None,
+        compress: Optional[str] = None,
+        keep_segments: Optional[int] = None,
+        keep_days: Optional[float] = None,
+        check_interval_s: Optional[float] = None,
+        grace_s: float = 5.0,
+    ) -> None:
+        self.path = Path(path)
+        self.archive_dir = Path(archive_dir) if archive_dir else self.path.parent / "live_obs_segments"
+        self.manifest_path = self.path.with_name(self.path.stem + ".manifest.json")
+        mb = _env_float("OPS_OBS_ROTATE_MB", 64.0) if max_bytes is None else max_bytes / (1 << 20)
+        self.max_bytes = int(mb * (1 << 20)) if mb > 0 else 0
+        self.max_age_s = float(_env_float("OPS_OBS_ROTATE_SEC", 86400.0) if max_age_s is None else max_age_s)
+        codec = (compress or os.getenv("OPS_OBS_COMPRESS", "gzip")).strip().lower()
+        if codec in ("gz", "1", "true"):
+            codec = "gzip"
+        if codec == "zstd" and zstandard is None:
+            log.info("obs_rotation: zstandard not installed; compressing with gzip")
+            codec = "gzip"
+        self.codec = codec if codec in _SUFFIX else "gzip"
+        self.keep_segments = max(1, int(keep_segments or _env_float("OPS_OBS_KEEP_SEGMENTS", 48)))
+        self.keep_days = float(_env_float("OPS_OBS_KEEP_DAYS", 14.0) if keep_days is None else keep_days)
+        self.check_interval_s = max(0.5, float(check_interval_s or _env_float("OPS_OBS_ROTATE_CHECK_SEC", 5.0)))
+        self.grace_s = float(grace_s)
+
+        self.rotations = 0
+        self._segments: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._active_ident: Optional[tuple] = None
+        self._active_since_ms: Optional[int] = None
+
+    # --- manifest --------------------------------------------------------------
+
+    def load(self) -> None:
+        """Read the manifest and reconcile it with the archive directory."""
+        segs: List[Dict[str, Any]] = []
+        try:
+            if self.manifest_path.exists():
+                data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+                segs = [s for s in data.get("segments") or [] if isinstance(s, dict) and s.get("file")]
+        except Exception:
+            log.exception("obs_rotation: unreadable manifest %s", self.manifest_path)
+        try:
+            on_disk = {p.name for p in self.archive_dir.glob("live_obs_*.jsonl*")} if self.archive_dir.exists() else set()
+        except Exception:
+            on_disk = set()
+        segs = [s for s in segs if s["file"] in on_disk]
+        known = {s["file"] for s in segs}
+        # renamed but never recorded (crash between rename and manifest write)
+        for name in sorted(on_disk - known):
+            if name.endswith(".tmp"):
+                # interrupted compaction; the raw segment is still there
+                (self.archive_dir / name).unlink(missing_ok=True)
+                continue
+            segs.append({"file": name, "codec": _codec_of(name), "closed_ms": None, "reason": "recovered"})
+        segs.sort(key=lambda s: s["file"])
+        with self._lock:
+            self._segments = segs
+        self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        with self._lock:
+            doc = {
+                "version": MANIFEST_VERSION,
+                "active": self.path.name,
+                "archive_dir": str(self.archive_dir),
+                "updated_ms": int(time.time() * 1000),
+                "segments": [dict(s) for s in self._segments],
+            }
+        tmp = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(doc, ensure_ascii=False, indent=1), encoding="utf-8")
+            os.replace(tmp, self.manifest_path)
+        except Exception:
+            log.exception("obs_rotation: manifest write failed %s", self.manifest_path)
+
+    def manifest(self) -> Dict[str, Any]:
+        with self._lock:
+            segs = [dict(s) for s in self._segments]
+        return {"version": MANIFEST_VERSION, "active": self.path.name, "segments": segs}
+
+    # --- rotation --------------------------------------------------------------
+
+    def _active_age_s(self, st: os.stat_result) -> float:
+        ident = (st.st_dev, st.st_ino)
+        if ident != self._active_ident:
+            self._active_ident = ident
+            self._active_since_ms = None
+            try:
+                with self.path.open("r", encoding="utf-8", errors="ignore") as f:
+                    self._active_since_ms = _line_ts_ms(f.readline())
+            except Exception:
+                pass
+            if self._active_since_ms is None:
+                self._active_since_ms = int(time.time() * 1000)
+        return max(0.0, time.time() - self._active_since_ms / 1000.0)
+
+    def due(self) -> Optional[str]:
+        """Reason the live file should roll over now ("size"/"age"), else None."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        if st.st_size == 0:
+            return None
+        if self.max_bytes and st.st_size >= self.max_bytes:
+            return "size"
+        if self.max_age_s > 0 and self._active_age_s(st) >= self.max_age_s:
+            return "age"
+        return None
+
+    def rotate(self, reason: str = "manual") -> Optional[Path]:
+        """Move the live file into the archive; returns the segment path."""
+        try:
+            if not self.path.exists() or self.path.stat().st_size == 0:
+                return None
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            dest = self.archive_dir / f"live_obs_{stamp}.jsonl"
+            n = 1
+            while any(dest.with_name(dest.name + sfx).exists() for sfx in _SUFFIX.values()):
+                dest = self.archive_dir / f"live_obs_{stamp}_{n}.jsonl"
+                n += 1
+            os.replace(self.path, dest)
+        except Exception as exc:
+            # e.g. Windows: another process holds the file open; retry next check
+            log.warning("obs_rotation: rotate failed (%s): %s", reason, exc)
+            return None
+        self.rotations += 1
+        self._active_ident = None
+        entry = {"file": dest.name, "codec": "none", "closed_ms": int(time.time() * 1000), "reason": reason}
+        with self._lock:
+            self._segments.append(entry)
+        self._write_manifest()
+        log.info("obs_rotation: rotated %s -> %s (%s)", self.path.name, dest.name, reason)
+        return dest
+
+    # --- compaction / retention ------------------------------------------------
+
+    def _finalize(self, entry: Dict[str, Any]) -> None:
+        """Scan a closed raw segment for stats and compress it (worker thread)."""
+        src = self.archive_dir / entry["file"]
+        codec = self.codec
+        dest = src.with_name(src.name + _SUFFIX[codec])
+        tmp = dest.with_name(dest.name + ".tmp")
+        lines = 0
+        first_ms = last_ms = None
+        last_line = None
+        st = src.stat()
+        out = None
+        try:
+            if codec == "gzip":
+                out = gzip.open(tmp, "wb", compresslevel=6)
+            elif codec == "zstd":
+                out = zstandard.ZstdCompressor(level=3).stream_writer(tmp.open("wb"), closefd=True)
+            with src.open("rb") as f:
+                for raw in f:
+                    if out is not None:
+                        out.write(raw)
+                    if not raw.strip():
+                        continue
+                    lines += 1
+                    last_line = raw.decode("utf-8", errors="ignore").strip()
+                    ms = _line_ts_ms(last_line)
+                    if ms is not None:
+                        first_ms = ms if first_ms is None else first_ms
+                        last_ms = ms
+        except Exception:
+            if out is not None:
+                out.close()
+                tmp.unlink(missing_ok=True)
+            raise
+        if out is not None:
+            out.close()
+            os.replace(tmp, dest)
+            src.unlink()
+        entry.update({
+            "file": dest.name,
+            "codec": codec,
+            "lines": lines,
+            "first_ts_ms": first_ms,
+            "last_ts_ms": last_ms,
+            "last_line": last_line,
+            "bytes": st.st_size,
+            "stored_bytes": dest.stat().st_size,
+            "closed_ms": entry.get("closed_ms") or int(st.st_mtime * 1000),
+        })
+
+    def compact(self) -> int:
+        """Finalize quiet raw segments and apply retention (blocking)."""
+        now = time.time()
+        with self._lock:
+            pending = [s for s in self._segments if "lines" not in s]
+        done = 0
+        for entry in pending:
+            src = self.archive_dir / entry["file"]
+            try:
+                if now - src.stat().st_mtime < self.grace_s:
+                    continue
+                self._finalize(entry)
+                done += 1
+            except Exception:
+                log.exception("obs_rotation: compaction failed %s", src)
+        dropped = self._apply_retention()
+        if done or dropped:
+            self._write_manifest()
+        return done
+
+    def _apply_retention(self) -> int:
+        cutoff_ms = int((time.time() - self.keep_days * 86400) * 1000) if self.keep_days > 0 else None
+        with self._lock:
+            doomed = self._segments[: max(0, len(self._segments) - self.keep_segments)]
+            if cutoff_ms is not None:
+                doomed += [
+                    s for s in self._segments[len(doomed):]
+                    if "lines" in s and (s.get("last_ts_ms") or s.get("closed_ms") or cutoff_ms) < cutoff_ms
+                ]
+            names = {s["file"] for s in doomed}
+            self._segments = [s for s in self._segments if s["file"] not in names]
+        for s in doomed:
+            try:
+                (self.archive_dir / s["file"]).unlink()
+            except FileNotFoundError:
+                pass
+            except Exception:
+                log.warning("obs_rotation: could not delete %s", s["file"])
+        return len(doomed)
+
+    async def run(self) -> None:
+        """Background loop (after load()): rotate when due, then compact off the event loop."""
+        try:
+            while True:
+                try:
+                    reason = self.due()
+                    if reason:
+                        self.rotate(reason)
+                    await asyncio.to_thread(self.compact)
+                except Exception:
+                    log.exception("obs_rotation: check failed")
+                await asyncio.sleep(self.check_interval_s)
+        except asyncio.CancelledError:
+            return
+
+    # --- reads -----------------------------------------------------------------
+
+    def segments_for(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> List[Path]:
+        """Archived segment paths (oldest first) that may hold lines in [start_ms, end_ms]."""
+        out: List[Path] = []
+        with self._lock:
+            segs = list(self._segments)
+        for s in segs:
+            first, last = s.get("first_ts_ms"), s.get("last_ts_ms")
+            if start_ms is not None and last is not None and last < start_ms:
+                continue
+            if end_ms is not None and first is not None and first > end_ms:
+                continue
+            out.append(self.archive_dir / s["file"])
+        return out
+
+    def lines_in_range(self, start_ms: int, end_ms: int, limit: int) -> List[str]:
+        """Newest `limit` lines with start_ms <= ts <= end_ms, oldest first.
+
+        Works newest-first: the live file and raw (not yet compacted)
+        segments are read backwards and abandoned at the first line older
+        than start_ms; compressed segments are opened only when their
+        manifest first/last ts overlap the window. Reading stops as soon as
+        `limit` lines are collected.
+        """
+        limit = max(1, int(limit))
+        out: List[str] = []  # newest first
+        with self._lock:
+            segs = list(self._segments)
+        sources = [(self.path, None)] + [(self.archive_dir / s["file"], s) for s in reversed(segs)]
+        for path, seg in sources:
+            if seg is not None:
+                first, last = seg.get("first_ts_ms"), seg.get("last_ts_ms")
+                if "lines" not in seg:
+                    last = seg.get("closed_ms")
+                if last is not None and last < start_ms:
+                    break  # segments are in write order: the rest is older still
+                if first is not None and first > end_ms:
+                    continue
+            try:
+                if _codec_of(path.name) == "none":
+                    done = self._collect_reverse(path, start_ms, end_ms, limit, out)
+                else:
+                    done = self._collect_forward(path, start_ms, end_ms, limit, out)
+            except FileNotFoundError:
+                continue
+            except Exception:
+                log.warning("obs_rotation: unreadable segment %s", path)
+                continue
+            if done:
+                break
+        out.reverse()
+        return out
+
+    @staticmethod
+    def _collect_reverse(path: Path, start_ms: int, end_ms: int, limit: int, out: List[str]) -> bool:
+        """Uncompressed file, newest line first; True once the window or limit is exhausted."""
+        for line in iter_lines_reverse(path):
+            ms = _line_ts_ms(line)
+            if ms is None or ms > end_ms:
+                continue
+            if ms < start_ms:
+                return True
+            out.append(line.strip())
+            if len(out) >= limit:
+                return True
+        return False
+
+    @staticmethod
+    def _collect_forward(path: Path, start_ms: int, end_ms: int, limit: int, out: List[str]) -> bool:
+        """Compressed segment (forward only): keep its newest matching lines."""
+        keep: deque = deque(maxlen=limit - len(out))
+        reached_start = False
+        with open_segment(path) as f:
+            for line in f:
+                ms = _line_ts_ms(line)
+                if ms is None:
+                    continue
+                if ms < start_ms:
+                    reached_start = True
+                elif ms <= end_ms:
+                    keep.append(line.strip())
+        out.extend(reversed(keep))
+        return reached_start or len(out) >= limit
+
+    def last_archived_line(self) -> Optional[str]:
+        """Last line of the newest archived segment (state carried across a rotation).
+
+        Raw segments are read backwards; compressed ones answer from the
+        `last_line` recorded at compaction. Only entries from an older
+        manifest are decompressed, once, and the result is recorded.
+        """
+        with self._lock:
+            segs = list(self._segments)
+        for s in reversed(segs):
+            path = self.archive_dir / s["file"]
+            try:
+                if s.get("codec", "none") == "none":
+                    last = find_last(path, lambda ln: bool(ln.strip()))
+                    last = last.strip() if last else None
+                elif "last_line" in s:
+                    last = s["last_line"]
+                else:
+                    last = None
+                    with open_segment(path) as f:
+                        for line in f:
+                            if line.strip():
+                                last = line.strip()
+                    with self._lock:
+                        s["last_line"] = last
+                    self._write_manifest()
+            except Exception:
+                continue
+            if last:
+                return last
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            segs = list(self._segments)
+        try:
+            live_bytes = self.path.stat().st_size
+        except OSError:
+            live_bytes = 0
+        return {
+            "live_bytes": live_bytes,
+            "segments": len(segs),
+            "archived_bytes": sum(int(s.get("stored_bytes") or 0) for s in segs),
+            "pending_compaction": sum(1 for s in segs if "lines" not in s),
+            "rotations": self.rotations,
+            "codec": self.codec,
+        }
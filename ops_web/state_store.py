@@ -0,0 +1,254 @@
+"""
+In-memory engine / positions state behind /api/state/engine,
+/api/state/positions and /api/ops/evergreen/status.
+
+Fed by a bus tap (loop thread, O(1) per event):
+- engine_state              -> engine counters / uptime / kill flags
+- position_snapshot         -> latest position per symbol (qty 0 removes it)
+- fill / fills / order_fill -> applied to the symbol's position (qty, avg entry)
+- guardrail_update, kill_switch_transition -> kill flags
+- live_obs / run_metrics counters (event_published, event_consumed, ...)
+- any runtime event refreshes the evergreen heartbeat
+
+Each view keeps a version; its JSON body and ETag are rendered once per
+version (plus the stale flag, which only depends on the heartbeat age), so
+polling is a dict lookup and If-None-Match polls get a 304.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import uuid
+from collections.abc import Mapping
+from typing import Any, Dict, Optional, Tuple
+
+from ops_web.bus import EventEnvelope
+
+VIEWS = ("engine", "positions", "evergreen")
+FILL_TYPES = frozenset({"fill", "fills", "order_fill", "trade_fill"})
+_COUNTER_KEYS = {
+    "event_published": "published",
+    "published": "published",
+    "event_consumed": "consumed",
+    "consumed": "consumed",
+    "event_queue_depth": "pending_total",
+    "pending_total": "pending_total",
+    "processed_events": "processed_events",
+}
+
+
+def _num(val: Any, default: float = 0.0) -> float:
+    try:
+        return float(val)
+    except Exception:
+        return default
+
+
+def _count(val: Any) -> float:
+    n = _num(val)
+    return int(n) if n.is_integer() else n
+
+
+def _ts_ms(val: Any) -> Optional[int]:
+    if val is None or val == "":
+        return None
+    try:
+        ts = float(val)
+    except Exception:
+        return None
+    return int(ts * 1000.0) if ts < 10_000_000_000 else int(ts)
+
+
+class StateStore:
+    def __init__(self, *, stale_after_s: Optional[float] = None) -> None:
+        if stale_after_s is None:
+            try:
+                stale_after_s = float(os.getenv("OPS_STATE_STALE_SEC", "30"))
+            except Exception:
+                stale_after_s = 30.0
+        self.stale_after_s = float(stale_after_s)
+        self._boot = uuid.uuid4().hex[:8]
+        self._engine: Dict[str, Any] = {
+            "kill_switch_on": False,
+            "risk_type": None,
+            "reason": None,
+            "uptime_sec": 0,
+            "processed_events": 0,
+            "published": 0,
+            "consumed": 0,
+            "pending_total": 0,
+            "last_heartbeat_ts": None,
+        }
+        self._positions: Dict[str, Dict[str, Any]] = {}
+        self._fills = 0
+        self._last_fill: Optional[Dict[str, Any]] = None
+        self._heartbeat_ms: Optional[int] = None
+        self._runtime_seen = False
+        self._versions: Dict[str, int] = {v: 0 for v in VIEWS}
+        self._rendered: Dict[str, Tuple[Any, bytes, str]] = {}
+
+    # --- ingest --------------------------------------------------------------
+
+    def _bump(self, *views: str) -> None:
+        for v in views:
+            self._versions[v] += 1
+
+    def record(self, env: EventEnvelope) -> None:
+        """Bus tap (loop thread)."""
+        ev = env.event
+        if not isinstance(ev, Mapping):
+            return
+        etype = ev.get("type") or ev.get("event_type")
+        data = ev.get("data") if isinstance(ev.get("data"), Mapping) else ev
+        ts = _ts_ms(ev.get("ts")) or env.recv_ms
+
+        if etype == "engine_state":
+            self._apply_engine(data, ts)
+        elif etype == "position_snapshot":
+            self._apply_position(data, ts)
+        elif etype in FILL_TYPES:
+            self._apply_fill(data, ts)
+        elif etype in ("guardrail_update", "kill_switch_transition"):
+            self._apply_kill(data)
+        elif any(k in data for k in ("event_published", "event_consumed", "event_queue_depth")):
+            self._apply_counters(data)
+
+        if ev.get("source") == "runtime" or etype in ("engine_state", "ws_heartbeat", "run_metrics"):
+            self._heartbeat_ms = ts
+            if ev.get("source") == "runtime" or etype == "engine_state":
+                self._runtime_seen = True
+            self._bump("evergreen")
+
+    def _apply_engine(self, data: Mapping[str, Any], ts: Optional[int]) -> None:
+        eng = self._engine
+        if "kill_switch_on" in data or "kill_switch" in data:
+            eng["kill_switch_on"] = bool(data.get("kill_switch_on", data.get("kill_switch")) is True)
+        for key in ("risk_type", "reason"):
+            if key in data:
+                eng[key] = data.get(key) or None
+        if "uptime_sec" in data:
+            eng["uptime_sec"] = _num(data.get("uptime_sec"))
+        for src, dst in _COUNTER_KEYS.items():
+            if src in data:
+                eng[dst] = _count(data.get(src))
+        eng["last_heartbeat_ts"] = ts
+        self._bump("engine", "evergreen")
+
+    def _apply_counters(self, data: Mapping[str, Any]) -> None:
+        eng = self._engine
+        changed = False
+        for src, dst in _COUNTER_KEYS.items():
+            if src in data:
+                val = _count(data.get(src))
+                if eng.get(dst) != val:
+                    eng[dst] = val
+                    changed = True
+        if changed:
+            self._bump("engine")
+
+    def _apply_kill(self, data: Mapping[str, Any]) -> None:
+        eng = self._engine
+        on = bool(data.get("kill_switch") is True)
+        reason = data.get("reason") or None
+        risk_type = data.get("risk_type", eng["risk_type"]) if on else None
+        if (eng["kill_switch_on"], eng["reason"], eng["risk_type"]) != (on, reason, risk_type):
+            eng["kill_switch_on"], eng["reason"], eng["risk_type"] = on, reason, risk_type
+            self._bump("engine")
+
+    def _apply_position(self, data: Mapping[str, Any], ts: Optional[int]) -> None:
+        symbol = str(data.get("symbol") or "")
+        if not symbol:
+            return
+        qty = _num(data.get("qty"))
+        if qty == 0:
+            if self._positions.pop(symbol, None) is not None:
+                self._bump("positions")
+            return
+        self._positions[symbol] = {
+            "symbol": symbol,
+            "qty": qty,
+            "avg_entry_price": _num(data.get("avg_entry_price")),
+            "mark_price": _num(data.get("mark_price", data.get("current_price"))),
+            "pnl": _num(data.get("pnl", data.get("position_pnl"))),
+            "ts": ts,
+        }
+        self._bump("positions")
+
+    def _apply_fill(self, data: Mapping[str, Any], ts: Optional[int]) -> None:
+        symbol = str(data.get("symbol") or "")
+        qty = abs(_num(data.get("qty", data.get("filled_qty"))))
+        price = _num(data.get("price"))
+        if not symbol or qty == 0:
+            return
+        signed = -qty if str(data.get("side") or "").upper() in ("SELL", "SHORT") else qty
+        pos = self._positions.get(symbol)
+        cur = pos["qty"] if pos else 0.0
+        new = cur + signed
+        if abs(new) < 1e-12:
+            self._positions.pop(symbol, None)
+        else:
+            if pos is None:
+                pos = self._positions[symbol] = {
+                    "symbol": symbol, "qty": 0.0, "avg_entry_price": 0.0,
+                    "mark_price": price, "pnl": 0.0, "ts": ts,
+                }
+            if cur == 0 or (cur > 0) != (new > 0):
+                # opened or flipped: the fill price is the new entry
+                pos["avg_entry_price"] = price
+            elif abs(new) > abs(cur):
+                pos["avg_entry_price"] = (pos["avg_entry_price"] * abs(cur) + price * qty) / abs(new)
+            pos["qty"] = new
+            pos["mark_price"] = price or pos["mark_price"]
+            pos["pnl"] = (pos["mark_price"] - pos["avg_entry_price"]) * new
+            pos["ts"] = ts
+        self._fills += 1
+        self._last_fill = {"symbol": symbol, "side": data.get("side"), "qty": qty, "price": price, "ts": ts}
+        self._bump("positions", "engine")
+
+    # --- views ---------------------------------------------------------------
+
+    def _stale(self) -> bool:
+        hb = self._heartbeat_ms
+        return hb is None or (time.time() * 1000 - hb) > self.stale_after_s * 1000
+
+    def _build(self, view: str, stale: bool) -> Dict[str, Any]:
+        if view == "engine":
+            body = dict(self._engine)
+            body["running"] = self._runtime_seen and not stale
+            body["fills_total"] = self._fills
+            body["last_fill"] = self._last_fill
+            return body
+        if view == "positions":
+            positions = [self._positions[s] for s in sorted(self._positions)]
+            as_of = max((p["ts"] or 0 for p in positions), default=0)
+            return {"positions": positions, "timestamp": as_of or None}
+        if not self._runtime_seen and self._heartbeat_ms is None:
+            return {"status": "OK", "uptime_sec": 0, "last_heartbeat_ts": None, "mode": "DEV"}
+        return {
+            "status": "STALE" if stale else "OK",
+            "uptime_sec": self._engine["uptime_sec"],
+            "last_heartbeat_ts": self._heartbeat_ms,
+            "mode": "LIVE" if self._runtime_seen else "DEV",
+        }
+
+    def render(self, view: str) -> Tuple[bytes, str]:
+        """(JSON body, ETag) for a view; rebuilt only when its state changed."""
+        stale = self._stale() if view in ("engine", "evergreen") else False
+        key = (self._versions[view], stale)
+        hit = self._rendered.get(view)
+        if hit is not None and hit[0] == key:
+            return hit[1], hit[2]
+        body = json.dumps(self._build(view, stale), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        etag = f'"{view}-{self._boot}-{key[0]}{"s" if stale else ""}"'
+        self._rendered[view] = (key, body, etag)
+        return body, etag
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "positions": len(self._positions),
+            "fills": self._fills,
+            "versions": dict(self._versions),
+            "last_heartbeat_ts": self._heartbeat_ms,
+        }
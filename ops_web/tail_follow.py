@@ -0,0 +1,365 @@
+"""
+Incremental tail-follow reader for append-only JSONL files (live_obs.jsonl).
+
+- Keeps a byte offset and reads only newly appended bytes
+- Buffers a partial trailing line until its newline arrives
+- Detects rotation (path now points at a different inode) and truncation
+  (size < offset); on POSIX the old handle is drained before switching
+- Wakes on inotify (Linux, via ctypes on the parent directory) and falls
+  back to polling everywhere else
+
+`start_at_end` only applies to a file that already exists on the first
+read; a file that appears later is read from its first byte.
+
+On Windows the file is not held open between reads so writers can still
+rename/rotate it. The cost: there is no handle to drain on rotation, so
+lines appended after the last poll and before the rename (at most one poll
+interval) are not read from the old file.
+
+Also: `iter_lines_reverse` / `tail_lines` / `find_last`, a reverse block
+reader that seeks from the end in fixed-size chunks and yields lines
+newest-first, so "last N lines" and "last line matching X" cost depends
+on the tail that is read, not on the file size.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+from pathlib import Path
+from itertools import islice
+from typing import AsyncIterator, Callable, Iterator, List, Optional, Set, Tuple
+
+log = logging.getLogger("ops_web")
+
+_KEEP_OPEN = os.name != "nt"
+
+# inotify(7) constants
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT_HDR = struct.Struct("iIII")
+
+REVERSE_BLOCK = 64 * 1024
+
+
+def iter_lines_reverse_at(
+    path: Path,
+    end: Optional[int] = None,
+    *,
+    block_size: int = REVERSE_BLOCK,
+) -> Iterator[Tuple[int, str]]:
+    """Yield (start_offset, line) newest-first for the bytes before `end` (default EOF).
+
+    Reads backwards `block_size` bytes at a time; a line split across
+    blocks is carried over, so multi-byte characters are never cut. Stop
+    iterating (or close the generator) to stop reading. A line's
+    start_offset is a valid `end` to continue from (pagination).
+    """
+    block_size = max(1, int(block_size))
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        pos = size if end is None else max(0, min(int(end), size))
+        carry = b""
+        at_eof = True
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + carry
+            parts = chunk.split(b"\n")
+            carry = parts[0]
+            line_end = pos + len(chunk)
+            for raw in reversed(parts[1:]):
+                start = line_end - len(raw)
+                line_end = start - 1
+                if at_eof:
+                    at_eof = False
+                    if not raw:
+                        # the trailing newline, not an empty last line
+                        continue
+                yield start, raw.rstrip(b"\r").decode("utf-8", errors="ignore")
+        if carry or not at_eof:
+            yield 0, carry.rstrip(b"\r").decode("utf-8", errors="ignore")
+
+
+def iter_lines_reverse(path: Path, *, block_size: int = REVERSE_BLOCK) -> Iterator[str]:
+    """Yield the lines of `path` newest-first (without line endings)."""
+    for _start, line in iter_lines_reverse_at(path, block_size=block_size):
+        yield line
+
+
+def tail_lines(path: Path, n: int, *, block_size: int = REVERSE_BLOCK) -> List[str]:
+    """Last `n` lines of `path`, oldest first."""
+    lines = list(islice(iter_lines_reverse(path, block_size=block_size), max(0, int(n))))
+    lines.reverse()
+    return lines
+
+
+def find_last(
+    path: Path,
+    predicate: Callable[[str], bool],
+    *,
+    max_lines: Optional[int] = None,
+    block_size: int = REVERSE_BLOCK,
+) -> Optional[str]:
+    """Newest line satisfying `predicate`, looking at most `max_lines` back."""
+    for line in islice(iter_lines_reverse(path, block_size=block_size), max_lines):
+        if predicate(line):
+            return line
+    return None
+
+
+class _DirWatch:
+    """Minimal inotify watch on a directory; sets an asyncio.Event on activity.
+
+    With `name` only events for that entry count; with name=None every
+    event counts and the touched entry names collect in `changed`
+    (`overflowed` is set when the kernel queue overflowed and names were lost).
+    """
+
+    def __init__(self, directory: Path, name: Optional[str]) -> None:
+        self.fd = -1
+        self.name = name.encode() if name is not None else None
+        self.event = asyncio.Event()
+        self.changed: Set[str] = set()
+        self.overflowed = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(fd, os.fsencode(str(directory)), _IN_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, f"inotify_add_watch failed: {directory}")
+        self.fd = fd
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(fd, self._on_readable)
+
+    def _on_readable(self) -> None:
+        hit = False
+        try:
+            while True:
+                buf = os.read(self.fd, 64 * 1024)
+                if not buf:
+                    break
+                off = 0
+                while off + _EVENT_HDR.size <= len(buf):
+                    _wd, mask, _cookie, ln = _EVENT_HDR.unpack_from(buf, off)
+                    name = buf[off + _EVENT_HDR.size: off + _EVENT_HDR.size + ln].rstrip(b"\0")
+                    off += _EVENT_HDR.size + ln
+                    if mask & _IN_Q_OVERFLOW:
+                        self.overflowed = True
+                        hit = True
+                    elif self.name is None:
+                        if name:
+                            self.changed.add(os.fsdecode(name))
+                        hit = True
+                    elif name == self.name:
+                        hit = True
+        except BlockingIOError:
+            pass
+        except Exception:
+            self.overflowed = True
+            hit = True
+        if hit:
+            self.event.set()
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            try:
+                if self._loop is not None:
+                    self._loop.remove_reader(self.fd)
+            except Exception:
+                pass
+            try:
+                os.close(self.fd)
+            except Exception:
+                pass
+            self.fd = -1
+
+
+class TailFollower:
+    """Follow `path` and yield complete new lines in write order."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        start_at_end: bool = True,
+        poll_interval_s: Optional[float] = None,
+        use_inotify: Optional[bool] = None,
+        max_read_bytes: int = 1 << 20,
+    ) -> None:
+        self.path = Path(path)
+        self.start_at_end = bool(start_at_end)
+        if poll_interval_s is None:
+            try:
+                poll_interval_s = float(os.getenv("OPS_TAIL_POLL_SEC", "0.25"))
+            except Exception:
+                poll_interval_s = 0.25
+        self.poll_interval_s = max(0.01, float(poll_interval_s))
+        if use_inotify is None:
+            use_inotify = os.getenv("OPS_TAIL_INOTIFY", "1") == "1"
+        self.use_inotify = bool(use_inotify) and os.name == "posix"
+        self.max_read_bytes = int(max_read_bytes)
+
+        self.offset = 0
+        self.rotations = 0
+        self.truncations = 0
+        self._fh = None
+        self._ident: Optional[Tuple[int, int]] = None
+        self._buf = b""
+        self._first_open = True
+        self._watch: Optional[_DirWatch] = None
+        self._watch_failed = False
+
+    # --- reading -----------------------------------------------------------
+
+    def _stat_ident(self) -> Optional[Tuple[Tuple[int, int], int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino), st.st_size
+
+    def _open(self, ident: Tuple[int, int]) -> bool:
+        try:
+            fh = open(self.path, "rb")
+        except OSError:
+            return False
+        st = os.fstat(fh.fileno())
+        if (st.st_dev, st.st_ino) != ident:
+            # replaced between stat and open: pick it up on the next pass
+            fh.close()
+            return False
+        self._fh = fh
+        self._ident = ident
+        if self._first_open and self.start_at_end:
+            self.offset = st.st_size
+        self._first_open = False
+        fh.seek(self.offset)
+        return True
+
+    def _close_fh(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except Exception:
+                pass
+            self._fh = None
+
+    def _drain(self, out: List[bytes]) -> None:
+        fh = self._fh
+        if fh is None:
+            return
+        while True:
+            chunk = fh.read(self.max_read_bytes)
+            if not chunk:
+                break
+            self.offset += len(chunk)
+            data = self._buf + chunk
+            parts = data.split(b"\n")
+            self._buf = parts.pop()
+            out.extend(parts)
+
+    def read_new(self) -> List[str]:
+        """Return complete lines appended since the last call (may be empty)."""
+        out: List[bytes] = []
+        cur = self._stat_ident()
+        if cur is not None and self._ident is not None and cur[0] != self._ident:
+            # rotated: finish the old file first (POSIX keeps the handle; on
+            # Windows it was closed after the last poll, see module docstring)
+            self._drain(out)
+            if self._buf.strip():
+                out.append(self._buf)
+            self._buf = b""
+            self._close_fh()
+            self._ident = None
+            self.offset = 0
+            self.rotations += 1
+        elif cur is not None and self._ident is not None and cur[1] < self.offset:
+            # truncated in place
+            self._close_fh()
+            self._ident = None
+            self._buf = b""
+            self.offset = 0
+            self.truncations += 1
+
+        if cur is not None:
+            if self._fh is None:
+                if self._ident is None or self._ident == cur[0]:
+                    self._open(cur[0])
+            self._drain(out)
+        elif self._first_open:
+            # missing on the first read: when it appears, every line is new
+            self._first_open = False
+        if not _KEEP_OPEN:
+            self._close_fh()
+
+        return [ln.decode("utf-8", errors="ignore").strip() for ln in out if ln.strip()]
+
+    # --- waiting -----------------------------------------------------------
+
+    def _ensure_watch(self) -> None:
+        if self._watch is not None or self._watch_failed or not self.use_inotify:
+            return
+        directory = self.path.parent
+        if not directory.exists():
+            return
+        try:
+            self._watch = _DirWatch(directory, self.path.name)
+        except Exception as exc:
+            self._watch_failed = True
+            log.info("tail_follow: inotify unavailable (%s); polling every %.2fs", exc, self.poll_interval_s)
+
+    async def wait(self) -> None:
+        """Sleep until the file may have changed (inotify) or the poll interval elapses."""
+        self._ensure_watch()
+        if self._watch is None:
+            await asyncio.sleep(self.poll_interval_s)
+            return
+        ev = self._watch.event
+        try:
+            # long safety timeout in case an event is missed
+            await asyncio.wait_for(ev.wait(), timeout=max(2.0, self.poll_interval_s))
+        except asyncio.TimeoutError:
+            pass
+        ev.clear()
+
+    async def follow(self) -> AsyncIterator[List[str]]:
+        """Yield each non-empty batch of new lines, forever."""
+        try:
+            while True:
+                try:
+                    lines = self.read_new()
+                except Exception:
+                    log.exception("tail_follow: read error path=%s", self.path)
+                    lines = []
+                if lines:
+                    yield lines
+                await self.wait()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self._close_fh()
+        if self._watch is not None:
+            self._watch.close()
+            self._watch = None
@@ -0,0 +1,100 @@
+"""
+Negotiated wire protocol for /api/ws/events.
+
+Clients pick an encoding and optional micro-batching either through the
+WebSocket subprotocol or query parameters; plain JSON text frames, one
+event per frame, stay the default (existing Next.js dashboard).
+
+    subprotocol           query                        frames
+    (none) / ops.json     -                            JSON text, 1 event
+    ops.json.batch        ?batch_ms=20                 JSON text array
+    ops.msgpack           ?encoding=msgpack            MessagePack binary, 1 event
+    ops.msgpack.batch     ?encoding=msgpack&batch_ms=  MessagePack array
+
+A batch collects events for `batch_ms` (OPS_WS_BATCH_MS, default 20ms)
+after the first one, up to OPS_WS_BATCH_MAX events. MessagePack needs the
+optional `msgpack` package; without it the server falls back to JSON.
+permessage-deflate is negotiated by the ASGI server itself (uvicorn with
+the websockets implementation enables it by default).
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from dataclasses import dataclass
+from typing import Mapping, Optional, Sequence, Union
+
+from ops_web.bus import EventEnvelope, msgpack
+
+SUBPROTOCOLS = {
+    "ops.json": ("json", False),
+    "ops.json.batch": ("json", True),
+    "ops.msgpack": ("msgpack", False),
+    "ops.msgpack.batch": ("msgpack", True),
+}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)))
+    except Exception:
+        return default
+
+
+@dataclass(frozen=True)
+class WsProtocol:
+    encoding: str = "json"          # json | msgpack
+    batch_ms: float = 0.0           # 0 = one event per frame
+    batch_max: int = 256
+    subprotocol: Optional[str] = None
+
+    @property
+    def batched(self) -> bool:
+        return self.batch_ms > 0
+
+    def encode(self, envs: Sequence[EventEnvelope]) -> Union[str, bytes]:
+        """One frame for a batch (or a single event when not batched)."""
+        if self.encoding == "msgpack":
+            if not self.batched:
+                return envs[0].msgpack_bytes
+            return _mp_array_header(len(envs)) + b"".join(e.msgpack_bytes for e in envs)
+        if not self.batched:
+            return envs[0].text
+        return "[" + ",".join(e.text for e in envs) + "]"
+
+
+def _mp_array_header(n: int) -> bytes:
+    if n < 16:
+        return bytes([0x90 | n])
+    if n < 0x10000:
+        return b"\xdc" + struct.pack(">H", n)
+    return b"\xdd" + struct.pack(">I", n)
+
+
+def negotiate(offered: Sequence[str], query: Mapping[str, str]) -> WsProtocol:
+    """Pick the protocol from offered subprotocols first, then query params."""
+    subprotocol = None
+    encoding = "json"
+    batched = False
+    for name in offered or ():
+        if name in SUBPROTOCOLS and (SUBPROTOCOLS[name][0] != "msgpack" or msgpack is not None):
+            subprotocol = name
+            encoding, batched = SUBPROTOCOLS[name]
+            break
+    if subprotocol is None:
+        encoding = str(query.get("encoding") or "json").lower()
+        batched = "batch_ms" in query
+
+    default_ms = _env_float("OPS_WS_BATCH_MS", 20.0)
+    batch_ms = 0.0
+    if batched:
+        try:
+            batch_ms = float(query.get("batch_ms") or default_ms)
+        except Exception:
+            batch_ms = default_ms
+        batch_ms = min(max(batch_ms, 1.0), 1000.0)
+    if encoding != "msgpack" or msgpack is None:
+        encoding = "json"
+    batch_max = max(1, int(_env_float("OPS_WS_BATCH_MAX", 256)))
+    return WsProtocol(encoding=encoding, batch_ms=batch_ms, batch_max=batch_max, subprotocol=subprotocol)
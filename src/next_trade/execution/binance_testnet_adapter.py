@@ -10,13 +10,14 @@ Real order placement via Binance Testnet REST API.
 from __future__ import annotations
 
 import os
+import io
 import time
+import asyncio
 import uuid
 import hashlib
 import hmac
 import json
-from typing import Optional
-import random
+from typing import Optional, List, Union
 from pathlib import Path
 import json as _json
 from urllib.parse import urlencode
@@ -35,11 +36,19 @@ from next_trade.execution.exchange_adapter import (
     ExchangeRejectReason,
     ExchangeHealth,
 )
+from next_trade.execution.http_transport import AsyncHttpTransport
+from next_trade.execution.connection_pool import get_shared_pool
+from next_trade.execution.fault_injection import FaultDecision, FaultInjector
+from next_trade.execution.rate_limiter import get_rate_governor
+from next_trade.execution.request_scheduler import RequestPriority, get_request_scheduler
 from next_trade.core.logging import get_logger
 from next_trade.config.network_mode import REST_BASE, enforce_testnet_lock, assert_not_spot_base
 from next_trade.runtime.latency_tracker import LatencyTracker
-from next_trade.runtime.run_artifacts import ensure_metrics, write_metrics, get_paths_for_run
-from next_trade.runtime.run_context import append_jsonl, RunContext
+from next_trade.runtime.latency_sketch import WindowedLatencySketch
+from next_trade.runtime.run_context import RunContext
+from next_trade.runtime.run_config import ChaosLatencyConfig, get_run_config
+from next_trade.runtime.metrics_registry import get_metrics_registry
+from next_trade.runtime.event_journal import append_run_event
 
 logger = get_logger(__name__)
 
@@ -60,6 +69,10 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
     
     # Forbidden mainnet domains (safety net)
     MAINNET_DOMAINS = ["binance.com", "api.binance.com", "fapi.binance.com"]
+
+    # FUTURES batch endpoint accepts at most 5 orders per call
+    BATCH_ORDERS_PATH = "/fapi/v1/batchOrders"
+    BATCH_ORDERS_MAX = 5
     
     def __init__(self):
         """Initialize adapter with credentials from environment."""
@@ -81,7 +94,24 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
         # Mock mode for testing (returns fake exchange_order_id without actual HTTP call)
         self.mock_mode = os.getenv("NEXT_TRADE_EXCHANGE_MOCK", "").lower() in ("1", "true", "yes")
         self.is_mock = self.mock_mode # Guard 7 fail-closed support
+
+        # Async keep-alive transport over the shared per-host connection pool
+        # (session opened lazily on first request)
+        self.connection_pool = get_shared_pool()
+        self._transport = AsyncHttpTransport(self.connection_pool)
+        # Client-side pacing against exchange weight/order limits (shared per process)
+        self.rate_governor = get_rate_governor()
+        # Priority scheduling: cancels > risk snapshots > new orders
+        self.scheduler = get_request_scheduler()
         
+        # Batch placement: parallel chunks in flight; batch endpoint disabled
+        # after a 404/405 so later calls go straight to single orders
+        try:
+            self.batch_parallelism = int(os.getenv("NEXT_TRADE_BATCH_PARALLEL", "4"))
+        except Exception:
+            self.batch_parallelism = 4
+        self._batch_supported = True
+
         # Health Metrics
         self.last_latency_ms = 0.0
         self.error_count_5m = 0
@@ -89,18 +119,20 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
 
         # --- PHASE1 / TICKET-P1-003-HOOK: latency tracking ---
         self.lat = LatencyTracker()
+        # constant-memory sliding-window percentiles (p50/p90/p95/p99/max)
+        self.lat_sketch = WindowedLatencySketch()
         self._lat_last_flush = 0.0
         self._lat_flush_sec = 1.0
         self._lat_flush_min_samples = 5
-        # Deterministic chaos RNG (may be seeded via RunContext)
+        # Deterministic fault injection (seeded via RunContext)
         try:
-            seed = RunContext.get_seed()
+            self._chaos_seed = RunContext.get_seed()
         except Exception:
-            seed = None
-        self._rng = random.Random(seed) if seed is not None else random.Random()
-        self._chaos_cfg = None
+            self._chaos_seed = None
+        self._chaos_cfg: Optional[ChaosLatencyConfig] = None
+        self._chaos_env_cfg: Optional[ChaosLatencyConfig] = None
         self._chaos_loaded = False
-        self._chaos_injection_enabled = False
+        self._faults: Optional[FaultInjector] = None
         # dynamic kill-switch tracking
         self._dyn_over_count = 0
         self._dyn_last_threshold = None
@@ -119,8 +151,8 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
         return "BINANCE_TESTNET"
 
     def _maybe_flush_latency(self) -> None:
-        """Periodically flush p95 latency into runs/<run_id>/metrics.json.
-        Uses NEXT_TRADE_RUN_ID env var as a temporary bridge.
+        """Periodically publish p95 latency to the run metrics registry
+        (persisted to runs/<run_id>/metrics.json off the order path).
         """
         # prefer RunContext over env var (TICKET-P1-004)
         try:
@@ -132,14 +164,15 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
             return
 
         now = perf_counter()
-        if (now - self._lat_last_flush) < self._lat_flush_sec and self.lat.count() < self._lat_flush_min_samples:
+        if (now - self._lat_last_flush) < self._lat_flush_sec and self.lat_sketch.count() < self._lat_flush_min_samples:
             return
 
         try:
-            p95 = float(self.lat.p95())
-            metrics = ensure_metrics(run_id)
-            metrics["p95_api_latency_ms"] = p95
-            write_metrics(run_id, metrics)
+            p95, p99 = self.lat_sketch.quantiles([0.95, 0.99])
+            # in-memory gauges; metrics.json is written by the background writer
+            reg = get_metrics_registry(run_id)
+            reg.set_gauge("p95_api_latency_ms", float(p95))
+            reg.set_gauge("p99_api_latency_ms", float(p99))
             self._lat_last_flush = now
         except Exception:
             # never break trading because of metrics I/O
@@ -153,27 +186,19 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
             return
 
         try:
-            cfg_path = Path("runs") / run_id / "config.json"
-            policy = None
-            if cfg_path.exists():
-                try:
-                    with cfg_path.open("r", encoding="utf-8") as f:
-                        cfg = _json.load(f)
-                        policy = cfg.get("kill_switch_policy")
-                except Exception:
-                    policy = None
+            # cached; reparsed only when config.json changes
+            policy = get_run_config(run_id).kill_switch_policy
 
             # If no explicit policy, do nothing
             if not policy:
                 return
 
-            min_threshold = float(policy.get("min_threshold_ms", 300))
-            mult = float(policy.get("multiplier", 1.5))
-            consecutive = int(policy.get("consecutive", 3))
+            min_threshold = policy.min_threshold_ms
+            mult = policy.multiplier
+            consecutive = policy.consecutive
 
-            # read current p95 from metrics
-            metrics = ensure_metrics(run_id)
-            p95 = float(metrics.get("p95_api_latency_ms", 0.0) or 0.0)
+            # read current p95 from the in-memory metrics registry
+            p95 = float(get_metrics_registry(run_id).get("p95_api_latency_ms", 0.0) or 0.0)
 
             if p95 <= 0.0:
                 threshold = min_threshold
@@ -186,8 +211,7 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
                 self._dyn_over_count += 1
                 # append event
                 try:
-                    paths = get_paths_for_run(run_id)
-                    append_jsonl(paths["events"], {"event": "P1-007_latency_over", "count": self._dyn_over_count, "lat_ms": lat_ms, "threshold_ms": threshold})
+                    append_run_event(run_id, {"event": "P1-007_latency_over", "count": self._dyn_over_count, "lat_ms": lat_ms, "threshold_ms": threshold})
                 except Exception:
                     pass
 
@@ -230,84 +254,125 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
             # never let guard logic break trading
             return
 
-    def _load_chaos_cfg(self) -> None:
-        if self._chaos_loaded:
-            return
-        self._chaos_loaded = True
-        # try to load chaos config from runs/<run_id>/config.json
+    def _load_chaos_cfg(self) -> Optional[ChaosLatencyConfig]:
+        # chaos config from runs/<run_id>/config.json (cached, hot-reloaded on change)
         try:
-            run_id = RunContext.get_run_id()
-            if run_id:
-                cfg_path = Path("runs") / run_id / "config.json"
-                if cfg_path.exists():
-                    try:
-                        with cfg_path.open("r", encoding="utf-8") as f:
-                            cfg = _json.load(f)
-                        chaos = cfg.get("chaos_latency")
-                        if isinstance(chaos, dict) and chaos.get("enabled"):
-                            self._chaos_cfg = chaos
-                            self._chaos_injection_enabled = True
-                            return
-                    except Exception:
-                        pass
+            chaos = get_run_config(RunContext.get_run_id()).chaos_latency
+            if chaos is not None:
+                return chaos
         except Exception:
             pass
 
-        # fallback to env var
+        # fallback to env var (read once per adapter)
+        if not self._chaos_loaded:
+            self._chaos_loaded = True
+            try:
+                if os.getenv("NEXT_TRADE_CHAOS_LATENCY", "0") == "1":
+                    # default chaos config
+                    self._chaos_env_cfg = ChaosLatencyConfig(
+                        enabled=True, min_ms=50, max_ms=350, rate=0.3,
+                        raw={"enabled": True, "min_ms": 50, "max_ms": 350, "rate": 0.3},
+                    )
+            except Exception:
+                pass
+        return self._chaos_env_cfg
+
+    def _fault_decision(self, method: str, url: str) -> Optional[FaultDecision]:
+        """Decide the fault (if any) for this request; None when chaos is off."""
+        try:
+            cfg = self._load_chaos_cfg()
+            if cfg is None:
+                self._chaos_cfg, self._faults = None, None
+                return None
+            # rebuild the injector only when the config object changes (reload)
+            if cfg is not self._chaos_cfg or self._faults is None:
+                self._chaos_cfg = cfg
+                self._faults = FaultInjector.from_config(cfg.raw, seed=self._chaos_seed)
+            decision = self._faults.decide(method, url)
+            if decision.kind == "none":
+                return None
+            # record event to run events.jsonl if run exists
+            try:
+                append_run_event(RunContext.get_run_id(), decision.as_event())
+            except Exception:
+                pass
+            return decision
+        except Exception:
+            # best-effort, do not break the request
+            return None
+
+    def _record_request_latency(self, ms: float) -> None:
+        """Post-request bookkeeping shared by the sync and async senders."""
         try:
-            if os.getenv("NEXT_TRADE_CHAOS_LATENCY", "0") == "1":
-                # default chaos config
-                self._chaos_cfg = {"enabled": True, "min_ms": 50, "max_ms": 350, "rate": 0.3}
-                self._chaos_injection_enabled = True
+            self.lat.record(ms)
+            self.lat_sketch.record(ms)
+            self._maybe_flush_latency()
+        except Exception:
+            # best-effort, never propagate from tracking
+            pass
+        # Evaluate dynamic kill-switch rules based on this observed latency
+        try:
+            self._maybe_dynamic_kill(ms)
         except Exception:
             pass
 
     def _send_request(self, req: Request, timeout_s: float = 10.0) -> bytes:
         """Centralized urllib.request sender with latency measurement (try/finally).
 
+        Blocking; kept for sync callers. Async adapter methods use
+        `_send_request_async`.
         Records latency in ms regardless of success or failure, and attempts a flush.
         """
-        # load chaos config once per adapter
-        self._load_chaos_cfg()
-
-        # deterministic chaos injection based on configured RNG and rate
-        try:
-            if self._chaos_injection_enabled and self._chaos_cfg:
-                rate = float(self._chaos_cfg.get("rate", 0.0))
-                if self._rng.random() < rate:
-                    min_ms = float(self._chaos_cfg.get("min_ms", 0))
-                    max_ms = float(self._chaos_cfg.get("max_ms", 0))
-                    delay_ms = float(self._rng.uniform(min_ms, max_ms))
-                    # record event to run events.jsonl if run exists
-                    try:
-                        run_id = RunContext.get_run_id()
-                        if run_id:
-                            paths = get_paths_for_run(run_id)
-                            append_jsonl(paths["events"], {"event": "chaos_latency", "delay_ms": delay_ms})
-                    except Exception:
-                        pass
-                    time.sleep(delay_ms / 1000.0)
-        except Exception:
-            # best-effort, do not break the request
-            pass
+        fault = self._fault_decision(req.get_method(), req.full_url)
 
+        # injected faults count toward observed latency (kill-switch load tests)
         start = perf_counter()
         try:
+            if fault is not None:
+                FaultInjector.apply_sync(fault, req.full_url, timeout_s)
             with urlopen(req, timeout=timeout_s) as resp:
                 return resp.read()
         finally:
-            ms = (perf_counter() - start) * 1000.0
-            try:
-                self.lat.record(ms)
-                self._maybe_flush_latency()
-            except Exception:
-                # best-effort, never propagate from tracking
-                pass
-            # Evaluate dynamic kill-switch rules based on this observed latency
-            try:
-                self._maybe_dynamic_kill(ms)
-            except Exception:
-                pass
+            self._record_request_latency((perf_counter() - start) * 1000.0)
+
+    async def _send_request_async(self, method: str, url: str, headers: dict | None = None, data: bytes | None = None, timeout_s: float = 10.0, orders: int = 0, priority: RequestPriority = RequestPriority.ORDER) -> bytes:
+        """Non-blocking sender over the pooled keep-alive transport.
+
+        Same latency/kill-switch bookkeeping as `_send_request`. HTTP error
+        statuses are raised as urllib `HTTPError` so existing error mapping
+        (e.code / e.read()) applies unchanged. The call is first paced by the
+        rate governor (`orders` = number of new orders in the call), then
+        waits for a slot from the priority scheduler; pacing happens before
+        the slot is taken, so only requests ready for the wire hold slots and
+        a paced order burst never blocks RISK/CANCEL calls. Both raise
+        ExchangeReject(RATE_LIMIT) rather than queue without bound.
+        """
+        await self.rate_governor.acquire(
+            self.rate_governor.weight_for(url),
+            orders,
+            urgent=(priority == RequestPriority.CANCEL),
+        )
+        return await self.scheduler.submit(
+            priority,
+            lambda: self._send_request_async_now(method, url, headers, data, timeout_s),
+        )
+
+    async def _send_request_async_now(self, method: str, url: str, headers: dict | None, data: bytes | None, timeout_s: float) -> bytes:
+        fault = self._fault_decision(method, url)
+
+        # injected faults count toward observed latency (kill-switch load tests)
+        start = perf_counter()
+        try:
+            if fault is not None:
+                await FaultInjector.apply_async(fault, url, timeout_s)
+            resp = await self._transport.request(method, url, headers=headers, data=data, timeout_s=timeout_s)
+        finally:
+            self._record_request_latency((perf_counter() - start) * 1000.0)
+
+        self.rate_governor.observe(resp.status, resp.headers)
+        if resp.status >= 400:
+            raise HTTPError(url, resp.status, f"HTTP {resp.status}", resp.headers, io.BytesIO(resp.body))
+        return resp.body
 
     def _send_request_simple(self, method: str, url: str, data: bytes | None = None, headers: dict | None = None, timeout_s: float = 10.0) -> dict:
         """Minimal helper: build a Request and return parsed JSON dict.
@@ -327,6 +392,79 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
         except Exception:
             # propagate original bytes error as a simple dict wrapper
             raise
+
+    async def _send_request_simple_async(self, method: str, url: str, data: bytes | None = None, headers: dict | None = None, timeout_s: float = 10.0, priority: RequestPriority = RequestPriority.ORDER) -> dict:
+        """Async counterpart of `_send_request_simple`: returns parsed JSON dict."""
+        resp_bytes = await self._send_request_async(method, url, headers=headers or {}, data=data, timeout_s=timeout_s, priority=priority)
+        return json.loads(resp_bytes.decode("utf-8"))
+
+    def get_scheduler_stats(self) -> dict:
+        """Per-class queue depth, rejects and wait/total latency percentiles."""
+        return self.scheduler.stats()
+
+    def get_rate_headroom(self) -> dict:
+        """Remaining request weight / order capacity before exchange limits."""
+        return self.rate_governor.headroom()
+
+    def get_pool_stats(self) -> dict:
+        """Pool stats for REST_BASE host (reuse ratio, open, idle, in_use)."""
+        try:
+            return self.connection_pool.stats(self.TESTNET_BASE_URL)
+        except Exception:
+            return {}
+
+    async def aclose(self) -> None:
+        """Release the transport (shared pool stays open; idempotent)."""
+        try:
+            await self._transport.aclose()
+        except Exception as e:
+            logger.warning("BinanceTestnetAdapter: transport close failed | err=%s", e)
+
+    def _assert_testnet_url(self, url: str, trace_id: str) -> None:
+        """Raise ExchangeReject if url points at a mainnet domain."""
+        for mainnet_domain in self.MAINNET_DOMAINS:
+            if mainnet_domain in url.lower():
+                logger.error(
+                    "SECURITY: Mainnet URL detected and BLOCKED | trace_id=%s | url=%s",
+                    trace_id,
+                    url.split("?")[0],  # Log without sensitive query params
+                )
+                raise ExchangeReject(
+                    exchange="BINANCE_MAINNET_BLOCKED",
+                    reason_code=ExchangeRejectReason.EXCHANGE_ERROR,
+                    message="Mainnet URL detected. Only Testnet allowed.",
+                )
+
+    @staticmethod
+    def _reject_reason_for_status(status: int, message: str) -> ExchangeRejectReason:
+        """Map an HTTP error status (+ exchange msg) to a reject reason."""
+        if status == 400:
+            # Bad request (e.g., invalid order type, min notional)
+            if "MIN_NOTIONAL" in message.upper():
+                return ExchangeRejectReason.MIN_NOTIONAL
+            return ExchangeRejectReason.INVALID_ORDER_TYPE
+        if status == 401:
+            return ExchangeRejectReason.INVALID_SIGNATURE
+        if status == 402 or status == 429:
+            return ExchangeRejectReason.RATE_LIMIT
+        if status == 403:
+            return ExchangeRejectReason.INSUFFICIENT_BALANCE
+        return ExchangeRejectReason.EXCHANGE_ERROR
+
+    @staticmethod
+    def _reject_reason_for_code(code, message: str) -> ExchangeRejectReason:
+        """Map a per-order Binance error code (batch response item) to a reject reason."""
+        if "MIN_NOTIONAL" in (message or "").upper() or code == -4164:
+            return ExchangeRejectReason.MIN_NOTIONAL
+        if code in (-1022, -2014, -2015):
+            return ExchangeRejectReason.INVALID_SIGNATURE
+        if code in (-1003, -1015):
+            return ExchangeRejectReason.RATE_LIMIT
+        if code in (-2018, -2019):
+            return ExchangeRejectReason.INSUFFICIENT_BALANCE
+        if code in (-1116, -1117, -4003):
+            return ExchangeRejectReason.INVALID_ORDER_TYPE
+        return ExchangeRejectReason.EXCHANGE_ERROR
     
     async def place_order(self, req: PlaceOrderRequest) -> PlaceOrderResult:
         """
@@ -402,29 +540,14 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
         url = f"{self.TESTNET_BASE_URL}/api/v3/order?{query_string_with_sig}"
         
         # Safety check: reject any mainnet URL attempt
-        for mainnet_domain in self.MAINNET_DOMAINS:
-            if mainnet_domain in url.lower():
-                logger.error(
-                    "SECURITY: Mainnet URL detected and BLOCKED | trace_id=%s | url=%s",
-                    req.trace_id,
-                    url.split("?")[0],  # Log without sensitive query params
-                )
-                raise ExchangeReject(
-                    exchange="BINANCE_MAINNET_BLOCKED",
-                    reason_code=ExchangeRejectReason.EXCHANGE_ERROR,
-                    message="Mainnet URL detected. Only Testnet allowed.",
-                )
+        self._assert_testnet_url(url, req.trace_id)
         
         # Make HTTP request (POST)
         try:
-            request = Request(
-                url,
-                method="POST",
-                headers={
-                    "X-MBX-APIKEY": self.binance_k,
-                    "Content-Type": "application/x-www-form-urlencoded",
-                }
-            )
+            headers = {
+                "X-MBX-APIKEY": self.binance_k,
+                "Content-Type": "application/x-www-form-urlencoded",
+            }
             
             logger.debug(
                 "BinanceTestnetAdapter: sending POST request | trace_id=%s | symbol=%s",
@@ -432,7 +555,7 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
                 req.symbol,
             )
             
-            resp_bytes = self._send_request(request, timeout_s=10)
+            resp_bytes = await self._send_request_async("POST", url, headers=headers, timeout_s=10, orders=1)
             response_data = json.loads(resp_bytes.decode("utf-8"))
             self.last_latency_ms = (time.time() - start_ts) * 1000
 
@@ -465,6 +588,7 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
                 qty=req.qty,
                 price=req.price,
                 status=response_data.get("status", "NEW"),
+                timestamp=int(response_data.get("updateTime") or time.time() * 1000),
             )
         
         except HTTPError as e:
@@ -484,21 +608,8 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
             )
             
             # Map HTTP status to exchange reject reason
-            reason_code = ExchangeRejectReason.EXCHANGE_ERROR
             message = error_data.get("msg", f"HTTP {e.code}")
-            
-            if e.code == 400:
-                # Bad request (e.g., invalid order type, min notional)
-                if "MIN_NOTIONAL" in message.upper():
-                    reason_code = ExchangeRejectReason.MIN_NOTIONAL
-                else:
-                    reason_code = ExchangeRejectReason.INVALID_ORDER_TYPE
-            elif e.code == 401:
-                reason_code = ExchangeRejectReason.INVALID_SIGNATURE
-            elif e.code == 402 or e.code == 429:
-                reason_code = ExchangeRejectReason.RATE_LIMIT
-            elif e.code == 403:
-                reason_code = ExchangeRejectReason.INSUFFICIENT_BALANCE
+            reason_code = self._reject_reason_for_status(e.code, message)
             
             raise ExchangeReject(
                 exchange="BINANCE_TESTNET",
@@ -506,6 +617,11 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
                 message=message,
             )
         
+        except ExchangeReject:
+            # already classified (no orderId, client-side rate limit)
+            self.error_count_5m += 1
+            raise
+
         except Exception as e:
             self.error_count_5m += 1
             logger.error(
@@ -519,6 +635,162 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
                 message=f"Unexpected error: {type(e).__name__}",
             )
 
+    async def place_orders(self, reqs: List[PlaceOrderRequest]) -> List[Union[PlaceOrderResult, ExchangeReject]]:
+        """
+        Place many orders with the FUTURES batch endpoint.
+
+        Requests are chunked to BATCH_ORDERS_MAX and chunks are sent in
+        parallel (bounded by batch_parallelism). Mock mode, or a testnet
+        without the batch endpoint (404/405), falls back to bounded parallel
+        single orders.
+
+        Returns:
+            One PlaceOrderResult or ExchangeReject per request, same order.
+        """
+        if not reqs:
+            return []
+        if self.mock_mode or not self._batch_supported:
+            return await super().place_orders(reqs)
+
+        chunks = [reqs[i:i + self.BATCH_ORDERS_MAX] for i in range(0, len(reqs), self.BATCH_ORDERS_MAX)]
+        sem = asyncio.Semaphore(max(1, int(self.batch_parallelism)))
+
+        async def _run(chunk: List[PlaceOrderRequest]):
+            async with sem:
+                if not self._batch_supported:
+                    # another chunk already found the endpoint missing
+                    return None
+                return await self._place_order_chunk(chunk)
+
+        chunk_results = await asyncio.gather(*(_run(c) for c in chunks))
+        # batch endpoint unavailable: every fallen-back chunk goes out in one
+        # bounded single-order pass, results merged back in request order
+        fallback = [r for chunk, res in zip(chunks, chunk_results) if res is None for r in chunk]
+        singles = iter(await super().place_orders(fallback)) if fallback else iter(())
+        out: List[Union[PlaceOrderResult, ExchangeReject]] = []
+        for chunk, res in zip(chunks, chunk_results):
+            out.extend(res if res is not None else [next(singles) for _ in chunk])
+        return out
+
+    async def _place_order_chunk(self, chunk: List[PlaceOrderRequest]) -> Optional[List[Union[PlaceOrderResult, ExchangeReject]]]:
+        """Send one batchOrders call. Returns None if the endpoint is unavailable."""
+        start_ts = time.time()
+        self.total_requests += len(chunk)
+        trace_ids = ",".join(r.trace_id for r in chunk)
+
+        logger.info(
+            "BinanceTestnetAdapter.place_orders | n=%s | trace_ids=%s",
+            len(chunk),
+            trace_ids,
+        )
+
+        batch = [
+            {
+                "symbol": r.symbol,
+                "side": r.side.upper(),
+                "type": r.order_type.upper(),
+                "timeInForce": "GTC",
+                "quantity": str(r.qty),
+                "price": str(r.price),
+            }
+            for r in chunk
+        ]
+        params = {
+            "batchOrders": json.dumps(batch, separators=(",", ":")),
+            "timestamp": str(int(time.time() * 1000)),
+            "recvWindow": "5000",
+        }
+        query_string = urlencode(params)
+        params["signature"] = hmac.new(
+            self.binance_sk.encode(),
+            query_string.encode(),
+            hashlib.sha256,
+        ).hexdigest()
+        url = f"{self.TESTNET_BASE_URL.rstrip('/')}{self.BATCH_ORDERS_PATH}?{urlencode(params)}"
+
+        def _reject_all(reason_code: ExchangeRejectReason, message: str) -> List[Union[PlaceOrderResult, ExchangeReject]]:
+            self.error_count_5m += len(chunk)
+            return [ExchangeReject(exchange="BINANCE_TESTNET", reason_code=reason_code, message=message) for _ in chunk]
+
+        try:
+            self._assert_testnet_url(url, trace_ids)
+        except ExchangeReject as e:
+            return [e for _ in chunk]
+
+        try:
+            resp_bytes = await self._send_request_async(
+                "POST",
+                url,
+                headers={
+                    "X-MBX-APIKEY": self.binance_k,
+                    "Content-Type": "application/x-www-form-urlencoded",
+                },
+                timeout_s=10,
+                orders=len(chunk),
+            )
+            items = json.loads(resp_bytes.decode("utf-8"))
+            self.last_latency_ms = (time.time() - start_ts) * 1000
+        except ExchangeReject as e:
+            # client-side rate governor refused to queue this chunk
+            return _reject_all(e.reason_code, e.message)
+        except HTTPError as e:
+            if e.code in (404, 405):
+                logger.warning("BinanceTestnetAdapter: batchOrders unavailable (HTTP %s); using single orders", e.code)
+                self._batch_supported = False
+                self.total_requests -= len(chunk)
+                return None
+            error_body = e.read().decode("utf-8", errors="replace")
+            try:
+                message = json.loads(error_body).get("msg", f"HTTP {e.code}")
+            except Exception:
+                message = f"HTTP {e.code}"
+            logger.warning(
+                "BinanceTestnetAdapter: batch HTTP error | trace_ids=%s | status=%s | body=%s",
+                trace_ids,
+                e.code,
+                error_body[:200],
+            )
+            # do not retry as singles: the exchange may have accepted part of the batch
+            return _reject_all(self._reject_reason_for_status(e.code, message), message)
+        except Exception as e:
+            logger.error("BinanceTestnetAdapter: batch unexpected error | trace_ids=%s | error=%s", trace_ids, str(e))
+            return _reject_all(ExchangeRejectReason.EXCHANGE_ERROR, f"Unexpected error: {type(e).__name__}")
+
+        if not isinstance(items, list) or len(items) != len(chunk):
+            logger.error("BinanceTestnetAdapter: malformed batch response | trace_ids=%s | response=%s", trace_ids, items)
+            return _reject_all(ExchangeRejectReason.EXCHANGE_ERROR, "Malformed batchOrders response")
+
+        results: List[Union[PlaceOrderResult, ExchangeReject]] = []
+        for r, item in zip(chunk, items):
+            order_id = str(item.get("orderId", "")) if isinstance(item, dict) else ""
+            if order_id:
+                results.append(PlaceOrderResult(
+                    exchange="BINANCE_TESTNET",
+                    exchange_order_id=order_id,
+                    symbol=r.symbol,
+                    side=r.side,
+                    qty=r.qty,
+                    price=r.price,
+                    status=item.get("status", "NEW"),
+                    timestamp=int(item.get("updateTime") or time.time() * 1000),
+                ))
+                continue
+            code = item.get("code") if isinstance(item, dict) else None
+            message = (item.get("msg") if isinstance(item, dict) else None) or "No orderId in response"
+            self.error_count_5m += 1
+            logger.warning(
+                "BinanceTestnetAdapter: batch item rejected | trace_id=%s | code=%s | msg=%s",
+                r.trace_id,
+                code,
+                message,
+            )
+            results.append(ExchangeReject(
+                exchange="BINANCE_TESTNET",
+                reason_code=self._reject_reason_for_code(code, message),
+                message=message,
+            ))
+        return results
+
     async def cancel_all_orders(self, symbol: str) -> bool:
         """
         Cancel all open orders for a specific symbol (SPOT API).
@@ -550,7 +822,7 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
 
         try:
             try:
-                res = self._send_request_simple("DELETE", url, headers={"X-MBX-APIKEY": self.binance_k}, timeout_s=10)
+                res = await self._send_request_simple_async("DELETE", url, headers={"X-MBX-APIKEY": self.binance_k}, timeout_s=10, priority=RequestPriority.CANCEL)
                 logger.info("BinanceTestnetAdapter: Emergency CANCEL_ALL success | symbol=%s", symbol)
                 return True
             except Exception as e:
@@ -560,13 +832,19 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
             logger.error("BinanceTestnetAdapter: Emergency CANCEL_ALL FAILED (outer) | symbol=%s | err=%s", symbol, e)
             return False
 
+    def latency_percentiles(self) -> dict:
+        """Sliding-window REST latency percentiles (count, p50/p90/p95/p99/max in ms)."""
+        return self.lat_sketch.snapshot()
+
     async def get_health(self) -> ExchangeHealth:
         """Return health metrics for Binance Testnet."""
+        p50, p90 = self.lat_sketch.quantiles([0.50, 0.90])
+        has_samples = self.lat_sketch.count() > 0
         return ExchangeHealth(
             exchange="BINANCE_TESTNET",
             is_connected=True, # Simplified for now
-            latency_p50_ms=self.last_latency_ms if self.last_latency_ms > 0 else 50.0,
-            latency_p90_ms=self.last_latency_ms * 1.2 if self.last_latency_ms > 0 else 70.0,
+            latency_p50_ms=p50 if has_samples else 50.0,
+            latency_p90_ms=p90 if has_samples else 70.0,
             error_rate_5m=self.error_count_5m / max(self.total_requests, 1),
             last_update_ts=time.time()
         )
@@ -589,15 +867,15 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
         try:
             # 1. Fetch Account Info (FUTURES endpoint)
             # GET /fapi/v2/account
-            def _server_time_ms():
+            async def _server_time_ms():
                 turl = REST_BASE.rstrip("/") + "/fapi/v1/time"
                 try:
-                    d = self._send_request_simple("GET", turl, headers=None, timeout_s=3)
+                    d = await self._send_request_simple_async("GET", turl, headers=None, timeout_s=3, priority=RequestPriority.RISK)
                     return int(d["serverTime"])
                 except Exception:
                     raise
 
-            def _sync_time_offset_ms(force: bool = False) -> int:
+            async def _sync_time_offset_ms(force: bool = False) -> int:
                 now = time.time()
                 with self._time_lock:
                     if (not force) and (self._time_offset_at > 0) and (now - self._time_offset_at < 30):
@@ -605,7 +883,7 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
 
                 try:
                     local_ms = int(time.time() * 1000)
-                    server_ms = _server_time_ms()
+                    server_ms = await _server_time_ms()
                     offset = int(server_ms - local_ms)
                 except Exception as ex:
                     logger.warning("Time sync failed: %s", str(ex))
@@ -623,7 +901,7 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
             data = None
             for attempt in range(2):
                 # compute timestamp corrected to server time
-                offset = _sync_time_offset_ms(force=(attempt > 0))
+                offset = await _sync_time_offset_ms(force=(attempt > 0))
                 timestamp = int(time.time() * 1000) + int(offset)
 
                 # Build URL & Signature for FUTURES
@@ -653,12 +931,13 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
                     }
 
                 try:
-                    request = Request(
+                    resp_bytes = await self._send_request_async(
+                        "GET",
                         url,
-                        method="GET",
-                        headers={"X-MBX-APIKEY": self.binance_k}
+                        headers={"X-MBX-APIKEY": self.binance_k},
+                        timeout_s=5,
+                        priority=RequestPriority.RISK,
                     )
-                    resp_bytes = self._send_request(request, timeout_s=5)
                     data = json.loads(resp_bytes.decode("utf-8"))
                     break
 
@@ -760,7 +1039,7 @@ class BinanceTestnetAdapter(BaseExchangeAdapter):
                     try:
                         # minimal ticker call
                         ticker_url = f"{self.TESTNET_BASE_URL}/api/v3/ticker/price?symbol=BTCUSDT"
-                        t_data = self._send_request_simple("GET", ticker_url, headers=None, timeout_s=3)
+                        t_data = await self._send_request_simple_async("GET", ticker_url, headers=None, timeout_s=3, priority=RequestPriority.RISK)
                         price = float(t_data.get("price", 0))
                         btc_value = btc_balance * price
                     except Exception as te:
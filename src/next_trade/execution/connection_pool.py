@@ -0,0 +1,201 @@
+"""
+Managed keep-alive connection pool for exchange REST adapters.
+
+Wraps an aiohttp connector so every adapter reuses warm TCP+TLS connections.
+- Per-host connection cap (NEXT_TRADE_HTTP_MAX_PER_HOST, default 16)
+- Reuse/creation counters collected via aiohttp trace hooks
+- Pool stats (reuse ratio, open, idle, in use) per host
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass, asdict
+from types import SimpleNamespace
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from next_trade.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+@dataclass
+class PoolStats:
+    host: str
+    max_per_host: int
+    open: int = 0
+    idle: int = 0
+    in_use: int = 0
+    created: int = 0
+    reused: int = 0
+    reuse_ratio: float = 0.0
+
+
+class ConnectionPool:
+    """
+    Keep-alive connection pool shared by one or more adapters.
+
+    One aiohttp session/connector is kept per running event loop; it is
+    replaced when the loop changes (asyncio.run() per smoke script), and
+    the previous one is closed rather than left to leak its sockets.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_per_host: Optional[int] = None,
+        max_total: Optional[int] = None,
+        keepalive_timeout_s: float = 30.0,
+    ) -> None:
+        self.max_per_host = int(max_per_host if max_per_host is not None else _env_int("NEXT_TRADE_HTTP_MAX_PER_HOST", 16))
+        self.max_total = int(max_total if max_total is not None else _env_int("NEXT_TRADE_HTTP_MAX_TOTAL", 100))
+        self.keepalive_timeout_s = float(keepalive_timeout_s)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._created: Dict[str, int] = {}
+        self._reused: Dict[str, int] = {}
+        self._in_flight: Dict[str, int] = {}  # requests between start and end/exception
+
+    # --- trace hooks (per-request ctx carries the host) ---
+    async def _on_request_start(self, session, ctx: SimpleNamespace, params) -> None:
+        ctx.host = params.url.host or ""
+        self._in_flight[ctx.host] = self._in_flight.get(ctx.host, 0) + 1
+
+    async def _on_request_done(self, session, ctx: SimpleNamespace, params) -> None:
+        host = getattr(ctx, "host", "")
+        self._in_flight[host] = max(0, self._in_flight.get(host, 0) - 1)
+
+    async def _on_connection_create_end(self, session, ctx: SimpleNamespace, params) -> None:
+        host = getattr(ctx, "host", "")
+        self._created[host] = self._created.get(host, 0) + 1
+
+    async def _on_connection_reuseconn(self, session, ctx: SimpleNamespace, params) -> None:
+        host = getattr(ctx, "host", "")
+        self._reused[host] = self._reused.get(host, 0) + 1
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        tc = aiohttp.TraceConfig()
+        tc.on_request_start.append(self._on_request_start)
+        tc.on_request_end.append(self._on_request_done)
+        tc.on_request_exception.append(self._on_request_done)
+        tc.on_connection_create_end.append(self._on_connection_create_end)
+        tc.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        return tc
+
+    def session(self) -> aiohttp.ClientSession:
+        """Return the pooled session for the running loop (created lazily)."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None and self._loop is not loop:
+                logger.info("ConnectionPool: event loop changed; opening new connector")
+                self._retire()
+            self._connector = aiohttp.TCPConnector(
+                limit=self.max_total,
+                limit_per_host=self.max_per_host,
+                keepalive_timeout=self.keepalive_timeout_s,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=self._connector,
+                trace_configs=[self._trace_config()],
+            )
+            self._loop = loop
+        return self._session
+
+    def _retire(self) -> None:
+        """Close the session of a previous event loop without awaiting on this one."""
+        session, connector, loop = self._session, self._connector, self._loop
+        self._session = self._connector = self._loop = None
+        self._in_flight.clear()
+        if session is None or session.closed:
+            return
+        try:
+            if loop is not None and loop.is_running():
+                # still serving another thread: close it there
+                asyncio.run_coroutine_threadsafe(session.close(), loop)
+            elif connector is not None:
+                # loop stopped/closed (asyncio.run() returned): nothing left to
+                # await on, so close the connector synchronously
+                connector._close()
+        except Exception as e:
+            logger.warning("ConnectionPool: closing previous connector failed | err=%s", e)
+
+    def _connector_counts(self) -> tuple[Dict[str, int], Dict[str, int]]:
+        # aiohttp keeps idle conns in `_conns` and checked-out ones in
+        # `_acquired_per_host`, keyed by ConnectionKey (has .host). Both are
+        # private: if their shape changes, fall back to the trace-hook
+        # in-flight counts (idle then unknown, reported as 0).
+        idle: Dict[str, int] = {}
+        in_use: Dict[str, int] = {}
+        conn = self._connector
+        if conn is None or conn.closed:
+            return idle, in_use
+        try:
+            conns = conn._conns
+            acquired = conn._acquired_per_host
+            for key, items in conns.items():
+                idle[key.host] = idle.get(key.host, 0) + len(items)
+            for key, items in acquired.items():
+                in_use[key.host] = in_use.get(key.host, 0) + len(items)
+        except Exception:
+            idle = {}
+            in_use = {h: n for h, n in self._in_flight.items() if n}
+        return idle, in_use
+
+    def stats(self, base_url: Optional[str] = None) -> Dict[str, dict]:
+        """Pool stats keyed by host (optionally only the host of base_url)."""
+        idle, in_use = self._connector_counts()
+        hosts = set(idle) | set(in_use) | set(self._created) | set(self._reused)
+        if base_url:
+            hosts = {urlsplit(base_url).hostname or ""}
+        out: Dict[str, dict] = {}
+        for host in sorted(hosts):
+            created = self._created.get(host, 0)
+            reused = self._reused.get(host, 0)
+            st = PoolStats(
+                host=host,
+                max_per_host=self.max_per_host,
+                idle=idle.get(host, 0),
+                in_use=in_use.get(host, 0),
+                created=created,
+                reused=reused,
+                reuse_ratio=(reused / (created + reused)) if (created + reused) else 0.0,
+            )
+            st.open = st.idle + st.in_use
+            out[host] = asdict(st)
+        return out
+
+    async def aclose(self) -> None:
+        session, self._session, self._connector, self._loop = self._session, None, None, None
+        self._in_flight.clear()
+        if session is not None and not session.closed:
+            await session.close()
+
+
+_SHARED_POOL: ConnectionPool | None = None
+
+def get_shared_pool() -> ConnectionPool:
+    """Process-wide pool so adapters talking to the same REST_BASE share connections."""
+    global _SHARED_POOL
+    if _SHARED_POOL is None:
+        _SHARED_POOL = ConnectionPool()
+    return _SHARED_POOL
+
+
+async def close_shared_pool() -> None:
+    """Close the process-wide pool (call once on shutdown)."""
+    global _SHARED_POOL
+    pool, _SHARED_POOL = _SHARED_POOL, None
+    if pool is not None:
+        await pool.aclose()
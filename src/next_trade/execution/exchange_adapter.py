@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Union
 
 
 class ExchangeReject(Exception):
@@ -51,12 +52,52 @@ class ExchangeHealth:
 
 
 class BaseExchangeAdapter:
+    # Shared keep-alive pool (next_trade.execution.connection_pool.ConnectionPool).
+    # Adapters that do REST I/O set this in __init__; None means no pooled transport.
+    connection_pool = None
+
+    def get_pool_stats(self) -> Dict[str, dict]:
+        """Per-host pool stats (open, idle, in_use, reuse_ratio); empty if no pool."""
+        if self.connection_pool is None:
+            return {}
+        return self.connection_pool.stats()
+
+    async def aclose(self) -> None:
+        """Release adapter-owned resources. Shared pools are closed at process shutdown."""
+        return None
+
     async def get_exchange_name(self) -> str:  # pragma: no cover - abstract
         raise NotImplementedError()
 
     async def place_order(self, req: PlaceOrderRequest) -> PlaceOrderResult:  # pragma: no cover
         raise NotImplementedError()
 
+    # max concurrent single orders used by the default place_orders()
+    batch_parallelism = 4
+
+    async def place_orders(self, reqs: List[PlaceOrderRequest]) -> List[Union[PlaceOrderResult, ExchangeReject]]:
+        """Place several orders; one result or ExchangeReject per request, in order.
+
+        Default: bounded parallel `place_order` calls. Adapters with a native
+        batch endpoint override this.
+        """
+        sem = asyncio.Semaphore(max(1, int(self.batch_parallelism)))
+
+        async def _one(req: PlaceOrderRequest) -> Union[PlaceOrderResult, ExchangeReject]:
+            async with sem:
+                try:
+                    return await self.place_order(req)
+                except ExchangeReject as e:
+                    return e
+                except Exception as e:
+                    return ExchangeReject(
+                        exchange=type(self).__name__,
+                        reason_code=ExchangeRejectReason.EXCHANGE_ERROR,
+                        message=f"Unexpected error: {type(e).__name__}",
+                    )
+
+        return list(await asyncio.gather(*(_one(r) for r in reqs)))
+
     async def cancel_all(self) -> None:  # pragma: no cover
         raise NotImplementedError()
 
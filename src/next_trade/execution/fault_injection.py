@@ -0,0 +1,156 @@
+"""
+Fault injection around the exchange REST transport (chaos runs).
+
+Configured from the `chaos_latency` section of runs/<run_id>/config.json
+(or NEXT_TRADE_CHAOS_LATENCY=1 defaults). Per request it may inject:
+- latency  (awaitable delay on the async path; event loop keeps running)
+- error    (HTTP `error_status`, default 500)
+- rate limit (HTTP 429)
+- timeout  (waits `timeout_ms`, then raises asyncio.TimeoutError)
+
+Profiles can be overridden per endpoint path prefix via `endpoints`:
+    {"enabled": true, "rate": 0.3, "min_ms": 50, "max_ms": 350,
+     "endpoints": {"/fapi/v1/batchOrders": {"rate_limit_rate": 0.1}}}
+
+Each endpoint draws from its own RNG seeded from RunContext seed + path, so
+a given endpoint sees the same fault sequence on every run with that seed,
+whatever the interleaving of concurrent requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import random
+import socket
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+
+FAULT_FIELDS = ("rate", "min_ms", "max_ms", "error_rate", "error_status", "rate_limit_rate", "timeout_rate", "timeout_ms")
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    rate: float = 0.0             # probability of injected latency
+    min_ms: float = 0.0
+    max_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+    rate_limit_rate: float = 0.0
+    timeout_rate: float = 0.0
+    timeout_ms: Optional[float] = None  # None -> request timeout
+
+    def merged(self, d: Any) -> "FaultProfile":
+        """This profile with overrides from a config dict (unknown keys ignored)."""
+        if not isinstance(d, dict):
+            return self
+        kw = {}
+        for k in FAULT_FIELDS:
+            if k in d and d[k] is not None:
+                kw[k] = int(d[k]) if k == "error_status" else float(d[k])
+        return replace(self, **kw)
+
+
+@dataclass
+class FaultDecision:
+    endpoint: str
+    delay_ms: float = 0.0
+    error_status: Optional[int] = None
+    timeout: bool = False
+    timeout_ms: Optional[float] = None
+
+    @property
+    def kind(self) -> str:
+        if self.timeout:
+            return "timeout"
+        if self.error_status == 429:
+            return "rate_limit"
+        if self.error_status is not None:
+            return "error"
+        return "latency" if self.delay_ms > 0 else "none"
+
+    def as_event(self) -> Dict[str, Any]:
+        ev: Dict[str, Any] = {"event": "chaos_latency" if self.kind == "latency" else "chaos_fault",
+                              "endpoint": self.endpoint, "kind": self.kind, "delay_ms": self.delay_ms}
+        if self.error_status is not None:
+            ev["status"] = self.error_status
+        return ev
+
+
+class FaultInjector:
+    def __init__(self, default: FaultProfile, endpoints: Optional[Dict[str, FaultProfile]] = None, *, seed=None) -> None:
+        self.default = default
+        # longest prefix first
+        self.endpoints = dict(sorted((endpoints or {}).items(), key=lambda kv: len(kv[0]), reverse=True))
+        self.seed = seed
+        self._rngs: Dict[str, random.Random] = {}
+
+    @classmethod
+    def from_config(cls, cfg: Any, *, seed=None) -> "FaultInjector":
+        """Build from a chaos_latency dict (ChaosLatencyConfig.raw)."""
+        cfg = cfg if isinstance(cfg, dict) else {}
+        default = FaultProfile().merged(cfg)
+        endpoints = {}
+        for prefix, over in (cfg.get("endpoints") or {}).items():
+            endpoints[str(prefix)] = default.merged(over)
+        return cls(default, endpoints, seed=seed)
+
+    def _match(self, path: str) -> tuple[str, FaultProfile]:
+        for prefix, prof in self.endpoints.items():
+            if path.startswith(prefix):
+                return prefix, prof
+        return path, self.default
+
+    def _rng(self, key: str) -> random.Random:
+        rng = self._rngs.get(key)
+        if rng is None:
+            rng = self._rngs[key] = random.Random(f"{self.seed}:{key}") if self.seed is not None else random.Random()
+        return rng
+
+    def decide(self, method: str, url: str) -> FaultDecision:
+        path = urlsplit(url).path or "/"
+        key, prof = self._match(path)
+        rng = self._rng(f"{method.upper()} {key}")
+        d = FaultDecision(endpoint=key)
+        # fixed draw order keeps sequences reproducible
+        r_lat, r_to, r_429, r_err = rng.random(), rng.random(), rng.random(), rng.random()
+        if r_lat < prof.rate:
+            d.delay_ms = float(rng.uniform(prof.min_ms, prof.max_ms))
+        if r_to < prof.timeout_rate:
+            d.timeout = True
+            d.timeout_ms = prof.timeout_ms
+        elif r_429 < prof.rate_limit_rate:
+            d.error_status = 429
+        elif r_err < prof.error_rate:
+            d.error_status = prof.error_status
+        return d
+
+    @staticmethod
+    def _http_error(url: str, status: int) -> HTTPError:
+        body = b'{"code":-1003,"msg":"chaos: rate limit"}' if status == 429 else b'{"code":-1000,"msg":"chaos: injected error"}'
+        return HTTPError(url, status, f"chaos {status}", {}, io.BytesIO(body))
+
+    @staticmethod
+    async def apply_async(d: FaultDecision, url: str, timeout_s: float) -> None:
+        """Await the injected delay and raise the injected fault, if any."""
+        if d.timeout:
+            await asyncio.sleep((d.timeout_ms / 1000.0) if d.timeout_ms is not None else timeout_s)
+            raise asyncio.TimeoutError(f"chaos timeout: {d.endpoint}")
+        if d.delay_ms > 0:
+            await asyncio.sleep(d.delay_ms / 1000.0)
+        if d.error_status is not None:
+            raise FaultInjector._http_error(url, d.error_status)
+
+    @staticmethod
+    def apply_sync(d: FaultDecision, url: str, timeout_s: float) -> None:
+        """Blocking counterpart for the sync urllib path."""
+        if d.timeout:
+            time.sleep((d.timeout_ms / 1000.0) if d.timeout_ms is not None else timeout_s)
+            raise socket.timeout(f"chaos timeout: {d.endpoint}")
+        if d.delay_ms > 0:
+            time.sleep(d.delay_ms / 1000.0)
+        if d.error_status is not None:
+            raise FaultInjector._http_error(url, d.error_status)
@@ -0,0 +1,58 @@
+"""
+Async HTTP transport for exchange REST adapters.
+
+Pooled, keep-alive aiohttp session shared by all coroutines of an adapter so
+concurrent requests overlap instead of serializing on blocking urllib calls.
+- Connections come from a ConnectionPool (shared pool by default)
+- Returns status/headers/body; status mapping stays with the adapter
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import aiohttp
+
+from next_trade.execution.connection_pool import ConnectionPool, get_shared_pool
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+class AsyncHttpTransport:
+    """
+    Keep-alive HTTP client on top of a ConnectionPool.
+
+    The pool owns the aiohttp session and connector; the transport only
+    issues requests, so several adapters can share one pool.
+    """
+
+    def __init__(self, pool: Optional[ConnectionPool] = None, *, owns_pool: bool = False) -> None:
+        self.pool = pool if pool is not None else get_shared_pool()
+        self._owns_pool = bool(owns_pool)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[bytes] = None,
+        timeout_s: float = 10.0,
+    ) -> HttpResponse:
+        """Send one request and return the full response (body read eagerly)."""
+        session = self.pool.session()
+        timeout = aiohttp.ClientTimeout(total=float(timeout_s))
+        async with session.request(method, url, headers=headers, data=data, timeout=timeout) as resp:
+            body = await resp.read()
+            return HttpResponse(status=resp.status, body=body, headers=dict(resp.headers))
+
+    async def aclose(self) -> None:
+        """Close the pool only if this transport owns it (shared pool stays up)."""
+        if self._owns_pool:
+            await self.pool.aclose()
@@ -0,0 +1,206 @@
+"""
+Client-side rate governor for exchange REST calls.
+
+Paces requests with token buckets per exchange limit so bursts are smoothed
+client-side instead of being rejected with 429/418:
+- REQUEST_WEIGHT per minute, ORDERS per 10s and per minute (Binance FUTURES defaults)
+- Self-corrects from X-MBX-USED-WEIGHT-1M / X-MBX-ORDER-COUNT-10S / -1M headers
+- Retry-After on 429/418 blocks all callers (urgent cancels included) until it expires
+- headroom() reports remaining capacity per limit
+
+Waiters are served FIFO: each acquire() reserves its tokens immediately (the
+bucket may go negative) and sleeps until the deficit has refilled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+from next_trade.core.logging import get_logger
+from next_trade.execution.exchange_adapter import ExchangeReject, ExchangeRejectReason
+
+logger = get_logger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+# request weight per endpoint (path prefix); unknown endpoints cost 1
+ENDPOINT_WEIGHTS: Dict[str, int] = {
+    "/fapi/v2/account": 5,
+    "/fapi/v1/batchOrders": 5,
+    "/fapi/v1/time": 1,
+    "/api/v3/order": 1,
+    "/api/v3/openOrders": 1,
+    "/api/v3/ticker/price": 2,
+}
+
+
+@dataclass
+class TokenBucket:
+    name: str
+    limit: float          # exchange limit per interval
+    interval_s: float
+    safety: float = 0.9   # fraction of the limit we allow ourselves
+
+    def __post_init__(self) -> None:
+        self.capacity = self.limit * self.safety
+        self.refill_per_s = self.capacity / self.interval_s
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_s)
+        self.updated = now
+
+    def reserve(self, n: float, now: float) -> float:
+        """Debit n tokens; return seconds until the debit is covered."""
+        self._refill(now)
+        self.tokens -= n
+        return 0.0 if self.tokens >= 0 else (-self.tokens / self.refill_per_s)
+
+    def sync_used(self, used: float, now: float) -> None:
+        """Exchange reports `used` in its window: never believe we have more left."""
+        self._refill(now)
+        self.tokens = min(self.tokens, self.capacity - float(used))
+
+    def headroom(self, now: float) -> Dict[str, float]:
+        self._refill(now)
+        avail = max(0.0, self.tokens)
+        return {
+            "limit": self.limit,
+            "interval_s": self.interval_s,
+            "available": round(avail, 3),
+            "utilization": round(1.0 - avail / self.capacity, 4) if self.capacity else 1.0,
+        }
+
+
+class RateGovernor:
+    HEADER_BUCKETS = {
+        "x-mbx-used-weight-1m": "weight_1m",
+        "x-mbx-order-count-10s": "orders_10s",
+        "x-mbx-order-count-1m": "orders_1m",
+    }
+
+    def __init__(
+        self,
+        *,
+        weight_1m: Optional[float] = None,
+        orders_10s: Optional[float] = None,
+        orders_1m: Optional[float] = None,
+        safety: Optional[float] = None,
+        max_wait_s: Optional[float] = None,
+    ) -> None:
+        safety = float(safety if safety is not None else _env_float("NEXT_TRADE_RATE_SAFETY", 0.9))
+        self.buckets: Dict[str, TokenBucket] = {
+            "weight_1m": TokenBucket("weight_1m", weight_1m or _env_float("NEXT_TRADE_RATE_WEIGHT_1M", 2400), 60.0, safety),
+            "orders_10s": TokenBucket("orders_10s", orders_10s or _env_float("NEXT_TRADE_RATE_ORDERS_10S", 300), 10.0, safety),
+            "orders_1m": TokenBucket("orders_1m", orders_1m or _env_float("NEXT_TRADE_RATE_ORDERS_1M", 1200), 60.0, safety),
+        }
+        self.max_wait_s = float(max_wait_s if max_wait_s is not None else _env_float("NEXT_TRADE_RATE_MAX_WAIT_SEC", 5.0))
+        self._blocked_until = 0.0
+        self.waits = 0
+        self.rejected = 0
+
+    @staticmethod
+    def weight_for(url: str) -> int:
+        path = urlsplit(url).path
+        for prefix, w in ENDPOINT_WEIGHTS.items():
+            if path.startswith(prefix):
+                return w
+        return 1
+
+    async def acquire(self, weight: int = 1, orders: int = 0, *, urgent: bool = False) -> float:
+        """Wait until the request fits the limits; returns seconds waited.
+
+        Raises ExchangeReject(RATE_LIMIT) instead of queueing longer than
+        max_wait_s, so callers fail fast rather than stall a burst.
+        `urgent` (emergency cancels) debits tokens but never waits behind
+        paced requests; the safety margin absorbs it. A Retry-After pause
+        still applies: urgent calls fail fast during it, since requests sent
+        while banned extend the ban.
+        """
+        now = time.monotonic()
+        if urgent:
+            blocked = self._blocked_until - now
+            if blocked > 0:
+                self.rejected += 1
+                raise ExchangeReject(
+                    exchange="RATE_GOVERNOR",
+                    reason_code=ExchangeRejectReason.RATE_LIMIT,
+                    message=f"exchange Retry-After pause: {blocked:.2f}s left",
+                )
+            for name, n in [("weight_1m", weight), ("orders_10s", orders), ("orders_1m", orders)]:
+                if n:
+                    self.buckets[name].reserve(n, now)
+            return 0.0
+        wait = max(0.0, self._blocked_until - now)
+        plan = [("weight_1m", weight)]
+        if orders:
+            plan += [("orders_10s", orders), ("orders_1m", orders)]
+        # check before reserving so a rejected call does not consume tokens
+        for name, n in plan:
+            b = self.buckets[name]
+            b._refill(now)
+            if b.tokens - n < 0:
+                wait = max(wait, (n - b.tokens) / b.refill_per_s)
+        if wait > self.max_wait_s:
+            self.rejected += 1
+            raise ExchangeReject(
+                exchange="RATE_GOVERNOR",
+                reason_code=ExchangeRejectReason.RATE_LIMIT,
+                message=f"client-side rate limit: wait {wait:.2f}s > {self.max_wait_s:.2f}s",
+            )
+        for name, n in plan:
+            self.buckets[name].reserve(n, now)
+        if wait > 0:
+            self.waits += 1
+            await asyncio.sleep(wait)
+        return wait
+
+    def observe(self, status: int, headers: Optional[Mapping[str, str]]) -> None:
+        """Feed a response back: sync used counters and honour Retry-After."""
+        now = time.monotonic()
+        hdrs = {str(k).lower(): v for k, v in (headers or {}).items()}
+        for header, name in self.HEADER_BUCKETS.items():
+            if header in hdrs:
+                try:
+                    self.buckets[name].sync_used(float(hdrs[header]), now)
+                except Exception:
+                    pass
+        if status in (418, 429):
+            try:
+                retry_after = float(hdrs.get("retry-after", "1"))
+            except Exception:
+                retry_after = 1.0
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+            logger.warning("RateGovernor: exchange returned %s; pausing requests for %.1fs", status, retry_after)
+
+    def headroom(self) -> Dict[str, object]:
+        """Remaining capacity per limit plus any Retry-After pause in effect."""
+        now = time.monotonic()
+        return {
+            "limits": {name: b.headroom(now) for name, b in self.buckets.items()},
+            "blocked_for_s": round(max(0.0, self._blocked_until - now), 3),
+            "waits": self.waits,
+            "rejected": self.rejected,
+        }
+
+
+_SHARED_GOVERNOR: RateGovernor | None = None
+
+def get_rate_governor() -> RateGovernor:
+    """Process-wide governor: exchange limits are per IP/account, not per adapter."""
+    global _SHARED_GOVERNOR
+    if _SHARED_GOVERNOR is None:
+        _SHARED_GOVERNOR = RateGovernor()
+    return _SHARED_GOVERNOR
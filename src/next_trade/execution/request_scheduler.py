@@ -0,0 +1,156 @@
+"""
+Priority-aware request scheduler for exchange REST calls.
+
+Bounds in-flight requests and, when saturated, grants freed slots by class:
+    CANCEL (cancels / kill-switch actions) > RISK (account snapshots) > ORDER (new orders)
+- Bounded queue per class; a full queue rejects immediately
+- CANCEL may use `cancel_reserve` slots above max_inflight, so an emergency
+  cancel never waits behind a burst of in-flight orders
+- Per-class queue-wait and total latency percentiles (WindowedLatencySketch)
+
+Callers pace with the rate governor *before* submit(): a slot is only held
+by a request that is ready to go on the wire.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from next_trade.execution.exchange_adapter import ExchangeReject, ExchangeRejectReason
+from next_trade.runtime.latency_sketch import WindowedLatencySketch
+
+T = TypeVar("T")
+
+
+class RequestPriority(IntEnum):
+    CANCEL = 0
+    RISK = 1
+    ORDER = 2
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+DEFAULT_QUEUE_SIZES = {
+    RequestPriority.CANCEL: 256,
+    RequestPriority.RISK: 64,
+    RequestPriority.ORDER: 512,
+}
+
+
+class _ClassStats:
+    def __init__(self) -> None:
+        self.submitted = 0
+        self.rejected = 0
+        self.wait = WindowedLatencySketch()
+        self.total = WindowedLatencySketch()
+
+
+class PriorityRequestScheduler:
+    def __init__(
+        self,
+        *,
+        max_inflight: Optional[int] = None,
+        cancel_reserve: int = 2,
+        queue_sizes: Optional[Dict[RequestPriority, int]] = None,
+    ) -> None:
+        self.max_inflight = max(1, int(max_inflight if max_inflight is not None else _env_int("NEXT_TRADE_SCHED_MAX_INFLIGHT", 16)))
+        self.cancel_reserve = max(0, int(cancel_reserve))
+        sizes = dict(DEFAULT_QUEUE_SIZES)
+        sizes.update(queue_sizes or {})
+        self.queue_sizes = sizes
+        self._queues: Dict[RequestPriority, Deque[asyncio.Future]] = {p: deque() for p in RequestPriority}
+        self._inflight = 0
+        self._stats: Dict[RequestPriority, _ClassStats] = {p: _ClassStats() for p in RequestPriority}
+
+    def _limit_for(self, priority: RequestPriority) -> int:
+        return self.max_inflight + (self.cancel_reserve if priority == RequestPriority.CANCEL else 0)
+
+    def _has_waiters_at_or_above(self, priority: RequestPriority) -> bool:
+        return any(self._queues[p] for p in RequestPriority if p <= priority)
+
+    async def _acquire(self, priority: RequestPriority) -> None:
+        if self._inflight < self._limit_for(priority) and not self._has_waiters_at_or_above(priority):
+            self._inflight += 1
+            return
+        q = self._queues[priority]
+        if len(q) >= self.queue_sizes[priority]:
+            self._stats[priority].rejected += 1
+            raise ExchangeReject(
+                exchange="REQUEST_SCHEDULER",
+                reason_code=ExchangeRejectReason.RATE_LIMIT,
+                message=f"{priority.name} queue full ({len(q)})",
+            )
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        q.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # slot was granted just before cancellation: hand it on
+                self._release()
+            else:
+                try:
+                    q.remove(fut)
+                except ValueError:
+                    pass
+            raise
+
+    def _release(self) -> None:
+        self._inflight -= 1
+        for p in RequestPriority:
+            q = self._queues[p]
+            while q and self._inflight < self._limit_for(p):
+                fut = q.popleft()
+                if fut.done():
+                    continue
+                self._inflight += 1
+                fut.set_result(None)
+                return
+
+    async def submit(self, priority: RequestPriority, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn() once a slot is granted to its priority class."""
+        st = self._stats[priority]
+        st.submitted += 1
+        t0 = time.perf_counter()
+        await self._acquire(priority)
+        st.wait.record((time.perf_counter() - t0) * 1000.0)
+        try:
+            return await fn()
+        finally:
+            self._release()
+            st.total.record((time.perf_counter() - t0) * 1000.0)
+
+    def stats(self) -> Dict[str, object]:
+        out: Dict[str, object] = {"inflight": self._inflight, "max_inflight": self.max_inflight}
+        for p, st in self._stats.items():
+            w = st.wait.quantiles([0.50, 0.95, 0.99])
+            t = st.total.quantiles([0.50, 0.95, 0.99])
+            out[p.name.lower()] = {
+                "queued": len(self._queues[p]),
+                "queue_max": self.queue_sizes[p],
+                "submitted": st.submitted,
+                "rejected": st.rejected,
+                "wait_p50_ms": w[0], "wait_p95_ms": w[1], "wait_p99_ms": w[2],
+                "total_p50_ms": t[0], "total_p95_ms": t[1], "total_p99_ms": t[2],
+            }
+        return out
+
+
+_SHARED_SCHEDULER: PriorityRequestScheduler | None = None
+
+def get_request_scheduler() -> PriorityRequestScheduler:
+    """Process-wide scheduler so cancels pre-empt orders from any adapter instance."""
+    global _SHARED_SCHEDULER
+    if _SHARED_SCHEDULER is None:
+        _SHARED_SCHEDULER = PriorityRequestScheduler()
+    return _SHARED_SCHEDULER
@@ -0,0 +1,226 @@
+"""
+Background append-only event journal (runs/<run_id>/events.jsonl).
+
+append() only pushes onto a bounded in-memory ring; a dedicated writer
+thread per journal keeps the file open and writes events in batches.
+- Ring full: oldest pending event is dropped (counted in `dropped`)
+- fsync policy: none | batch | interval (NEXT_TRADE_JOURNAL_FSYNC)
+- Size-based segment rotation: events.jsonl -> events.1.jsonl -> ... events.N.jsonl
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional
+
+from next_trade.core.logging import get_logger
+from next_trade.runtime.ops_channel import file_sinks_enabled, publish_ops_event
+from next_trade.runtime.run_artifacts import get_paths_for_run
+
+logger = get_logger(__name__)
+
+FSYNC_POLICIES = ("none", "batch", "interval")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+class EventJournal:
+    def __init__(
+        self,
+        path: Path,
+        *,
+        capacity: int = 10_000,
+        batch_max: int = 512,
+        flush_interval_s: float = 0.2,
+        fsync: Optional[str] = None,
+        fsync_interval_s: Optional[float] = None,
+        max_segment_bytes: Optional[int] = None,
+        max_segments: int = 5,
+    ) -> None:
+        self.path = Path(path)
+        self.batch_max = int(batch_max)
+        self.flush_interval_s = float(flush_interval_s)
+        policy = (fsync or os.getenv("NEXT_TRADE_JOURNAL_FSYNC", "none")).lower()
+        self.fsync = policy if policy in FSYNC_POLICIES else "none"
+        self.fsync_interval_s = float(fsync_interval_s if fsync_interval_s is not None else _env_float("NEXT_TRADE_JOURNAL_FSYNC_SEC", 1.0))
+        if max_segment_bytes is None:
+            max_segment_bytes = int(_env_float("NEXT_TRADE_JOURNAL_SEGMENT_MB", 64) * 1024 * 1024)
+        self.max_segment_bytes = int(max_segment_bytes)
+        self.max_segments = int(max_segments)
+
+        self._ring: Deque[Dict[str, Any]] = deque(maxlen=int(capacity))
+        self._cond = threading.Condition()
+        self._closed = False
+        self._fh = None
+        self._last_fsync = 0.0
+        self.dropped = 0
+        self.written = 0
+
+        self._thread = threading.Thread(target=self._run, name=f"event-journal:{self.path.name}", daemon=True)
+        self._thread.start()
+
+    def append(self, obj: Dict[str, Any]) -> bool:
+        """Queue one event (never blocks on I/O). False if the journal is closed."""
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._ring) == self._ring.maxlen:
+                self.dropped += 1
+            self._ring.append(obj)
+            if len(self._ring) >= self.batch_max:
+                self._cond.notify()
+        return True
+
+    # --- writer thread ---
+    def _open(self):
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.path.open("a", encoding="utf-8")
+        return self._fh
+
+    def _segment_path(self, idx: int) -> Path:
+        return self.path.with_name(f"{self.path.stem}.{idx}{self.path.suffix}")
+
+    def _rotate(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        oldest = self._segment_path(self.max_segments)
+        if oldest.exists():
+            oldest.unlink()
+        for idx in range(self.max_segments - 1, 0, -1):
+            src = self._segment_path(idx)
+            if src.exists():
+                src.rename(self._segment_path(idx + 1))
+        if self.path.exists():
+            self.path.rename(self._segment_path(1))
+
+    def _write_batch(self, batch) -> None:
+        data = "".join(json.dumps(obj, ensure_ascii=False) + "\n" for obj in batch)
+        fh = self._open()
+        fh.write(data)
+        fh.flush()
+        now = time.monotonic()
+        if self.fsync == "batch" or (self.fsync == "interval" and now - self._last_fsync >= self.fsync_interval_s):
+            os.fsync(fh.fileno())
+            self._last_fsync = now
+        self.written += len(batch)
+        if self.max_segment_bytes > 0 and fh.tell() >= self.max_segment_bytes:
+            self._rotate()
+
+    def _drain(self):
+        with self._cond:
+            n = min(len(self._ring), self.batch_max)
+            return [self._ring.popleft() for _ in range(n)]
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._ring and not self._closed:
+                    self._cond.wait(self.flush_interval_s)
+                closing = self._closed
+            batch = self._drain()
+            while batch:
+                try:
+                    self._write_batch(batch)
+                except Exception as e:
+                    # never propagate: events are best-effort like append_jsonl
+                    logger.warning("EventJournal: write failed | path=%s | n=%s | err=%s", self.path, len(batch), e)
+                    try:
+                        if self._fh is not None:
+                            self._fh.close()
+                    except Exception:
+                        pass
+                    self._fh = None
+                batch = self._drain()
+            if closing:
+                break
+        if self._fh is not None:
+            try:
+                self._fh.flush()
+                if self.fsync != "none":
+                    os.fsync(self._fh.fileno())
+                self._fh.close()
+            except Exception:
+                pass
+            self._fh = None
+
+    def close(self, timeout_s: float = 5.0) -> None:
+        """Write everything still queued, then stop the writer."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=timeout_s)
+
+
+_JOURNALS: Dict[str, EventJournal] = {}
+_RUN_EVENT_PATHS: Dict[str, str] = {}
+_JOURNALS_LOCK = threading.Lock()
+
+
+def get_event_journal(path) -> EventJournal:
+    key = str(path)
+    j = _JOURNALS.get(key)
+    if j is None:
+        with _JOURNALS_LOCK:
+            j = _JOURNALS.get(key)
+            if j is None:
+                j = EventJournal(Path(key))
+                _JOURNALS[key] = j
+    return j
+
+
+def append_run_event(run_id: Optional[str], obj: Dict[str, Any]) -> bool:
+    """Queue obj for runs/<run_id>/events.jsonl (drop-in for append_jsonl on hot paths).
+
+    Also forwarded to ops_web over the local IPC channel; with
+    NEXT_TRADE_RUN_FILE_SINKS=0 the IPC copy is the only one. `file_sink`
+    tells ops_web whether events.jsonl has it too (its event store then
+    imports the file line instead of storing the IPC copy).
+    """
+    if not run_id:
+        return False
+    file_sink = file_sinks_enabled()
+    sent = publish_ops_event({
+        "type": "run_event",
+        "ts": int(time.time() * 1000),
+        "source": "runtime",
+        "run_id": run_id,
+        "event": obj.get("event") if isinstance(obj, dict) else None,
+        "file_sink": file_sink,
+        "data": obj,
+    })
+    if not file_sink:
+        return sent
+    path = _RUN_EVENT_PATHS.get(run_id)
+    if path is None:
+        events = get_paths_for_run(run_id).get("events")
+        if events is None:
+            return False
+        path = _RUN_EVENT_PATHS[run_id] = str(events)
+    return get_event_journal(path).append(obj)
+
+
+def close_all_journals() -> None:
+    with _JOURNALS_LOCK:
+        journals = list(_JOURNALS.values())
+        _JOURNALS.clear()
+    for j in journals:
+        try:
+            j.close()
+        except Exception:
+            pass
+
+
+atexit.register(close_all_journals)
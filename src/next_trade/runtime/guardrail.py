@@ -1,8 +1,9 @@
 ﻿from __future__ import annotations
 
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Sequence
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 from next_trade.core.logging import get_logger
 
@@ -11,22 +12,65 @@ logger = get_logger(__name__)
 
 # Fallback-safe imports for runtime helpers
 try:
-    from next_trade.runtime.run_context import get_run_id, append_jsonl
+    from next_trade.runtime.run_context import get_run_id
 except Exception:  # pragma: no cover - fallbacks for editors/tests
     def get_run_id() -> Optional[str]:
         return None
 
-    def append_jsonl(path: str, obj: Dict[str, Any]) -> None:  # pragma: no cover
-        return
+try:
+    from next_trade.runtime.event_journal import append_run_event
+except Exception:  # pragma: no cover
+    def append_run_event(run_id: Optional[str], obj: Dict[str, Any]) -> bool:
+        return False
+
+try:
+    from next_trade.runtime.metrics_registry import get_metrics_registry
+except Exception:  # pragma: no cover
+    get_metrics_registry = None  # type: ignore
 
 try:
-    from next_trade.runtime.run_artifacts import get_paths_for_run, ensure_metrics, write_metrics
+    from next_trade.runtime.ops_channel import publish_ops_event
 except Exception:  # pragma: no cover
-    def get_paths_for_run(run_id: str):
-        return {"events": None}
+    def publish_ops_event(obj: Dict[str, Any]) -> bool:
+        return False
+
+
+# --- state-change listeners ---------------------------------------------------
+# Listeners receive one dict per kill-switch transition, synchronously on the
+# thread that changed the state; they must be quick and must not block
+# (hand off with loop.call_soon_threadsafe / a queue). Exceptions are logged
+# and swallowed so observers can never break the guardrail.
+
+GuardrailListener = Callable[[Dict[str, Any]], None]
+
+_GLOBAL_LISTENERS: List[GuardrailListener] = []
+_LISTENERS_LOCK = threading.Lock()
+
+
+def add_guardrail_listener(fn: GuardrailListener) -> None:
+    """Observe transitions of every KillSwitch in this process."""
+    with _LISTENERS_LOCK:
+        if fn not in _GLOBAL_LISTENERS:
+            _GLOBAL_LISTENERS.append(fn)
+
+
+def remove_guardrail_listener(fn: GuardrailListener) -> None:
+    with _LISTENERS_LOCK:
+        try:
+            _GLOBAL_LISTENERS.remove(fn)
+        except ValueError:
+            pass
 
-    ensure_metrics = None  # type: ignore
-    write_metrics = None  # type: ignore
+
+def _notify(listeners: Sequence[GuardrailListener], event: Dict[str, Any]) -> None:
+    for fn in listeners:
+        try:
+            fn(event)
+        except Exception:
+            try:
+                logger.exception("guardrail listener failed")
+            except Exception:
+                pass
 
 
 @dataclass
@@ -43,6 +87,45 @@ class KillSwitchState:
 class KillSwitch:
     def __init__(self) -> None:
         self.state = KillSwitchState()
+        self._listeners: List[GuardrailListener] = []
+
+    # --- observers ---
+    def add_listener(self, fn: GuardrailListener) -> None:
+        """Observe this kill switch only (see add_guardrail_listener for all)."""
+        if fn not in self._listeners:
+            self._listeners.append(fn)
+
+    def remove_listener(self, fn: GuardrailListener) -> None:
+        try:
+            self._listeners.remove(fn)
+        except ValueError:
+            pass
+
+    def _emit(self, transition: str, src: KillSwitchState) -> None:
+        """Notify listeners and ops_web (local IPC); `src` carries reason/risk_type."""
+        with _LISTENERS_LOCK:
+            listeners = self._listeners + _GLOBAL_LISTENERS
+        active = self.state.is_active
+        try:
+            run_id = get_run_id()
+        except Exception:
+            run_id = None
+        event = {
+            "type": "kill_switch_transition",
+            "ts": int(time.time() * 1000),
+            "source": "guardrail",
+            "severity": "critical" if active else "info",
+            "transition": transition,
+            "kill_switch": active,
+            "risk_level": "CRITICAL" if active else "OK",
+            "downgrade_level": 2 if active else 0,
+            "reason": src.reason or "",
+            "risk_type": src.risk_type,
+            "activated_at": src.activated_at,
+            "run_id": run_id,
+        }
+        publish_ops_event(dict(event))
+        _notify(listeners, event)
 
     def activate(self, reason: str, risk_type: str) -> bool:
         if self.state.is_active:
@@ -54,10 +137,14 @@ class KillSwitch:
         self.state.risk_type = risk_type
         self.state.activation_recorded = False
         self.state.recovery_recorded = False
+        self._emit("activated", self.state)
         return True
 
-    def reset(self) -> None:
+    def reset(self, *, transition: str = "reset") -> None:
+        prev = self.state
         self.state = KillSwitchState()
+        if prev.is_active:
+            self._emit(transition, prev)
 
 
 class Guardrail:
@@ -66,6 +153,13 @@ class Guardrail:
         self.stability_window_n = int(stability_window_n)
         self.kill_switch = KillSwitch()
 
+    def add_listener(self, fn: GuardrailListener) -> None:
+        """Observe activate / reset / maybe_recover transitions of this guardrail."""
+        self.kill_switch.add_listener(fn)
+
+    def remove_listener(self, fn: GuardrailListener) -> None:
+        self.kill_switch.remove_listener(fn)
+
     def evaluate(self, *, reason: str = "", risk_type: str = "TEST_SIM") -> bool:
         # Minimal: activate always when called with reason/risk_type (caller controls)
         return self.kill_switch.activate(reason=reason, risk_type=risk_type)
@@ -106,24 +200,20 @@ class Guardrail:
         try:
             run_id = get_run_id()
             if run_id is not None:
-                paths = get_paths_for_run(run_id)
-                if paths and paths.get("events") is not None:
-                    append_jsonl(paths["events"], {
-                        "event": "P1-011_kill_switch_recovered",
-                        "recovered_at": int(time.time()),
-                        "reason": self.kill_switch.state.reason,
-                        "risk_type": self.kill_switch.state.risk_type,
-                    })
+                append_run_event(run_id, {
+                    "event": "P1-011_kill_switch_recovered",
+                    "recovered_at": int(time.time()),
+                    "reason": self.kill_switch.state.reason,
+                    "risk_type": self.kill_switch.state.risk_type,
+                })
                 try:
-                    m = ensure_metrics(run_id)
-                    m["recovery_count"] = int(m.get("recovery_count", 0)) + 1
-                    write_metrics(run_id, m)
+                    get_metrics_registry(run_id).incr("recovery_count")
                 except Exception:
                     pass
         except Exception:
             pass
 
-        self.kill_switch.reset()
+        self.kill_switch.reset(transition="recovered")
         return True
 
 
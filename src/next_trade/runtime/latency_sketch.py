@@ -0,0 +1,146 @@
+"""
+Sliding-window streaming latency quantiles (HDR-histogram style).
+
+Samples go into fixed log-spaced buckets (~`rel_err` relative error), kept
+per time slice; the window is `slices` x `slice_s` seconds. Memory is
+O(buckets x slices) regardless of sample count, record() is O(1) and a
+quantile query is one pass over the bucket array. No samples are stored or
+sorted.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class WindowedLatencySketch:
+    def __init__(
+        self,
+        *,
+        window_s: float = 60.0,
+        slices: int = 6,
+        min_ms: float = 0.01,
+        max_ms: float = 120_000.0,
+        rel_err: float = 0.02,
+    ) -> None:
+        self.slices = max(1, int(slices))
+        self.slice_s = float(window_s) / self.slices
+        self.min_ms = float(min_ms)
+        self.max_ms = float(max_ms)
+        self._log_base = math.log1p(float(rel_err))
+        self.n_buckets = int(math.ceil(math.log(self.max_ms / self.min_ms) / self._log_base)) + 1
+
+        self._lock = threading.Lock()
+        # per-slice bucket counts + a running total over the live window
+        self._slice_counts: List[List[int]] = [[0] * self.n_buckets for _ in range(self.slices)]
+        self._slice_n = [0] * self.slices
+        self._slice_max = [0.0] * self.slices
+        self._total = [0] * self.n_buckets
+        self._n = 0
+        self._cur = 0
+        self._cur_epoch = self._epoch(time.monotonic())
+
+    def _epoch(self, now: float) -> int:
+        return int(now // self.slice_s)
+
+    def _bucket(self, ms: float) -> int:
+        if ms <= self.min_ms:
+            return 0
+        idx = int(math.log(ms / self.min_ms) / self._log_base)
+        return min(idx, self.n_buckets - 1)
+
+    def _bucket_value(self, idx: int) -> float:
+        # geometric midpoint of [lo, lo*(1+e))
+        return self.min_ms * math.exp((idx + 0.5) * self._log_base)
+
+    def _advance(self, now: float) -> None:
+        epoch = self._epoch(now)
+        steps = epoch - self._cur_epoch
+        if steps <= 0:
+            return
+        for _ in range(min(steps, self.slices)):
+            self._cur = (self._cur + 1) % self.slices
+            counts = self._slice_counts[self._cur]
+            if self._slice_n[self._cur]:
+                total = self._total
+                for i, c in enumerate(counts):
+                    if c:
+                        total[i] -= c
+                        counts[i] = 0
+                self._n -= self._slice_n[self._cur]
+            self._slice_n[self._cur] = 0
+            self._slice_max[self._cur] = 0.0
+        self._cur_epoch = epoch
+
+    def record(self, ms: float) -> None:
+        ms = float(ms)
+        if ms != ms or ms < 0:  # NaN / negative
+            return
+        b = self._bucket(ms)
+        with self._lock:
+            self._advance(time.monotonic())
+            self._slice_counts[self._cur][b] += 1
+            self._total[b] += 1
+            self._slice_n[self._cur] += 1
+            self._n += 1
+            if ms > self._slice_max[self._cur]:
+                self._slice_max[self._cur] = ms
+
+    def count(self) -> int:
+        with self._lock:
+            self._advance(time.monotonic())
+            return self._n
+
+    def max(self) -> float:
+        with self._lock:
+            self._advance(time.monotonic())
+            return max(self._slice_max) if self._n else 0.0
+
+    def quantiles(self, qs) -> List[float]:
+        """Values for several quantiles (0..1) in one pass; 0.0 when empty."""
+        with self._lock:
+            self._advance(time.monotonic())
+            n = self._n
+            if n == 0:
+                return [0.0 for _ in qs]
+            peak = max(self._slice_max)
+            order = sorted(range(len(qs)), key=lambda i: qs[i])
+            out: List[Optional[float]] = [None] * len(qs)
+            k = 0
+            seen = 0
+            for idx, c in enumerate(self._total):
+                if not c:
+                    continue
+                seen += c
+                while k < len(order) and seen >= max(1, math.ceil(qs[order[k]] * n)):
+                    out[order[k]] = min(self._bucket_value(idx), peak)
+                    k += 1
+                if k == len(order):
+                    break
+            return [peak if v is None else v for v in out]
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+    def p50(self) -> float:
+        return self.quantile(0.50)
+
+    def p95(self) -> float:
+        return self.quantile(0.95)
+
+    def p99(self) -> float:
+        return self.quantile(0.99)
+
+    def snapshot(self) -> Dict[str, float]:
+        p50, p90, p95, p99 = self.quantiles([0.50, 0.90, 0.95, 0.99])
+        return {
+            "count": self.count(),
+            "p50_ms": p50,
+            "p90_ms": p90,
+            "p95_ms": p95,
+            "p99_ms": p99,
+            "max_ms": self.max(),
+        }
@@ -0,0 +1,179 @@
+"""
+Buffered per-run metrics (runs/<run_id>/metrics.json).
+
+Counters and gauges are updated in memory on the hot path; a single
+background writer thread merges pending updates into metrics.json at a fixed
+cadence (one read-modify-write per run per interval) and once more on
+shutdown (atexit).
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from next_trade.core.logging import get_logger
+from next_trade.runtime.ops_channel import file_sinks_enabled, publish_ops_event
+from next_trade.runtime.run_artifacts import ensure_metrics, write_metrics
+
+logger = get_logger(__name__)
+
+
+class MetricsRegistry:
+    """In-memory counters/gauges for one run; flushed by the shared writer."""
+
+    def __init__(self, run_id: str) -> None:
+        self.run_id = run_id
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}  # pending deltas
+        self._gauges: Dict[str, Any] = {}      # pending latest values
+        self._view: Optional[Dict[str, Any]] = None  # last known full metrics
+        self.flush_count = 0
+
+    def _load_view(self) -> Dict[str, Any]:
+        # one disk read per registry to seed reads; afterwards the view is
+        # kept current from our own flushes
+        if self._view is None:
+            try:
+                self._view = dict(ensure_metrics(self.run_id))
+            except Exception:
+                self._view = {}
+        return self._view
+
+    def incr(self, name: str, delta: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + delta
+
+    def set_gauge(self, name: str, value: Any) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Current value (persisted view + pending updates)."""
+        with self._lock:
+            view = self._load_view()
+            if name in self._gauges:
+                return self._gauges[name]
+            if name in self._counters:
+                return (view.get(name) or 0) + self._counters[name]
+            return view.get(name, default)
+
+    def flush(self) -> bool:
+        """Merge pending updates into metrics.json. Returns True if written."""
+        with self._lock:
+            if not self._counters and not self._gauges:
+                return False
+            counters, self._counters = self._counters, {}
+            gauges, self._gauges = self._gauges, {}
+            # fold into the read view now so get() stays consistent mid-flush
+            view = self._load_view()
+            for k, d in counters.items():
+                view[k] = (view.get(k) or 0) + d
+            view.update(gauges)
+            snapshot = dict(view)
+        if not file_sinks_enabled():
+            # IPC-only: the in-memory view is the source of truth
+            self.flush_count += 1
+            self._publish(snapshot)
+            return True
+        try:
+            metrics = ensure_metrics(self.run_id)
+            for k, d in counters.items():
+                metrics[k] = (metrics.get(k) or 0) + d
+            metrics.update(gauges)
+            write_metrics(self.run_id, metrics)
+        except Exception as e:
+            # put the updates back so the next cycle retries them, and take
+            # the counters out of the view again (get() adds pending deltas)
+            with self._lock:
+                view = self._load_view()
+                for k, d in counters.items():
+                    self._counters[k] = self._counters.get(k, 0) + d
+                    view[k] = (view.get(k) or 0) - d
+                for k, v in gauges.items():
+                    self._gauges.setdefault(k, v)
+            logger.warning("MetricsRegistry: flush failed | run_id=%s | err=%s", self.run_id, e)
+            return False
+        with self._lock:
+            self._view = dict(metrics)
+        self.flush_count += 1
+        self._publish(metrics)
+        return True
+
+    def _publish(self, metrics: Dict[str, Any]) -> None:
+        publish_ops_event({
+            "type": "run_metrics",
+            "ts": int(time.time() * 1000),
+            "source": "runtime",
+            "run_id": self.run_id,
+            "data": dict(metrics),
+        })
+
+
+class _MetricsWriter:
+    """Single daemon thread flushing every registry at `interval_s`."""
+
+    def __init__(self, interval_s: float) -> None:
+        self.interval_s = float(interval_s)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            flush_all()
+
+    def stop(self, timeout_s: float = 5.0) -> None:
+        self._stop.set()
+        t = self._thread
+        if t is not None and t.is_alive():
+            t.join(timeout=timeout_s)
+
+
+try:
+    _FLUSH_INTERVAL_S = float(os.getenv("NEXT_TRADE_METRICS_FLUSH_SEC", "1.0"))
+except Exception:
+    _FLUSH_INTERVAL_S = 1.0
+
+_REGISTRIES: Dict[str, MetricsRegistry] = {}
+_REGISTRIES_LOCK = threading.Lock()
+_WRITER = _MetricsWriter(_FLUSH_INTERVAL_S)
+
+
+def get_metrics_registry(run_id: str) -> MetricsRegistry:
+    reg = _REGISTRIES.get(run_id)
+    if reg is None:
+        with _REGISTRIES_LOCK:
+            reg = _REGISTRIES.get(run_id)
+            if reg is None:
+                reg = MetricsRegistry(run_id)
+                _REGISTRIES[run_id] = reg
+        _WRITER.ensure_started()
+    return reg
+
+
+def flush_all() -> None:
+    for reg in list(_REGISTRIES.values()):
+        try:
+            reg.flush()
+        except Exception:
+            pass
+
+
+def shutdown_metrics() -> None:
+    """Stop the writer and do a final synchronous flush (registered atexit)."""
+    _WRITER.stop()
+    flush_all()
+
+
+atexit.register(shutdown_metrics)
@@ -0,0 +1,217 @@
+"""
+Local IPC channel from the trading runtime to ops_web.
+
+Runtime events (guardrail transitions, run events, run metrics) are sent as
+newline-delimited JSON over a local stream socket; ops_web ingests them
+straight into its BroadcastBus, so the monitoring path has no filesystem
+round trip or polling delay. The file sinks (events.jsonl, metrics.json)
+stay as the durable copy unless NEXT_TRADE_RUN_FILE_SINKS=0.
+
+- address: NEXT_TRADE_IPC_ADDR = unix:/path/to.sock | tcp:127.0.0.1:PORT
+  (default: a Unix socket in the temp dir; tcp:127.0.0.1:8790 on Windows)
+- publish() only appends to a bounded ring (never blocks, never raises); a
+  writer thread connects, sends batches and reconnects with backoff
+- ring full (ops_web down or slow): oldest event dropped, counted in `dropped`
+- NEXT_TRADE_IPC=0 disables the channel entirely
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from next_trade.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Address helpers mirrored in ops_web/ipc_server.py (keep the two in sync):
+# neither side imports the other, ops_web runs without next_trade installed.
+DEFAULT_TCP_PORT = 8790
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def default_ipc_addr() -> str:
+    if os.name == "nt" or not hasattr(socket, "AF_UNIX"):
+        return f"tcp:127.0.0.1:{DEFAULT_TCP_PORT}"
+    return "unix:" + os.path.join(tempfile.gettempdir(), "next_trade_ops.sock")
+
+
+def parse_ipc_addr(addr: Optional[str]) -> Tuple[str, Any]:
+    """"unix:/p.sock" -> ("unix", "/p.sock"); "tcp:host:port" -> ("tcp", (host, port))."""
+    addr = (addr or os.getenv("NEXT_TRADE_IPC_ADDR") or default_ipc_addr()).strip()
+    kind, _, rest = addr.partition(":")
+    if kind == "unix" and rest:
+        return "unix", rest
+    if kind == "tcp":
+        host, _, port = rest.rpartition(":")
+        return "tcp", (host or "127.0.0.1", int(port or DEFAULT_TCP_PORT))
+    raise ValueError(f"invalid IPC address: {addr!r}")
+
+
+def file_sinks_enabled() -> bool:
+    return os.getenv("NEXT_TRADE_RUN_FILE_SINKS", "1") != "0"
+
+
+class OpsChannel:
+    def __init__(
+        self,
+        addr: Optional[str] = None,
+        *,
+        capacity: int = 10_000,
+        batch_max: int = 512,
+        reconnect_max_s: float = 5.0,
+    ) -> None:
+        self.kind, self.target = parse_ipc_addr(addr)
+        self.batch_max = int(batch_max)
+        self.reconnect_max_s = float(reconnect_max_s)
+
+        self._ring: Deque[Dict[str, Any]] = deque(maxlen=int(capacity))
+        self._cond = threading.Condition()
+        self._closed = False
+        self._sock: Optional[socket.socket] = None
+        self.dropped = 0
+        self.sent = 0
+        self.connects = 0
+
+        self._thread = threading.Thread(target=self._run, name="ops-channel", daemon=True)
+        self._thread.start()
+
+    def publish(self, obj: Dict[str, Any]) -> bool:
+        """Queue one event for ops_web. False if the channel is closed."""
+        with self._cond:
+            if self._closed:
+                return False
+            if len(self._ring) == self._ring.maxlen:
+                self.dropped += 1
+            self._ring.append(obj)
+            self._cond.notify()
+        return True
+
+    # --- writer thread ---
+    def _connect(self) -> socket.socket:
+        if self.kind == "unix":
+            s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        s.settimeout(2.0)
+        try:
+            s.connect(self.target)
+        except Exception:
+            s.close()
+            raise
+        hello = {"type": "ipc_hello", "pid": os.getpid(), "ts": int(time.time() * 1000)}
+        s.sendall((json.dumps(hello) + "\n").encode("utf-8"))
+        self.connects += 1
+        return s
+
+    def _close_sock(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except Exception:
+                pass
+            self._sock = None
+
+    def _run(self) -> None:
+        backoff = 0.1
+        retry_at = 0.0
+        while True:
+            with self._cond:
+                if not self._ring and not self._closed:
+                    self._cond.wait(1.0)
+                if self._closed and (not self._ring or self._sock is None):
+                    break
+                wait = retry_at - time.monotonic() if self._sock is None else 0.0
+                if wait > 0:
+                    # reconnect backoff; publish() wake-ups must not cut it short
+                    self._cond.wait(wait)
+                    continue
+                batch = [self._ring.popleft() for _ in range(min(len(self._ring), self.batch_max))]
+            if not batch:
+                continue
+            try:
+                if self._sock is None:
+                    self._sock = self._connect()
+                    backoff = 0.1
+                data = "".join(json.dumps(obj, ensure_ascii=False, default=str) + "\n" for obj in batch)
+                self._sock.sendall(data.encode("utf-8"))
+                self.sent += len(batch)
+            except Exception:
+                # put the batch back (oldest first); the ring bound still applies
+                self._close_sock()
+                with self._cond:
+                    room = self._ring.maxlen - len(self._ring)
+                    keep = batch[-room:] if room > 0 else []
+                    self.dropped += len(batch) - len(keep)
+                    self._ring.extendleft(reversed(keep))
+                retry_at = time.monotonic() + backoff
+                backoff = min(self.reconnect_max_s, backoff * 2)
+        self._close_sock()
+
+    def close(self, timeout_s: float = 2.0) -> None:
+        """Send what is still queued (if connected), then stop the writer."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=timeout_s)
+
+
+_CHANNEL: Optional[OpsChannel] = None
+_CHANNEL_LOCK = threading.Lock()
+_DISABLED = False
+
+
+def get_ops_channel() -> Optional[OpsChannel]:
+    """Process-wide channel, created on first use (None when disabled/misconfigured)."""
+    global _CHANNEL, _DISABLED
+    ch = _CHANNEL
+    if ch is not None or _DISABLED:
+        return ch
+    with _CHANNEL_LOCK:
+        if _CHANNEL is None and not _DISABLED:
+            if os.getenv("NEXT_TRADE_IPC", "1") == "0":
+                _DISABLED = True
+                return None
+            try:
+                _CHANNEL = OpsChannel(capacity=int(_env_float("NEXT_TRADE_IPC_CAPACITY", 10_000)))
+            except Exception as e:
+                _DISABLED = True
+                logger.warning("OpsChannel: disabled | err=%s", e)
+        return _CHANNEL
+
+
+def publish_ops_event(obj: Dict[str, Any]) -> bool:
+    """Best-effort: queue obj for ops_web over local IPC."""
+    try:
+        ch = get_ops_channel()
+        return ch.publish(obj) if ch is not None else False
+    except Exception:
+        return False
+
+
+def close_ops_channel() -> None:
+    global _CHANNEL
+    with _CHANNEL_LOCK:
+        ch, _CHANNEL = _CHANNEL, None
+    if ch is not None:
+        try:
+            ch.close()
+        except Exception:
+            pass
+
+
+atexit.register(close_ops_channel)
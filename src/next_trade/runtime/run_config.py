@@ -0,0 +1,133 @@
+"""
+Cached run config (runs/<run_id>/config.json).
+
+Parsed once and reloaded only when the file's mtime or size changes, so the
+adapter can consult kill-switch / chaos settings on every request without
+touching disk. stat() itself is throttled to `check_interval_s`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from next_trade.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class KillSwitchPolicy:
+    min_threshold_ms: float = 300.0
+    multiplier: float = 1.5
+    consecutive: int = 3
+
+    @classmethod
+    def from_dict(cls, d: Any) -> Optional["KillSwitchPolicy"]:
+        if not d or not isinstance(d, dict):
+            return None
+        return cls(
+            min_threshold_ms=float(d.get("min_threshold_ms", 300)),
+            multiplier=float(d.get("multiplier", 1.5)),
+            consecutive=int(d.get("consecutive", 3)),
+        )
+
+
+@dataclass(frozen=True)
+class ChaosLatencyConfig:
+    enabled: bool = False
+    min_ms: float = 0.0
+    max_ms: float = 0.0
+    rate: float = 0.0
+    raw: Dict[str, Any] = field(default_factory=dict, compare=False)
+
+    @classmethod
+    def from_dict(cls, d: Any) -> Optional["ChaosLatencyConfig"]:
+        if not isinstance(d, dict) or not d.get("enabled"):
+            return None
+        return cls(
+            enabled=True,
+            min_ms=float(d.get("min_ms", 0)),
+            max_ms=float(d.get("max_ms", 0)),
+            rate=float(d.get("rate", 0.0)),
+            raw=dict(d),
+        )
+
+
+@dataclass(frozen=True)
+class RunConfig:
+    raw: Dict[str, Any] = field(default_factory=dict)
+    kill_switch_policy: Optional[KillSwitchPolicy] = None
+    chaos_latency: Optional[ChaosLatencyConfig] = None
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "RunConfig":
+        return cls(
+            raw=d,
+            kill_switch_policy=KillSwitchPolicy.from_dict(d.get("kill_switch_policy")),
+            chaos_latency=ChaosLatencyConfig.from_dict(d.get("chaos_latency")),
+        )
+
+
+_EMPTY = RunConfig()
+
+
+class RunConfigCache:
+    """Single config file, reparsed only when (mtime_ns, size) changes."""
+
+    def __init__(self, path: Path, *, check_interval_s: float = 0.5) -> None:
+        self.path = Path(path)
+        self.check_interval_s = float(check_interval_s)
+        self._config: RunConfig = _EMPTY
+        self._sig: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.reload_count = 0
+
+    def get(self) -> RunConfig:
+        now = time.monotonic()
+        if self._sig is not None and (now - self._checked_at) < self.check_interval_s:
+            return self._config
+        with self._lock:
+            self._checked_at = now
+            try:
+                st = os.stat(self.path)
+                sig = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                # missing file -> empty config (sentinel sig keeps the throttle)
+                self._sig, self._config = (-1, -1), _EMPTY
+                return self._config
+            if sig == self._sig:
+                return self._config
+            try:
+                with self.path.open("r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._config = RunConfig.from_dict(data if isinstance(data, dict) else {})
+                self.reload_count += 1
+            except Exception as e:
+                # keep the last good config on a partial/invalid write
+                logger.warning("RunConfigCache: parse failed | path=%s | err=%s", self.path, e)
+            self._sig = sig
+            return self._config
+
+
+_CACHES: Dict[str, RunConfigCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+def get_run_config(run_id: Optional[str]) -> RunConfig:
+    """Typed config for runs/<run_id>/config.json (empty RunConfig if absent)."""
+    if not run_id:
+        return _EMPTY
+    cache = _CACHES.get(run_id)
+    if cache is None:
+        with _CACHES_LOCK:
+            cache = _CACHES.get(run_id)
+            if cache is None:
+                cache = RunConfigCache(Path("runs") / run_id / "config.json")
+                _CACHES[run_id] = cache
+    return cache.get()